@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Protocol, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.bank.async_client import AsyncBankAPIClient
+from app.bank.bridge import GreenletBankClient, greenlet_sleep
+from app.bank.pool import SharedAsyncBankClient
+from app.services import PaymentService
+
+
+T = TypeVar("T")
+
+
+class ServiceRunner(Protocol):
+    async def run(self, operation: Callable[[PaymentService], T]) -> T:
+        ...
+
+
+class ThreadedServiceRunner:
+    def __init__(self, service: PaymentService):
+        self.service = service
+
+    async def run(self, operation: Callable[[PaymentService], T]) -> T:
+        return await run_in_threadpool(operation, self.service)
+
+
+class AsyncPaymentService:
+    # Runs the regular PaymentService inside AsyncSession.run_sync, so the transition logic stays in one
+    # place while both SQL and bank calls are awaited on the event loop instead of occupying a thread.
+    def __init__(
+        self,
+        session: AsyncSession,
+        bank_client: AsyncBankAPIClient | SharedAsyncBankClient,
+        **service_options: Any,
+    ):
+        self.session = session
+        self.bank_client = GreenletBankClient(bank_client)
+        self._service_options = service_options
+
+    async def run(self, operation: Callable[[PaymentService], T]) -> T:
+        return await self.session.run_sync(
+            lambda sync_session: operation(
+                PaymentService(sync_session, self.bank_client, sleep=greenlet_sleep, **self._service_options)
+            )
+        )
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+
+from app.enums import OrderPaymentStatus, PaymentStatus
+from app.models import Order, Payment
+from app.money import ZERO_MONEY, Money
+from app.services import SETTLED_PAYMENT_STATUSES, resolve_order_payment_status
+
+
+@dataclass(frozen=True)
+class BalanceDrift:
+    order_id: int
+    stored_reserved_amount: Money
+    expected_reserved_amount: Money
+    stored_paid_amount: Money
+    expected_paid_amount: Money
+    stored_payment_status: OrderPaymentStatus
+    expected_payment_status: OrderPaymentStatus
+
+
+@dataclass
+class BalanceReport:
+    checked_orders: int = 0
+    fixed: bool = False
+    drifts: list[BalanceDrift] = field(default_factory=list)
+
+
+def _money(value: Money | Decimal | float | int | None) -> Money:
+    if value is None:
+        return ZERO_MONEY
+    return Money.parse(value)
+
+
+def verify_order_balances(session: Session, fix: bool = False, chunk_size: int = 1000) -> BalanceReport:
+    net_amount = Payment.amount - Payment.refunded_amount
+    expected_reserved = func.coalesce(
+        func.sum(
+            case(
+                (Payment.status == PaymentStatus.PENDING, Payment.amount),
+                (Payment.status == PaymentStatus.FAILED, 0),
+                else_=net_amount,
+            )
+        ),
+        0,
+    )
+    expected_paid = func.coalesce(
+        func.sum(case((Payment.status.in_(SETTLED_PAYMENT_STATUSES), net_amount), else_=0)),
+        0,
+    )
+
+    report = BalanceReport(fixed=fix)
+    last_order_id = 0
+    while True:
+        rows = session.execute(
+            select(
+                Order.id,
+                Order.total_amount,
+                Order.reserved_amount,
+                Order.paid_amount,
+                Order.payment_status,
+                expected_reserved,
+                expected_paid,
+            )
+            .outerjoin(Payment, Payment.order_id == Order.id)
+            .where(Order.id > last_order_id)
+            .group_by(Order.id)
+            .order_by(Order.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+
+        chunk_drifts: list[BalanceDrift] = []
+        for order_id, total_amount, reserved_amount, paid_amount, payment_status, reserved_sum, paid_sum in rows:
+            reserved_sum = _money(reserved_sum)
+            paid_sum = _money(paid_sum)
+            expected_status = resolve_order_payment_status(total_amount, paid_sum)
+            if (reserved_amount, paid_amount, payment_status) != (reserved_sum, paid_sum, expected_status):
+                chunk_drifts.append(
+                    BalanceDrift(
+                        order_id=order_id,
+                        stored_reserved_amount=reserved_amount,
+                        expected_reserved_amount=reserved_sum,
+                        stored_paid_amount=paid_amount,
+                        expected_paid_amount=paid_sum,
+                        stored_payment_status=payment_status,
+                        expected_payment_status=expected_status,
+                    )
+                )
+
+        if fix and chunk_drifts:
+            for drift in chunk_drifts:
+                session.execute(
+                    update(Order)
+                    .where(Order.id == drift.order_id)
+                    .values(
+                        reserved_amount=drift.expected_reserved_amount,
+                        paid_amount=drift.expected_paid_amount,
+                        payment_status=drift.expected_payment_status,
+                        version=Order.version + 1,
+                    )
+                )
+            session.commit()
+
+        report.checked_orders += len(rows)
+        report.drifts.extend(chunk_drifts)
+        last_order_id = rows[-1][0]
+
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Verify denormalized order balances against payments")
+    parser.add_argument("--fix", action="store_true", help="rewrite drifted balances from payments")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    from app.database import SessionLocal
+
+    with SessionLocal() as session:
+        report = verify_order_balances(session, fix=args.fix, chunk_size=args.chunk_size)
+
+    for drift in report.drifts:
+        print(
+            f"order {drift.order_id}: "
+            f"reserved {drift.stored_reserved_amount} -> {drift.expected_reserved_amount}, "
+            f"paid {drift.stored_paid_amount} -> {drift.expected_paid_amount}, "
+            f"status {drift.stored_payment_status.value} -> {drift.expected_payment_status.value}"
+        )
+    action = "fixed" if report.fixed else "found"
+    print(f"checked {report.checked_orders} orders, {action} {len(report.drifts)} with drift")
+    return 1 if report.drifts and not report.fixed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
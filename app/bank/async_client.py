@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable
+
+import httpx
+
+from app.bank.base_client import AsyncBaseBankAPIClient, BankPoolSettings
+from app.bank.client import BankAPIClient, BankPaymentSnapshot
+from app.bank.data_wrapper import BankAPIResponseWrapper
+from app.bank.rate_limit import TokenBucketLimiter
+from app.bank.resilience import BreakerSettings, RetryPolicy
+from app.metrics import count_bank_status
+from app.money import Money
+
+
+class AsyncBankAPIClient(AsyncBaseBankAPIClient):
+    def __init__(
+        self,
+        base_url: str,
+        timeout_seconds: float,
+        pool_settings: BankPoolSettings | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        breaker_settings: BreakerSettings | None = None,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: TokenBucketLimiter | None = None,
+    ):
+        super().__init__(
+            base_url,
+            timeout_seconds,
+            pool_settings,
+            transport,
+            breaker_settings,
+            retry_policy,
+            rate_limiter,
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def start_acquiring(self, order_id: int, amount: Money) -> str:
+        payload = {"order_number": str(order_id), "amount": str(amount)}
+        data = await self._post_json("/acquiring_start", payload)
+
+        response_wrapper = BankAPIResponseWrapper(data)
+        response_wrapper.validate_data_for_start_acquiring()
+        return response_wrapper.get_bank_payment_id()
+
+    async def check_acquiring(self, bank_payment_id: str) -> BankPaymentSnapshot:
+        data = await self._post_json("/acquiring_check", {"bank_payment_id": bank_payment_id}, idempotent=True)
+
+        response_wrapper = BankAPIResponseWrapper(data)
+        response_wrapper.validate_data_for_check_acquiring(bank_payment_id)
+
+        snapshot = BankAPIClient.parse_snapshot(data)
+        count_bank_status(snapshot.status)
+        return snapshot
+
+    async def check_acquiring_many(
+        self,
+        bank_payment_ids: list[str],
+        concurrency: int,
+    ) -> list[BankPaymentSnapshot | Exception]:
+        return await gather_checks(self.check_acquiring, bank_payment_ids, concurrency)
+
+
+async def gather_checks(
+    check: Callable[[str], Awaitable[BankPaymentSnapshot]],
+    bank_payment_ids: list[str],
+    concurrency: int,
+) -> list[BankPaymentSnapshot | Exception]:
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def guarded_check(bank_payment_id: str) -> BankPaymentSnapshot | Exception:
+        async with semaphore:
+            try:
+                return await check(bank_payment_id)
+            except Exception as exc:
+                return exc
+
+    return list(await asyncio.gather(*(guarded_check(bank_payment_id) for bank_payment_id in bank_payment_ids)))
@@ -1,23 +1,189 @@
-import httpx
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterator
+
+import httpx
 
+from app.bank.rate_limit import RateLimitStats, TokenBucketLimiter
+from app.bank.resilience import BreakerSettings, BreakerStats, CircuitBreaker, RetryPolicy
 from app.enums import BankStatus
-from app.exceptions import ExternalServiceError
+from app.exceptions import BankRateLimitedError, ExternalServiceError
+from app.metrics import observe_bank_call
+
+
+@dataclass(frozen=True)
+class BankPoolSettings:
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry_seconds: float = 30.0
+    http2: bool = False
+
+    def to_limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry_seconds,
+        )
+
+
+@dataclass(frozen=True)
+class BankPoolStats:
+    max_connections: int
+    max_keepalive_connections: int
+    keepalive_expiry_seconds: float
+    http2: bool
+    open_connections: int
+    idle_connections: int
+    requests_total: int
+    requests_in_flight: int
+    peak_requests_in_flight: int
 
 
 class BaseBankAPIClient:
-    def __init__(self, base_url: str, timeout_seconds: float) -> None:
-        self._client = httpx.Client(base_url=base_url, timeout=timeout_seconds)
+    def __init__(
+        self,
+        base_url: str,
+        timeout_seconds: float,
+        pool_settings: BankPoolSettings | None = None,
+        transport: httpx.BaseTransport | httpx.AsyncBaseTransport | None = None,
+        breaker_settings: BreakerSettings | None = None,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: TokenBucketLimiter | None = None,
+    ) -> None:
+        self._pool_settings = pool_settings or BankPoolSettings()
+        self._breaker = CircuitBreaker(breaker_settings)
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._rate_limiter = rate_limiter or TokenBucketLimiter()
+        self._client = self._create_client(base_url, timeout_seconds, transport)
+        self._stats_lock = threading.Lock()
+        self._requests_total = 0
+        self._requests_in_flight = 0
+        self._peak_requests_in_flight = 0
+
+    def _create_client(
+        self,
+        base_url: str,
+        timeout_seconds: float,
+        transport: httpx.BaseTransport | None,
+    ) -> httpx.Client:
+        return httpx.Client(
+            base_url=base_url,
+            timeout=timeout_seconds,
+            limits=self._pool_settings.to_limits(),
+            http2=self._pool_settings.http2,
+            transport=transport,
+        )
 
-    def _post_json(self, path: str, json_payload: dict, httpx=None) -> dict | str:
+    def pool_stats(self) -> BankPoolStats:
+        open_connections, idle_connections = self._connection_counts()
+        with self._stats_lock:
+            return BankPoolStats(
+                max_connections=self._pool_settings.max_connections,
+                max_keepalive_connections=self._pool_settings.max_keepalive_connections,
+                keepalive_expiry_seconds=self._pool_settings.keepalive_expiry_seconds,
+                http2=self._pool_settings.http2,
+                open_connections=open_connections,
+                idle_connections=idle_connections,
+                requests_total=self._requests_total,
+                requests_in_flight=self._requests_in_flight,
+                peak_requests_in_flight=self._peak_requests_in_flight,
+            )
+
+    def breaker_stats(self) -> BreakerStats:
+        return self._breaker.stats()
+
+    def rate_limit_stats(self) -> RateLimitStats:
+        return self._rate_limiter.stats()
+
+    def _connection_counts(self) -> tuple[int, int]:
+        # httpx does not expose pool usage publicly, so read it from the httpcore pool when available.
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return len(connections), idle
+
+    def ping(self, timeout_seconds: float) -> bool:
         try:
-            response = self._client.post(path, json=json_payload)
-        except httpx.TimeoutException as exc:
-            raise ExternalServiceError(f"Bank API timeout on {path}") from exc
-        except httpx.HTTPError as exc:
-            raise ExternalServiceError(f"Bank API transport error on {path}") from exc
+            self._client.get("/", timeout=timeout_seconds)
+        except httpx.HTTPError:
+            return False
+        return True
+
+    def _post_json(self, path: str, json_payload: dict, idempotent: bool = False) -> dict | str:
+        delays = self._retry_delays(idempotent)
+        while True:
+            self._breaker.before_call(path)
+            try:
+                self._rate_limiter.acquire(path)
+            except BankRateLimitedError:
+                self._breaker.cancel_call()
+                raise
+            started_at = time.monotonic()
+            self._request_started()
+            response, error = None, None
+            try:
+                response = self._client.post(path, json=json_payload)
+            except httpx.HTTPError as exc:
+                error = self._transport_error(path, exc)
+                error.__cause__ = exc
+            finally:
+                self._request_finished()
+                error = self._record_attempt(path, response, error, time.monotonic() - started_at)
+
+            if error is None:
+                return self._parse_response(path, response)
+            delay = next(delays, None)
+            if delay is None:
+                raise error
+            time.sleep(delay)
+
+    def _retry_delays(self, idempotent: bool) -> Iterator[float]:
+        # Only calls that are safe to repeat are retried: a repeated acquiring_start could open a second payment.
+        return self._retry_policy.delays() if idempotent else iter(())
 
+    def _record_attempt(
+        self,
+        path: str,
+        response: httpx.Response | None,
+        error: ExternalServiceError | None,
+        duration_seconds: float,
+    ) -> ExternalServiceError | None:
+        if response is None:
+            self._breaker.record_failure()
+            timed_out = error is not None and isinstance(error.__cause__, httpx.TimeoutException)
+            observe_bank_call(path, "timeout" if timed_out else "transport_error", duration_seconds)
+            return error or ExternalServiceError(f"Bank API call to {path} was interrupted")
+
+        if response.status_code >= 500:
+            self._breaker.record_failure()
+            observe_bank_call(path, "http_5xx", duration_seconds)
+            return ExternalServiceError(f"Bank API is unavailable on {path}")
+
+        self._breaker.record_success(duration_seconds)
+        observe_bank_call(path, "http_4xx" if response.status_code >= 400 else "ok", duration_seconds)
+        return None
+
+    def _request_started(self) -> None:
+        with self._stats_lock:
+            self._requests_total += 1
+            self._requests_in_flight += 1
+            self._peak_requests_in_flight = max(self._peak_requests_in_flight, self._requests_in_flight)
+
+    def _request_finished(self) -> None:
+        with self._stats_lock:
+            self._requests_in_flight -= 1
+
+    @staticmethod
+    def _transport_error(path: str, exc: httpx.HTTPError) -> ExternalServiceError:
+        if isinstance(exc, httpx.TimeoutException):
+            return ExternalServiceError(f"Bank API timeout on {path}")
+        return ExternalServiceError(f"Bank API transport error on {path}")
+
+    @staticmethod
+    def _parse_response(path: str, response: httpx.Response) -> dict | str:
         if response.status_code >= 500:
             raise ExternalServiceError(f"Bank API is unavailable on {path}")
 
@@ -63,4 +229,55 @@ class BaseBankAPIClient:
         try:
             return datetime.fromisoformat(dt_value)
         except ValueError:
-            return None
\ No newline at end of file
+            return None
+
+
+class AsyncBaseBankAPIClient(BaseBankAPIClient):
+    def _create_client(
+        self,
+        base_url: str,
+        timeout_seconds: float,
+        transport: httpx.AsyncBaseTransport | None,
+    ) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout_seconds,
+            limits=self._pool_settings.to_limits(),
+            http2=self._pool_settings.http2,
+            transport=transport,
+        )
+
+    async def ping(self, timeout_seconds: float) -> bool:
+        try:
+            await self._client.get("/", timeout=timeout_seconds)
+        except httpx.HTTPError:
+            return False
+        return True
+
+    async def _post_json(self, path: str, json_payload: dict, idempotent: bool = False) -> dict | str:
+        delays = self._retry_delays(idempotent)
+        while True:
+            self._breaker.before_call(path)
+            try:
+                await self._rate_limiter.acquire_async(path)
+            except BankRateLimitedError:
+                self._breaker.cancel_call()
+                raise
+            started_at = time.monotonic()
+            self._request_started()
+            response, error = None, None
+            try:
+                response = await self._client.post(path, json=json_payload)
+            except httpx.HTTPError as exc:
+                error = self._transport_error(path, exc)
+                error.__cause__ = exc
+            finally:
+                self._request_finished()
+                error = self._record_attempt(path, response, error, time.monotonic() - started_at)
+
+            if error is None:
+                return self._parse_response(path, response)
+            delay = next(delays, None)
+            if delay is None:
+                raise error
+            await asyncio.sleep(delay)
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy.util import await_only
+
+from app.bank.async_client import AsyncBankAPIClient
+from app.bank.client import BankPaymentSnapshot
+from app.bank.pool import SharedAsyncBankClient
+from app.money import Money
+
+
+def greenlet_sleep(seconds: float) -> None:
+    # time.sleep for code inside AsyncSession.run_sync: yields to the event loop instead of blocking it.
+    await_only(asyncio.sleep(seconds))
+
+
+class GreenletBankClient:
+    # Synchronous facade for PaymentService code running inside AsyncSession.run_sync: every call is
+    # awaited on the event loop through SQLAlchemy's greenlet bridge instead of blocking a thread.
+    def __init__(self, client: AsyncBankAPIClient | SharedAsyncBankClient):
+        self._client = client
+
+    def start_acquiring(self, order_id: int, amount: Money) -> str:
+        return await_only(self._client.start_acquiring(order_id=order_id, amount=amount))
+
+    def start_acquiring_many(self, requests: list[tuple[int, Money]], concurrency: int) -> list[str | Exception]:
+        return await_only(self._start_acquiring_many(requests, concurrency))
+
+    async def _start_acquiring_many(
+        self,
+        requests: list[tuple[int, Money]],
+        concurrency: int,
+    ) -> list[str | Exception]:
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def guarded_start(order_id: int, amount: Money) -> str | Exception:
+            async with semaphore:
+                try:
+                    return await self._client.start_acquiring(order_id=order_id, amount=amount)
+                except Exception as exc:
+                    return exc
+
+        return list(await asyncio.gather(*(guarded_start(order_id, amount) for order_id, amount in requests)))
+
+    def check_acquiring(self, bank_payment_id: str) -> BankPaymentSnapshot:
+        return await_only(self._client.check_acquiring(bank_payment_id))
+
+    def check_acquiring_many(
+        self,
+        bank_payment_ids: list[str],
+        concurrency: int,
+    ) -> list[BankPaymentSnapshot | Exception]:
+        return await_only(self._client.check_acquiring_many(bank_payment_ids, concurrency))
+
+    def forget_snapshot(self, bank_payment_id: str) -> None:
+        forget_snapshot = getattr(self._client, "forget_snapshot", None)
+        if forget_snapshot is not None:
+            forget_snapshot(bank_payment_id)
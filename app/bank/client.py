@@ -2,31 +2,51 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from decimal import Decimal
 
 import httpx
 
-from app.bank.base_client import BaseBankAPIClient
+from app.bank.base_client import BaseBankAPIClient, BankPoolSettings
 from app.bank.data_wrapper import BankAPIResponseWrapper
+from app.bank.rate_limit import TokenBucketLimiter
+from app.bank.resilience import BreakerSettings, RetryPolicy
+from app.metrics import count_bank_status
+from app.money import Money
 from app.enums import BankStatus
 
 
 @dataclass(frozen=True)
 class BankPaymentSnapshot:
     bank_payment_id: str
-    amount: Decimal
+    amount: Money
     status: BankStatus
     paid_at: datetime | None
 
 
 class BankAPIClient(BaseBankAPIClient):
-    def __init__(self, base_url: str, timeout_seconds: float):
-        super().__init__(base_url, timeout_seconds)
+    def __init__(
+        self,
+        base_url: str,
+        timeout_seconds: float,
+        pool_settings: BankPoolSettings | None = None,
+        transport: httpx.BaseTransport | None = None,
+        breaker_settings: BreakerSettings | None = None,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: TokenBucketLimiter | None = None,
+    ):
+        super().__init__(
+            base_url,
+            timeout_seconds,
+            pool_settings,
+            transport,
+            breaker_settings,
+            retry_policy,
+            rate_limiter,
+        )
 
     def close(self) -> None:
         self._client.close()
 
-    def start_acquiring(self, order_id: int, amount: Decimal) -> str:
+    def start_acquiring(self, order_id: int, amount: Money) -> str:
         payload = {"order_number": str(order_id), "amount": str(amount)}
         data = self._post_json("/acquiring_start", payload)
 
@@ -35,17 +55,25 @@ class BankAPIClient(BaseBankAPIClient):
         return response_wrapper.get_bank_payment_id()
 
     def check_acquiring(self, bank_payment_id: str) -> BankPaymentSnapshot:
-        data = self._post_json("/acquiring_check", {"bank_payment_id": bank_payment_id})
+        data = self._post_json("/acquiring_check", {"bank_payment_id": bank_payment_id}, idempotent=True)
 
         response_wrapper = BankAPIResponseWrapper(data)
         response_wrapper.validate_data_for_check_acquiring(bank_payment_id)
 
+        snapshot = self.parse_snapshot(data)
+        count_bank_status(snapshot.status)
+        return snapshot
+
+    @classmethod
+    def parse_snapshot(cls, data: dict) -> BankPaymentSnapshot:
+        response_wrapper = BankAPIResponseWrapper(data)
+
         returned_payment_id = response_wrapper.get_bank_payment_id()
 
         amount = response_wrapper.get_amount()
 
-        status = self._map_status(data.get("status"))
-        paid_at = self._parse_dt(data.get("paid_at") or data.get("paid_datetime"))
+        status = cls._map_status(data.get("status"))
+        paid_at = cls._parse_dt(data.get("paid_at") or data.get("paid_datetime"))
 
         return BankPaymentSnapshot(
             bank_payment_id=returned_payment_id,
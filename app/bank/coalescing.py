@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, TypeVar
+
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class CoalescingStats:
+    bank_checks: int
+    coalesced_checks: int
+    cache_hits: int
+    cached_snapshots: int
+
+
+class SnapshotCache(Generic[T]):
+    # Not thread-safe on its own: always used under the owning SingleFlight lock.
+    def __init__(self, ttl_seconds: float, max_entries: int, clock: Callable[[], float] = time.monotonic):
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, T]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl_seconds > 0 and self._max_entries > 0
+
+    def get(self, key: str) -> T | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: T) -> None:
+        if not self.enabled:
+            return
+
+        self._entries[key] = (self._clock() + self._ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def forget(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+class _Counters:
+    def __init__(self):
+        self.bank_checks = 0
+        self.coalesced_checks = 0
+        self.cache_hits = 0
+
+    def snapshot(self, cached_snapshots: int) -> CoalescingStats:
+        return CoalescingStats(
+            bank_checks=self.bank_checks,
+            coalesced_checks=self.coalesced_checks,
+            cache_hits=self.cache_hits,
+            cached_snapshots=cached_snapshots,
+        )
+
+
+class SingleFlight(Generic[T]):
+    def __init__(self, cache: SnapshotCache[T]):
+        self._cache = cache
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, Future[T]] = {}
+        self._counters = _Counters()
+
+    def run(self, key: str, fetch: Callable[[], T]) -> T:
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._counters.cache_hits += 1
+                return cached
+
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self._in_flight[key] = Future()
+                self._counters.bank_checks += 1
+                is_leader = True
+            else:
+                self._counters.coalesced_checks += 1
+                is_leader = False
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            value = fetch()
+        except BaseException as exc:
+            with self._lock:
+                self._finish(key, future)
+            future.set_exception(exc)
+            raise
+
+        with self._lock:
+            if self._finish(key, future):
+                self._cache.put(key, value)
+        future.set_result(value)
+        return value
+
+    def forget(self, key: str) -> None:
+        # A check already in flight still answers its callers but is no longer cached or joined.
+        with self._lock:
+            self._cache.forget(key)
+            self._in_flight.pop(key, None)
+
+    def _finish(self, key: str, future: Future[T]) -> bool:
+        if self._in_flight.get(key) is not future:
+            return False
+        del self._in_flight[key]
+        return True
+
+    def stats(self) -> CoalescingStats:
+        with self._lock:
+            return self._counters.snapshot(len(self._cache))
+
+
+class AsyncSingleFlight(Generic[T]):
+    # Event-loop only: no lock is needed between the checks and the bookkeeping.
+    def __init__(self, cache: SnapshotCache[T]):
+        self._cache = cache
+        self._in_flight: dict[str, asyncio.Future[T]] = {}
+        self._counters = _Counters()
+
+    async def run(self, key: str, fetch: Callable[[], Awaitable[T]]) -> T:
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._counters.cache_hits += 1
+            return cached
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self._counters.coalesced_checks += 1
+            return await asyncio.shield(future)
+
+        future = self._in_flight[key] = asyncio.get_running_loop().create_future()
+        self._counters.bank_checks += 1
+        try:
+            value = await fetch()
+        except BaseException as exc:
+            self._finish(key, future)
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exc)
+                # Mark as retrieved: waiters are optional and the leader re-raises anyway.
+                future.exception()
+            raise
+
+        if self._finish(key, future):
+            self._cache.put(key, value)
+        future.set_result(value)
+        return value
+
+    def forget(self, key: str) -> None:
+        self._cache.forget(key)
+        self._in_flight.pop(key, None)
+
+    def _finish(self, key: str, future: asyncio.Future[T]) -> bool:
+        if self._in_flight.get(key) is not future:
+            return False
+        del self._in_flight[key]
+        return True
+
+    def stats(self) -> CoalescingStats:
+        return self._counters.snapshot(len(self._cache))
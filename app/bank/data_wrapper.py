@@ -1,7 +1,7 @@
-from decimal import Decimal, InvalidOperation
 from typing import Any
 
 from app.exceptions import ExternalServiceError, BankPaymentNotFoundError
+from app.money import Money
 
 
 class BankAPIResponseWrapper:
@@ -43,9 +43,9 @@ class BankAPIResponseWrapper:
             raise ExternalServiceError("Bank response has no payment id")
         return str(bank_payment_id)
 
-    def get_amount(self) -> Decimal:
+    def get_amount(self) -> Money:
         amount_raw = self._data.get("amount")
         try:
-            return Decimal(str(amount_raw))
-        except (InvalidOperation, TypeError) as exc:
+            return Money.parse_exact(amount_raw)
+        except ValueError as exc:
             raise ExternalServiceError("Bank acquiring returned invalid amount") from exc
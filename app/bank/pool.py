@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+from app.bank.async_client import AsyncBankAPIClient, gather_checks
+from app.bank.base_client import BankPoolSettings, BankPoolStats
+from app.bank.client import BankAPIClient, BankPaymentSnapshot
+from app.bank.coalescing import AsyncSingleFlight, CoalescingStats, SingleFlight, SnapshotCache
+from app.bank.rate_limit import RateLimitSettings, RateLimitStats, TokenBucketLimiter
+from app.bank.resilience import BreakerSettings, BreakerStats, RetryPolicy
+from app.config import Settings
+from app.money import Money
+
+
+def pool_settings_from(settings: Settings) -> BankPoolSettings:
+    return BankPoolSettings(
+        max_connections=settings.bank_api_max_connections,
+        max_keepalive_connections=settings.bank_api_max_keepalive_connections,
+        keepalive_expiry_seconds=settings.bank_api_keepalive_expiry_seconds,
+        http2=settings.bank_api_http2,
+    )
+
+
+def breaker_settings_from(settings: Settings) -> BreakerSettings:
+    return BreakerSettings(
+        failure_threshold=settings.bank_breaker_failure_threshold,
+        slow_call_seconds=settings.bank_breaker_slow_call_seconds,
+        open_seconds=settings.bank_breaker_open_seconds,
+    )
+
+
+def retry_policy_from(settings: Settings) -> RetryPolicy:
+    return RetryPolicy(
+        retries=settings.bank_check_retries,
+        base_delay_seconds=settings.bank_retry_base_delay_seconds,
+        max_delay_seconds=settings.bank_retry_max_delay_seconds,
+    )
+
+
+def rate_limit_settings_from(settings: Settings) -> RateLimitSettings:
+    return RateLimitSettings(
+        rate_per_second=settings.bank_rate_limit_per_second,
+        burst=settings.bank_rate_limit_burst,
+        interactive_reserve=settings.bank_rate_limit_interactive_reserve,
+        interactive_max_wait_seconds=settings.bank_rate_limit_max_wait_seconds,
+        background_max_wait_seconds=settings.bank_rate_limit_background_max_wait_seconds,
+    )
+
+
+def snapshot_cache_from(settings: Settings) -> SnapshotCache[BankPaymentSnapshot]:
+    return SnapshotCache(
+        ttl_seconds=settings.bank_snapshot_cache_seconds,
+        max_entries=settings.bank_snapshot_cache_size,
+    )
+
+
+class SharedBankClient:
+    def __init__(
+        self,
+        factory: Callable[[], BankAPIClient],
+        snapshot_cache: SnapshotCache[BankPaymentSnapshot] | None = None,
+    ):
+        self._factory = factory
+        self._client: BankAPIClient | None = None
+        self._lock = threading.Lock()
+        self._checks = SingleFlight(snapshot_cache or SnapshotCache(ttl_seconds=0, max_entries=0))
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "SharedBankClient":
+        return cls(
+            lambda: BankAPIClient(
+                base_url=settings.bank_api_base_url,
+                timeout_seconds=settings.bank_api_timeout_seconds,
+                pool_settings=pool_settings_from(settings),
+                breaker_settings=breaker_settings_from(settings),
+                retry_policy=retry_policy_from(settings),
+                rate_limiter=TokenBucketLimiter(rate_limit_settings_from(settings)),
+            ),
+            snapshot_cache=snapshot_cache_from(settings),
+        )
+
+    @property
+    def client(self) -> BankAPIClient:
+        client = self._client
+        if client is not None:
+            return client
+
+        with self._lock:
+            if self._client is None:
+                self._client = self._factory()
+            return self._client
+
+    @property
+    def is_started(self) -> bool:
+        return self._client is not None
+
+    def start_acquiring(self, order_id: int, amount: Money) -> str:
+        return self.client.start_acquiring(order_id=order_id, amount=amount)
+
+    def check_acquiring(self, bank_payment_id: str) -> BankPaymentSnapshot:
+        return self._checks.run(bank_payment_id, lambda: self.client.check_acquiring(bank_payment_id))
+
+    def forget_snapshot(self, bank_payment_id: str) -> None:
+        self._checks.forget(bank_payment_id)
+
+    def check_stats(self) -> CoalescingStats:
+        return self._checks.stats()
+
+    def ping(self, timeout_seconds: float) -> bool:
+        return self.client.ping(timeout_seconds)
+
+    def pool_stats(self) -> BankPoolStats | None:
+        client = self._client
+        if client is None:
+            return None
+        return client.pool_stats()
+
+    def breaker_stats(self) -> BreakerStats | None:
+        client = self._client
+        if client is None:
+            return None
+        return client.breaker_stats()
+
+    def rate_limit_stats(self) -> RateLimitStats | None:
+        client = self._client
+        if client is None:
+            return None
+        return client.rate_limit_stats()
+
+    def close(self) -> None:
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+
+class SharedAsyncBankClient:
+    def __init__(
+        self,
+        factory: Callable[[], AsyncBankAPIClient],
+        snapshot_cache: SnapshotCache[BankPaymentSnapshot] | None = None,
+    ):
+        self._factory = factory
+        self._client: AsyncBankAPIClient | None = None
+        self._checks = AsyncSingleFlight(snapshot_cache or SnapshotCache(ttl_seconds=0, max_entries=0))
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "SharedAsyncBankClient":
+        return cls(
+            lambda: AsyncBankAPIClient(
+                base_url=settings.bank_api_base_url,
+                timeout_seconds=settings.bank_api_timeout_seconds,
+                pool_settings=pool_settings_from(settings),
+                breaker_settings=breaker_settings_from(settings),
+                retry_policy=retry_policy_from(settings),
+                rate_limiter=TokenBucketLimiter(rate_limit_settings_from(settings)),
+            ),
+            snapshot_cache=snapshot_cache_from(settings),
+        )
+
+    @property
+    def client(self) -> AsyncBankAPIClient:
+        # Only touched from the event loop thread, so lazy creation needs no lock.
+        if self._client is None:
+            self._client = self._factory()
+        return self._client
+
+    @property
+    def is_started(self) -> bool:
+        return self._client is not None
+
+    async def start_acquiring(self, order_id: int, amount: Money) -> str:
+        return await self.client.start_acquiring(order_id=order_id, amount=amount)
+
+    async def check_acquiring(self, bank_payment_id: str) -> BankPaymentSnapshot:
+        return await self._checks.run(bank_payment_id, lambda: self.client.check_acquiring(bank_payment_id))
+
+    async def check_acquiring_many(
+        self,
+        bank_payment_ids: list[str],
+        concurrency: int,
+    ) -> list[BankPaymentSnapshot | Exception]:
+        return await gather_checks(self.check_acquiring, bank_payment_ids, concurrency)
+
+    def forget_snapshot(self, bank_payment_id: str) -> None:
+        self._checks.forget(bank_payment_id)
+
+    def check_stats(self) -> CoalescingStats:
+        return self._checks.stats()
+
+    def pool_stats(self) -> BankPoolStats | None:
+        client = self._client
+        if client is None:
+            return None
+        return client.pool_stats()
+
+    def breaker_stats(self) -> BreakerStats | None:
+        client = self._client
+        if client is None:
+            return None
+        return client.breaker_stats()
+
+    def rate_limit_stats(self) -> RateLimitStats | None:
+        client = self._client
+        if client is None:
+            return None
+        return client.rate_limit_stats()
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Iterator
+
+from app.exceptions import BankRateLimitedError
+
+
+class BankLane(str, Enum):
+    INTERACTIVE = "interactive"
+    BACKGROUND = "background"
+
+
+_current_lane: ContextVar[BankLane] = ContextVar("bank_lane", default=BankLane.INTERACTIVE)
+
+
+def current_lane() -> BankLane:
+    return _current_lane.get()
+
+
+@contextmanager
+def bank_lane(lane: BankLane) -> Iterator[None]:
+    token = _current_lane.set(lane)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+@dataclass(frozen=True)
+class RateLimitSettings:
+    rate_per_second: float = 0.0
+    burst: int = 0
+    interactive_reserve: float = 0.3
+    interactive_max_wait_seconds: float = 1.0
+    background_max_wait_seconds: float = 30.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate_per_second > 0
+
+    @property
+    def capacity(self) -> float:
+        return float(self.burst or max(self.rate_per_second, 1.0))
+
+    def max_wait_seconds(self, lane: BankLane) -> float:
+        if lane == BankLane.BACKGROUND:
+            return self.background_max_wait_seconds
+        return self.interactive_max_wait_seconds
+
+
+@dataclass(frozen=True)
+class RateLimitStats:
+    rate_per_second: float
+    capacity: float
+    tokens_available: float
+    interactive_granted: int
+    background_granted: int
+    rejected: int
+
+
+class TokenBucketLimiter:
+    # One bucket for the whole bank quota. Background calls may only take tokens above the interactive
+    # reserve, so bulk work runs on leftover capacity and a burst of deposits never queues behind it.
+    def __init__(self, settings: RateLimitSettings | None = None, clock: Callable[[], float] = time.monotonic):
+        self._settings = settings or RateLimitSettings()
+        self._clock = clock
+        self._lock = threading.Lock()
+        capacity = self._settings.capacity
+        self._background_floor = min(capacity * self._settings.interactive_reserve, capacity - 1)
+        self._tokens = capacity
+        self._refilled_at = clock()
+        self._granted = {lane: 0 for lane in BankLane}
+        self._rejected = 0
+
+    def acquire(self, path: str, lane: BankLane | None = None) -> None:
+        if not self._settings.enabled:
+            return
+
+        lane = lane or current_lane()
+        deadline = self._clock() + self._settings.max_wait_seconds(lane)
+        while (wait_seconds := self._take(path, lane, deadline)) > 0:
+            time.sleep(wait_seconds)
+
+    async def acquire_async(self, path: str, lane: BankLane | None = None) -> None:
+        if not self._settings.enabled:
+            return
+
+        lane = lane or current_lane()
+        deadline = self._clock() + self._settings.max_wait_seconds(lane)
+        while (wait_seconds := self._take(path, lane, deadline)) > 0:
+            await asyncio.sleep(wait_seconds)
+
+    def stats(self) -> RateLimitStats:
+        with self._lock:
+            self._refill()
+            return RateLimitStats(
+                rate_per_second=self._settings.rate_per_second,
+                capacity=self._settings.capacity,
+                tokens_available=round(self._tokens, 3),
+                interactive_granted=self._granted[BankLane.INTERACTIVE],
+                background_granted=self._granted[BankLane.BACKGROUND],
+                rejected=self._rejected,
+            )
+
+    def _take(self, path: str, lane: BankLane, deadline: float) -> float:
+        floor = self._background_floor if lane == BankLane.BACKGROUND else 0.0
+        with self._lock:
+            self._refill()
+            if self._tokens - 1 >= floor:
+                self._tokens -= 1
+                self._granted[lane] += 1
+                return 0.0
+
+            wait_seconds = (floor + 1 - self._tokens) / self._settings.rate_per_second
+            if self._clock() + wait_seconds > deadline:
+                self._rejected += 1
+                raise BankRateLimitedError(f"Bank API request quota is exhausted, {path} was not called")
+            return wait_seconds
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._tokens = min(self._settings.capacity, self._tokens + elapsed * self._settings.rate_per_second)
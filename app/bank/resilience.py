@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Iterator
+
+from app.exceptions import BankUnavailableError
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class BreakerSettings:
+    failure_threshold: int = 5
+    slow_call_seconds: float = 0.0
+    open_seconds: float = 10.0
+    half_open_max_calls: int = 1
+
+
+@dataclass(frozen=True)
+class BreakerStats:
+    state: CircuitState
+    consecutive_failures: int
+    opened_total: int
+    rejected_calls: int
+    retry_in_seconds: float
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    retries: int = 0
+    base_delay_seconds: float = 0.1
+    max_delay_seconds: float = 1.0
+
+    def delays(self, rng: random.Random | None = None) -> Iterator[float]:
+        # Full jitter: spreads retries of concurrent callers instead of syncing them into bursts.
+        uniform = (rng or random).uniform
+        for attempt in range(self.retries):
+            yield uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * 2**attempt))
+
+
+class CircuitBreaker:
+    def __init__(self, settings: BreakerSettings | None = None, clock: Callable[[], float] = time.monotonic):
+        self._settings = settings or BreakerSettings()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._opened_total = 0
+        self._rejected_calls = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._settings.failure_threshold > 0
+
+    def before_call(self, path: str) -> None:
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if self._state == CircuitState.OPEN:
+                if self._clock() - self._opened_at < self._settings.open_seconds:
+                    self._rejected_calls += 1
+                    raise BankUnavailableError(f"Bank API circuit is open, {path} was not called")
+                self._state = CircuitState.HALF_OPEN
+                self._half_open_calls = 0
+
+            if self._state == CircuitState.HALF_OPEN:
+                if self._half_open_calls >= self._settings.half_open_max_calls:
+                    self._rejected_calls += 1
+                    raise BankUnavailableError(f"Bank API circuit is half-open, {path} was not called")
+                self._half_open_calls += 1
+
+    def cancel_call(self) -> None:
+        # The call admitted by before_call never reached the bank, so it must not hold a half-open probe slot.
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def record_success(self, duration_seconds: float) -> None:
+        if not self.enabled:
+            return
+
+        slow_call_seconds = self._settings.slow_call_seconds
+        if slow_call_seconds > 0 and duration_seconds >= slow_call_seconds:
+            self.record_failure()
+            return
+
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == CircuitState.HALF_OPEN or (
+                self._state == CircuitState.CLOSED and self._consecutive_failures >= self._settings.failure_threshold
+            ):
+                self._state = CircuitState.OPEN
+                self._opened_at = self._clock()
+                self._opened_total += 1
+
+    def stats(self) -> BreakerStats:
+        with self._lock:
+            retry_in_seconds = 0.0
+            if self._state == CircuitState.OPEN:
+                retry_in_seconds = max(self._settings.open_seconds - (self._clock() - self._opened_at), 0.0)
+            return BreakerStats(
+                state=self._state,
+                consecutive_failures=self._consecutive_failures,
+                opened_total=self._opened_total,
+                rejected_calls=self._rejected_calls,
+                retry_in_seconds=retry_in_seconds,
+            )
@@ -4,8 +4,9 @@ from decimal import Decimal
 
 from sqlalchemy import func, select
 
-from app.database import Base, SessionLocal, engine
+from app.database import SessionLocal, engine
 from app.enums import OrderPaymentStatus
+from app.migrations import upgrade_schema
 from app.models import Order
 
 
@@ -13,7 +14,7 @@ DEFAULT_ORDER_AMOUNTS = [Decimal("1000.00"), Decimal("2500.00"), Decimal("999.99
 
 
 def init_db() -> None:
-    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
 
     with SessionLocal() as session:
         existing_orders = session.scalar(select(func.count(Order.id)))
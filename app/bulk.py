@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import argparse
+import csv
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+import io
+import json
+import sys
+from typing import Any, AsyncIterator, Iterable, Iterator
+
+from sqlalchemy import Select, insert, select
+from sqlalchemy.orm import Session
+
+from app.enums import BulkFormat, OrderPaymentStatus
+from app.models import Order, Payment
+from app.money import ZERO_MONEY, Money
+from app.projections import ORDER_COLUMNS, PAYMENT_COLUMNS, order_record, payment_record
+from app.services import filter_orders
+
+
+MAX_REPORTED_ERRORS = 100
+EXPORT_BATCH_ROWS = 1000
+
+# CSV column -> key of the exported record.
+ORDER_CSV_FIELDS = {
+    "order_id": "id",
+    "total_amount": "total_amount",
+    "paid_amount": "paid_amount",
+    "reserved_amount": "reserved_amount",
+    "payment_status": "payment_status",
+    "created_at": "created_at",
+}
+PAYMENT_CSV_FIELDS = {
+    "payment_id": "id",
+    "payment_type": "payment_type",
+    "amount": "amount",
+    "refunded_amount": "refunded_amount",
+    "status": "status",
+    "external_payment_id": "external_payment_id",
+    "paid_at": "paid_at",
+    "payment_created_at": "created_at",
+    "payment_updated_at": "updated_at",
+}
+MEDIA_TYPES = {
+    BulkFormat.NDJSON: "application/x-ndjson",
+    BulkFormat.CSV: "text/csv",
+}
+
+
+class RecordError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class ImportRejection:
+    line: int
+    detail: str
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    rejected: int = 0
+    errors: list[ImportRejection] = field(default_factory=list)
+
+    def reject(self, line: int, detail: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(ImportRejection(line=line, detail=detail))
+
+
+def format_for(content_type: str | None, filename: str | None = None) -> BulkFormat:
+    if filename and filename.lower().endswith(".csv"):
+        return BulkFormat.CSV
+    if content_type and content_type.split(";")[0].strip().lower() in ("text/csv", "application/csv"):
+        return BulkFormat.CSV
+    return BulkFormat.NDJSON
+
+
+class RecordDecoder:
+    # Decodes one input line at a time so that neither the HTTP body nor the file is held in memory;
+    # CSV values therefore cannot contain line breaks, which order rows never need.
+    def __init__(self, bulk_format: BulkFormat):
+        self.bulk_format = bulk_format
+        self._header: list[str] | None = None
+
+    def decode(self, line: str) -> dict[str, Any] | None:
+        line = line.strip()
+        if not line:
+            return None
+        if self.bulk_format == BulkFormat.NDJSON:
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                raise RecordError(f"Invalid JSON: {exc}") from exc
+            if not isinstance(record, dict):
+                raise RecordError("Expected a JSON object")
+            return record
+
+        values = next(csv.reader([line]))
+        if self._header is None:
+            self._header = [value.strip() for value in values]
+            return None
+        if len(values) != len(self._header):
+            raise RecordError(f"Expected {len(self._header)} columns, got {len(values)}")
+        return dict(zip(self._header, values))
+
+
+def parse_order_record(record: dict[str, Any], now: datetime) -> dict[str, Any]:
+    try:
+        total_amount = Decimal(str(record["total_amount"]))
+    except KeyError as exc:
+        raise RecordError("total_amount is required") from exc
+    except InvalidOperation as exc:
+        raise RecordError(f"Invalid total_amount: {record['total_amount']}") from exc
+    if not total_amount.is_finite() or total_amount <= 0:
+        raise RecordError("total_amount must be greater than 0")
+    if total_amount != total_amount.quantize(Decimal("0.01")) or total_amount >= Decimal("1e10"):
+        raise RecordError("total_amount must fit NUMERIC(12, 2)")
+
+    created_at = now
+    if record.get("created_at"):
+        try:
+            created_at = datetime.fromisoformat(str(record["created_at"]).replace("Z", "+00:00"))
+        except ValueError as exc:
+            raise RecordError(f"Invalid created_at: {record['created_at']}") from exc
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+
+    # Every row carries the same keys so the whole chunk goes out as a single executemany.
+    return {
+        "total_amount": Money.parse(total_amount),
+        "paid_amount": ZERO_MONEY,
+        "reserved_amount": ZERO_MONEY,
+        "payment_status": OrderPaymentStatus.UNPAID,
+        "created_at": created_at,
+    }
+
+
+class OrderImporter:
+    def __init__(self, bulk_format: BulkFormat, chunk_size: int = 5000):
+        self.decoder = RecordDecoder(bulk_format)
+        self.chunk_size = chunk_size
+        self.result = ImportResult()
+        self._line = 0
+        self._pending: list[dict[str, Any]] = []
+        self._now = datetime.now(timezone.utc)
+
+    def feed(self, line: str) -> list[dict[str, Any]] | None:
+        # Returns a full chunk of rows once enough valid records have been collected.
+        self._line += 1
+        try:
+            record = self.decoder.decode(line)
+            if record is None:
+                return None
+            self._pending.append(parse_order_record(record, self._now))
+        except RecordError as exc:
+            self.result.reject(self._line, str(exc))
+            return None
+        if len(self._pending) < self.chunk_size:
+            return None
+        return self.take()
+
+    def take(self) -> list[dict[str, Any]]:
+        rows, self._pending = self._pending, []
+        return rows
+
+
+def insert_orders(session: Session, rows: list[dict[str, Any]]) -> int:
+    if not rows:
+        return 0
+    session.execute(insert(Order), rows)
+    session.commit()
+    return len(rows)
+
+
+def import_orders(
+    session: Session,
+    lines: Iterable[str],
+    bulk_format: BulkFormat,
+    chunk_size: int = 5000,
+) -> ImportResult:
+    importer = OrderImporter(bulk_format, chunk_size)
+    for line in lines:
+        rows = importer.feed(line)
+        if rows:
+            importer.result.imported += insert_orders(session, rows)
+    importer.result.imported += insert_orders(session, importer.take())
+    return importer.result
+
+
+async def iter_text_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig")
+    if buffer:
+        yield buffer.decode("utf-8-sig")
+
+
+def export_query(
+    include_payments: bool,
+    payment_status: OrderPaymentStatus | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> Select:
+    columns = ORDER_COLUMNS + PAYMENT_COLUMNS if include_payments else ORDER_COLUMNS
+    query = select(*columns)
+    if include_payments:
+        query = query.outerjoin(Payment, Payment.order_id == Order.id).order_by(Order.id, Payment.id)
+    else:
+        query = query.order_by(Order.id)
+    # The same filters, with the same half-open created_at window, as GET /orders.
+    return filter_orders(query, None, payment_status, created_from, created_to)
+
+
+def export_orders(
+    session: Session,
+    bulk_format: BulkFormat,
+    include_payments: bool = True,
+    payment_status: OrderPaymentStatus | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> Iterator[str]:
+    # A server-side cursor (stream_results) on PostgreSQL, plain cursor iteration on SQLite: rows are
+    # fetched EXPORT_BATCH_ROWS at a time and never collected into a list.
+    rows = session.execute(
+        export_query(include_payments, payment_status, created_from, created_to).execution_options(
+            stream_results=True,
+            yield_per=EXPORT_BATCH_ROWS,
+        )
+    )
+    lines = _csv_lines(rows, include_payments) if bulk_format == BulkFormat.CSV else _ndjson_lines(rows, include_payments)
+
+    batch: list[str] = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= EXPORT_BATCH_ROWS:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+def _ndjson_lines(rows: Iterable[Any], include_payments: bool) -> Iterator[str]:
+    current: dict[str, Any] | None = None
+    for row in rows:
+        if current is None or current["id"] != row.id:
+            if current is not None:
+                yield json.dumps(current, separators=(",", ":")) + "\n"
+            current = order_record(row)
+            if include_payments:
+                current["payments"] = []
+        if include_payments and row.payment_id is not None:
+            current["payments"].append(payment_record(row))
+    if current is not None:
+        yield json.dumps(current, separators=(",", ":")) + "\n"
+
+
+def _csv_lines(rows: Iterable[Any], include_payments: bool) -> Iterator[str]:
+    fields = [*ORDER_CSV_FIELDS, *PAYMENT_CSV_FIELDS] if include_payments else list(ORDER_CSV_FIELDS)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def render(values: list[Any]) -> str:
+        writer.writerow(values)
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    yield render(fields)
+    for row in rows:
+        order = order_record(row)
+        values = [order[key] for key in ORDER_CSV_FIELDS.values()]
+        if include_payments:
+            payment = payment_record(row) if row.payment_id is not None else {}
+            values.extend(payment.get(key) for key in PAYMENT_CSV_FIELDS.values())
+        yield render(["" if value is None else value for value in values])
+
+
+def main(argv: list[str] | None = None) -> int:
+    from app.config import settings
+    from app.database import SessionLocal, engine
+    from app.migrations import upgrade_schema
+
+    parser = argparse.ArgumentParser(description="Bulk import orders and export orders with payments")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="load orders from an NDJSON or CSV file ('-' for stdin)")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", type=BulkFormat, default=None)
+    import_parser.add_argument("--chunk-size", type=int, default=settings.import_chunk_size)
+
+    export_parser = commands.add_parser("export", help="write orders and payments to stdout or a file")
+    export_parser.add_argument("--format", type=BulkFormat, default=BulkFormat.NDJSON)
+    export_parser.add_argument("--output", default="-")
+    export_parser.add_argument("--no-payments", action="store_true")
+    export_parser.add_argument("--payment-status", type=OrderPaymentStatus, default=None)
+    args = parser.parse_args(argv)
+
+    upgrade_schema(engine)
+
+    if args.command == "import":
+        bulk_format = args.format or format_for(None, args.path)
+        source = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8-sig", newline="")
+        try:
+            with SessionLocal() as session:
+                result = import_orders(session, source, bulk_format, args.chunk_size)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        for error in result.errors:
+            print(f"line {error.line}: {error.detail}", file=sys.stderr)
+        print(f"imported {result.imported} orders, rejected {result.rejected}")
+        return 1 if result.rejected else 0
+
+    target = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        with SessionLocal() as session:
+            for chunk in export_orders(
+                session,
+                args.format,
+                include_payments=not args.no_payments,
+                payment_status=args.payment_status,
+            ):
+                target.write(chunk)
+    finally:
+        if target is not sys.stdout:
+            target.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
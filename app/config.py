@@ -4,11 +4,76 @@ from dataclasses import dataclass
 import os
 
 
+def _env_bool(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in {"1", "true", "yes", "on"}
+
+
 @dataclass(frozen=True)
 class Settings:
     database_url: str = os.getenv("DATABASE_URL", "sqlite:///./billing.db")
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout_seconds: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30.0"))
+    db_pool_recycle_seconds: float = float(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800.0"))
+    db_pool_pre_ping: bool = _env_bool("DB_POOL_PRE_PING", "true")
+    db_busy_retry_base_delay_seconds: float = float(os.getenv("DB_BUSY_RETRY_BASE_DELAY_SECONDS", "0.05"))
+    sqlite_journal_mode: str = os.getenv("SQLITE_JOURNAL_MODE", "wal")
+    sqlite_synchronous: str = os.getenv("SQLITE_SYNCHRONOUS", "normal")
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    sqlite_mmap_size: int = int(os.getenv("SQLITE_MMAP_SIZE", "268435456"))
+    sqlite_cache_size: int = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+    metrics_enabled: bool = _env_bool("METRICS_ENABLED", "false")
+    fast_responses: bool = _env_bool("FAST_RESPONSES", "true")
+    gzip_minimum_size: int = int(os.getenv("GZIP_MINIMUM_SIZE", "0"))
+    async_mode: bool = _env_bool("ASYNC_MODE", "false")
+    async_database_url: str | None = os.getenv("ASYNC_DATABASE_URL") or None
     bank_api_base_url: str = os.getenv("BANK_API_BASE_URL", "https://bank.api")
     bank_api_timeout_seconds: float = float(os.getenv("BANK_API_TIMEOUT_SECONDS", "5.0"))
+    bank_api_max_connections: int = int(os.getenv("BANK_API_MAX_CONNECTIONS", "100"))
+    bank_api_max_keepalive_connections: int = int(os.getenv("BANK_API_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    bank_api_keepalive_expiry_seconds: float = float(os.getenv("BANK_API_KEEPALIVE_EXPIRY_SECONDS", "30.0"))
+    bank_api_http2: bool = _env_bool("BANK_API_HTTP2", "false")
+    bank_webhook_token: str | None = os.getenv("BANK_WEBHOOK_TOKEN") or None
+    readiness_check_bank: bool = _env_bool("READINESS_CHECK_BANK", "false")
+    bank_breaker_failure_threshold: int = int(os.getenv("BANK_BREAKER_FAILURE_THRESHOLD", "5"))
+    bank_breaker_slow_call_seconds: float = float(os.getenv("BANK_BREAKER_SLOW_CALL_SECONDS", "2.0"))
+    bank_breaker_open_seconds: float = float(os.getenv("BANK_BREAKER_OPEN_SECONDS", "10.0"))
+    bank_check_retries: int = int(os.getenv("BANK_CHECK_RETRIES", "2"))
+    bank_retry_base_delay_seconds: float = float(os.getenv("BANK_RETRY_BASE_DELAY_SECONDS", "0.1"))
+    bank_retry_max_delay_seconds: float = float(os.getenv("BANK_RETRY_MAX_DELAY_SECONDS", "1.0"))
+    bank_rate_limit_per_second: float = float(os.getenv("BANK_RATE_LIMIT_PER_SECOND", "0"))
+    bank_rate_limit_burst: int = int(os.getenv("BANK_RATE_LIMIT_BURST", "0"))
+    bank_rate_limit_interactive_reserve: float = float(os.getenv("BANK_RATE_LIMIT_INTERACTIVE_RESERVE", "0.3"))
+    bank_rate_limit_max_wait_seconds: float = float(os.getenv("BANK_RATE_LIMIT_MAX_WAIT_SECONDS", "1.0"))
+    bank_rate_limit_background_max_wait_seconds: float = float(
+        os.getenv("BANK_RATE_LIMIT_BACKGROUND_MAX_WAIT_SECONDS", "30.0")
+    )
+    bank_snapshot_cache_seconds: float = float(os.getenv("BANK_SNAPSHOT_CACHE_SECONDS", "1.0"))
+    bank_snapshot_cache_size: int = int(os.getenv("BANK_SNAPSHOT_CACHE_SIZE", "10000"))
+    bank_health_cache_seconds: float = float(os.getenv("BANK_HEALTH_CACHE_SECONDS", "30.0"))
+    bank_health_timeout_seconds: float = float(os.getenv("BANK_HEALTH_TIMEOUT_SECONDS", "2.0"))
+    acquiring_mode: str = os.getenv("ACQUIRING_MODE", "sync")
+    acquiring_freshness_seconds: float = float(os.getenv("ACQUIRING_FRESHNESS_SECONDS", "2.0"))
+    bank_check_concurrency: int = int(os.getenv("BANK_CHECK_CONCURRENCY", "4"))
+    order_update_retries: int = int(os.getenv("ORDER_UPDATE_RETRIES", "3"))
+    import_chunk_size: int = int(os.getenv("IMPORT_CHUNK_SIZE", "5000"))
+    batch_chunk_size: int = int(os.getenv("BATCH_CHUNK_SIZE", "100"))
+    idempotency_key_ttl_seconds: float = float(os.getenv("IDEMPOTENCY_KEY_TTL_SECONDS", "86400"))
+    idempotency_lease_seconds: float = float(os.getenv("IDEMPOTENCY_LEASE_SECONDS", "120"))
+    idempotency_purge_interval_seconds: float = float(os.getenv("IDEMPOTENCY_PURGE_INTERVAL_SECONDS", "3600"))
+    reconcile_concurrency: int = int(os.getenv("RECONCILE_CONCURRENCY", "8"))
+    reconcile_chunk_size: int = int(os.getenv("RECONCILE_CHUNK_SIZE", "100"))
+    reconciler_lease_seconds: float = float(os.getenv("RECONCILER_LEASE_SECONDS", "120.0"))
+    reconciler_idle_seconds: float = float(os.getenv("RECONCILER_IDLE_SECONDS", "1.0"))
+    reconciler_base_interval_seconds: float = float(os.getenv("RECONCILER_BASE_INTERVAL_SECONDS", "5.0"))
+    reconciler_max_interval_seconds: float = float(os.getenv("RECONCILER_MAX_INTERVAL_SECONDS", "900.0"))
+    outbox_batch_size: int = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+    outbox_concurrency: int = int(os.getenv("OUTBOX_CONCURRENCY", "8"))
+    outbox_max_attempts: int = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+    outbox_lease_seconds: float = float(os.getenv("OUTBOX_LEASE_SECONDS", "60.0"))
+    outbox_idle_seconds: float = float(os.getenv("OUTBOX_IDLE_SECONDS", "0.5"))
+    outbox_retry_base_delay_seconds: float = float(os.getenv("OUTBOX_RETRY_BASE_DELAY_SECONDS", "1.0"))
+    outbox_retry_max_delay_seconds: float = float(os.getenv("OUTBOX_RETRY_MAX_DELAY_SECONDS", "60.0"))
 
 
 settings = Settings()
@@ -2,20 +2,34 @@ from __future__ import annotations
 
 from typing import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from app.config import settings
+from app.metrics import instrument_engine
+from app.storage import storage_profile_from
 
 
 class Base(DeclarativeBase):
     pass
 
 
-connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
-engine = create_engine(settings.database_url, connect_args=connect_args)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+storage_profile = storage_profile_from(settings)
+engine = create_engine(settings.database_url, **storage_profile.engine_options(settings.database_url))
+storage_profile.install(engine)
+if settings.metrics_enabled:
+    instrument_engine(engine)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
 
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
+
 
 def get_session() -> Generator:
     session = SessionLocal()
@@ -23,3 +37,32 @@ def get_session() -> Generator:
         yield session
     finally:
         session.close()
+
+
+def async_database_url(database_url: str) -> str:
+    url = make_url(database_url)
+    async_driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if async_driver is None or url.drivername == async_driver:
+        return database_url
+    return url.set(drivername=async_driver).render_as_string(hide_password=False)
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    # Created on first use so the sync-only deployment does not need the async drivers installed.
+    global _async_engine, _async_session_factory
+    if _async_session_factory is None:
+        database_url = settings.async_database_url or async_database_url(settings.database_url)
+        _async_engine = create_async_engine(database_url, **storage_profile.engine_options(database_url))
+        storage_profile.install(_async_engine.sync_engine)
+        if settings.metrics_enabled:
+            instrument_engine(_async_engine.sync_engine)
+        _async_session_factory = async_sessionmaker(bind=_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_session_factory
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_session_factory = None
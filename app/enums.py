@@ -29,3 +29,24 @@ class BankStatus(str, Enum):
     FAILED = "failed"
     CANCELLED = "cancelled"
     UNKNOWN = "unknown"
+
+
+class OutboxStatus(str, Enum):
+    PENDING = "pending"
+    DISPATCHED = "dispatched"
+    FAILED = "failed"
+
+
+class BulkFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class NotificationResult(str, Enum):
+    APPLIED = "applied"
+    UNCHANGED = "unchanged"
+    IGNORED = "ignored"
+    DUPLICATE = "duplicate"
+    NOT_FOUND = "not_found"
+    CONFLICT = "conflict"
+    INVALID = "invalid"
@@ -10,6 +10,11 @@ class AppError(Exception):
         super().__init__(message)
 
 
+class UnauthorizedError(AppError):
+    status_code = 401
+    code = "unauthorized"
+
+
 class NotFoundError(AppError):
     status_code = 404
     code = "not_found"
@@ -25,11 +30,35 @@ class ConflictError(AppError):
     code = "conflict"
 
 
+class IdempotencyKeyReusedError(AppError):
+    status_code = 422
+    code = "idempotency_key_reused"
+
+
+class IdempotencyKeyInProgressError(ConflictError):
+    code = "idempotency_key_in_progress"
+
+
+class DatabaseBusyError(AppError):
+    status_code = 503
+    code = "database_busy"
+
+
 class ExternalServiceError(AppError):
     status_code = 502
     code = "external_service_error"
 
 
+class BankUnavailableError(ExternalServiceError):
+    status_code = 503
+    code = "bank_unavailable"
+
+
+class BankRateLimitedError(ExternalServiceError):
+    status_code = 503
+    code = "bank_rate_limited"
+
+
 class BankPaymentNotFoundError(ExternalServiceError):
     status_code = 409
     code = "bank_payment_not_found"
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+class CachedProbe:
+    def __init__(self, probe: Callable[[], bool], ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self._probe = probe
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._value: bool | None = None
+        self._checked_at = 0.0
+
+    def check(self) -> bool:
+        with self._lock:
+            now = self._clock()
+            if self._value is None or now - self._checked_at >= self._ttl_seconds:
+                self._value = self._probe()
+                self._checked_at = now
+            return self._value
+
+
+def database_is_ready(session: Session) -> bool:
+    try:
+        session.execute(text("SELECT 1"))
+    except Exception:
+        return False
+    return True
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import hashlib
+import json
+from typing import Any, Callable, TypeVar
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.exceptions import IdempotencyKeyInProgressError, IdempotencyKeyReusedError
+from app.models import IdempotencyKey
+from app.services import PaymentService
+from app.timestamps import as_utc
+
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    status_code: int
+    body: Any
+
+
+def request_fingerprint(payload: dict[str, Any]) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class IdempotencyStore:
+    def __init__(self, session: Session, ttl_seconds: float, lease_seconds: float = 120.0):
+        self.session = session
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.lease = timedelta(seconds=lease_seconds)
+
+    def begin(self, scope: str, key: str, request_hash: str) -> StoredResponse | None:
+        now = datetime.now(timezone.utc)
+        record = self.session.scalar(
+            select(IdempotencyKey).where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+        )
+        if record is not None and as_utc(record.expires_at) <= now:
+            self.session.delete(record)
+            self.session.flush()
+            record = None
+
+        if record is not None:
+            self._check_reuse(record, key, request_hash)
+            if record.status_code is None:
+                self._take_over(record, key, now)
+                return None
+            return self._stored_response(record)
+
+        self.session.add(
+            IdempotencyKey(
+                scope=scope,
+                key=key,
+                request_hash=request_hash,
+                created_at=now,
+                expires_at=now + self.ttl,
+                locked_until=now + self.lease,
+            )
+        )
+        try:
+            self.session.commit()
+        except IntegrityError as exc:
+            # A concurrent request inserted the key first; it may have finished in the meantime.
+            self.session.rollback()
+            record = self.session.scalar(
+                select(IdempotencyKey).where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+            )
+            if record is None or record.status_code is None:
+                raise IdempotencyKeyInProgressError(f"Request with idempotency key {key} is still in progress") from exc
+            self._check_reuse(record, key, request_hash)
+            return self._stored_response(record)
+        return None
+
+    def _check_reuse(self, record: IdempotencyKey, key: str, request_hash: str) -> None:
+        if record.request_hash != request_hash:
+            raise IdempotencyKeyReusedError(f"Idempotency key {key} was already used with a different request")
+
+    def _stored_response(self, record: IdempotencyKey) -> StoredResponse:
+        return StoredResponse(status_code=record.status_code, body=json.loads(record.response_body))
+
+    def _take_over(self, record: IdempotencyKey, key: str, now: datetime) -> None:
+        # A request that crashed without completing or releasing its key leaves it locked only until the lease
+        # runs out; the conditional update lets exactly one retry take the key over after that.
+        taken = self.session.execute(
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.id == record.id,
+                IdempotencyKey.status_code.is_(None),
+                or_(IdempotencyKey.locked_until.is_(None), IdempotencyKey.locked_until <= now),
+            )
+            .values(locked_until=now + self.lease, expires_at=now + self.ttl)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.session.commit()
+        if not taken:
+            raise IdempotencyKeyInProgressError(f"Request with idempotency key {key} is still in progress")
+
+    def record(self, scope: str, key: str, status_code: int, body: Any) -> None:
+        self.session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+            .values(status_code=status_code, response_body=json.dumps(body), locked_until=None)
+        )
+
+    def complete(self, scope: str, key: str, status_code: int, body: Any) -> None:
+        self.record(scope, key, status_code, body)
+        self.session.commit()
+
+    def release(self, scope: str, key: str) -> None:
+        # A key whose response is already stored stays: the work it describes is committed.
+        self.session.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.scope == scope,
+                IdempotencyKey.key == key,
+                IdempotencyKey.status_code.is_(None),
+            )
+        )
+        self.session.commit()
+
+    def purge_expired(self, now: datetime | None = None) -> int:
+        now = now or datetime.now(timezone.utc)
+        result = self.session.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now))
+        self.session.commit()
+        return result.rowcount
+
+
+def run_idempotent(
+    store: IdempotencyStore,
+    scope: str,
+    key: str | None,
+    request_payload: dict[str, Any],
+    status_code: int,
+    operation: Callable[[], T],
+    render: Callable[[T], BaseModel],
+    service: PaymentService | None = None,
+) -> BaseModel | JSONResponse:
+    if key is None:
+        return render(operation())
+
+    stored = store.begin(scope, key, request_fingerprint(request_payload))
+    if stored is not None:
+        return JSONResponse(status_code=stored.status_code, content=stored.body, headers={REPLAYED_HEADER: "true"})
+
+    rendered: list[BaseModel] = []
+
+    def store_response(result: T) -> None:
+        # Written right before the service's final commit: the deposit or refund and the response that replays it
+        # become durable together, so a crash in between can no longer leave the key open for a second attempt.
+        response = render(result)
+        store.record(scope, key, status_code, response.model_dump(mode="json"))
+        rendered[:] = [response]
+
+    try:
+        if service is None:
+            result = operation()
+        else:
+            with service.completing(store_response):
+                result = operation()
+    except Exception:
+        store.session.rollback()
+        store.release(scope, key)
+        raise
+
+    if rendered:
+        return rendered[0]
+    response = render(result)
+    store.complete(scope, key, status_code, response.model_dump(mode="json"))
+    return response
@@ -1,34 +1,108 @@
 from __future__ import annotations
 
-from typing import Generator
+import asyncio
+import contextlib
+from datetime import datetime
+import hmac
+import logging
+from typing import Any, AsyncIterator
 
-from fastapi import Depends, FastAPI
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, Header, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.bank.client import BankAPIClient
+from app.async_services import AsyncPaymentService, ServiceRunner, ThreadedServiceRunner
+from app.bank.pool import SharedAsyncBankClient, SharedBankClient
 from app.bootstrap import init_db
 from app.config import settings
-from app.database import get_session
-from app.exceptions import AppError
+from app.database import SessionLocal, dispose_async_engine, get_async_session_factory, get_session
+from app.bulk import MEDIA_TYPES, OrderImporter, export_orders, format_for, insert_orders, iter_text_lines
+from app.enums import BulkFormat, OrderPaymentStatus, PaymentType
+from app.exceptions import AppError, NotFoundError, UnauthorizedError
+from app.health import CachedProbe, database_is_ready
+from app.idempotency import IdempotencyStore, run_idempotent
+from app.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from app.models import Order
 from app.schemas import (
+    BankClientStatsResponse,
+    BatchItemErrorResponse,
+    BatchItemResultResponse,
+    BatchOperationResponse,
+    BankNotificationBatchRequest,
+    BankNotificationBatchResponse,
+    BankNotificationResultResponse,
+    HealthResponse,
+    ImportResponse,
+    OrderListItemResponse,
+    OrderPageResponse,
     ReconcileResponse,
     OrderResponse,
     OrderWithPaymentsResponse,
+    PaymentBatchRequest,
     PaymentCreateRequest,
     PaymentOperationResponse,
+    ReadinessResponse,
+    RefundBatchRequest,
     RefundRequest,
     SyncResponse,
 )
-from app.services import PaymentService
+from app.serialization import FastJSONResponse
+from app.services import BatchItemOutcome, DepositItem, OrderPaymentResult, PaymentService, RefundItem
 
 
 app = FastAPI(title="Billing Contest Payment Service", version="1.0.0")
+bank_client = SharedBankClient.from_settings(settings)
+async_bank_client = SharedAsyncBankClient.from_settings(settings)
+bank_probe = CachedProbe(
+    lambda: bank_client.ping(settings.bank_health_timeout_seconds),
+    ttl_seconds=settings.bank_health_cache_seconds,
+)
+
+
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+if settings.gzip_minimum_size > 0:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_minimum_size)
+
+
+logger = logging.getLogger(__name__)
+background_tasks: set[asyncio.Task] = set()
+
+
+def purge_idempotency_keys() -> int:
+    with SessionLocal() as session:
+        return IdempotencyStore(session, settings.idempotency_key_ttl_seconds).purge_expired()
+
+
+async def purge_idempotency_keys_periodically() -> None:
+    while True:
+        await asyncio.sleep(settings.idempotency_purge_interval_seconds)
+        try:
+            await run_in_threadpool(purge_idempotency_keys)
+        except Exception:
+            logger.exception("idempotency key purge failed")
 
 
 @app.on_event("startup")
-def startup() -> None:
-    init_db()
+async def startup() -> None:
+    await run_in_threadpool(init_db)
+    await run_in_threadpool(purge_idempotency_keys)
+    if settings.idempotency_purge_interval_seconds > 0:
+        background_tasks.add(asyncio.create_task(purge_idempotency_keys_periodically()))
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    for task in background_tasks:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    background_tasks.clear()
+    bank_client.close()
+    await async_bank_client.aclose()
+    await dispose_async_engine()
 
 
 @app.exception_handler(AppError)
@@ -42,75 +116,370 @@ async def app_error_handler(_, exc: AppError) -> JSONResponse:
     )
 
 
-def get_bank_client() -> Generator[BankAPIClient, None, None]:
-    client = BankAPIClient(
-        base_url=settings.bank_api_base_url,
-        timeout_seconds=settings.bank_api_timeout_seconds,
-    )
-    try:
-        yield client
-    finally:
-        client.close()
+def get_bank_client() -> SharedBankClient:
+    return bank_client
+
+
+def payment_service_options() -> dict[str, Any]:
+    return {
+        "acquiring_freshness_seconds": settings.acquiring_freshness_seconds,
+        "bank_check_concurrency": settings.bank_check_concurrency,
+        "concurrent_update_retries": settings.order_update_retries,
+        "busy_retry_base_delay_seconds": settings.db_busy_retry_base_delay_seconds,
+        "acquiring_outbox": settings.acquiring_mode == "outbox",
+    }
 
 
 def get_payment_service(
     session: Session = Depends(get_session),
-    bank_client: BankAPIClient = Depends(get_bank_client),
+    bank_client: SharedBankClient = Depends(get_bank_client),
 ) -> PaymentService:
-    return PaymentService(session=session, bank_client=bank_client)
+    return PaymentService(session=session, bank_client=bank_client, **payment_service_options())
+
+
+def get_threaded_service_runner(service: PaymentService = Depends(get_payment_service)) -> ThreadedServiceRunner:
+    return ThreadedServiceRunner(service)
+
+
+async def get_async_service_runner() -> AsyncIterator[AsyncPaymentService]:
+    async with get_async_session_factory()() as session:
+        yield AsyncPaymentService(session, async_bank_client, **payment_service_options())
+
+
+get_service_runner = get_async_service_runner if settings.async_mode else get_threaded_service_runner
 
 
-@app.get("/orders", response_model=list[OrderWithPaymentsResponse])
-def list_orders(service: PaymentService = Depends(get_payment_service)) -> list[OrderWithPaymentsResponse]:
-    orders = service.list_orders()
-    return [OrderWithPaymentsResponse.model_validate(order) for order in orders]
+def idempotency_store_for(service: PaymentService) -> IdempotencyStore:
+    return IdempotencyStore(
+        service.session,
+        settings.idempotency_key_ttl_seconds,
+        settings.idempotency_lease_seconds,
+    )
+
+
+def _payment_operation_response(result: OrderPaymentResult) -> PaymentOperationResponse:
+    return PaymentOperationResponse(
+        order=OrderResponse.model_validate(result.order),
+        payment=result.payment,
+    )
+
+
+def _batch_operation_response(outcomes: list[BatchItemOutcome]) -> BatchOperationResponse:
+    results = [
+        BatchItemResultResponse(
+            index=outcome.index,
+            payment=outcome.payment,
+            error=(
+                BatchItemErrorResponse(error=outcome.error.code, detail=outcome.error.message)
+                if outcome.error is not None
+                else None
+            ),
+        )
+        for outcome in outcomes
+    ]
+    failed = sum(1 for outcome in outcomes if outcome.error is not None)
+    return BatchOperationResponse(succeeded=len(outcomes) - failed, failed=failed, results=results)
+
+
+@app.get("/healthz", response_model=HealthResponse)
+def healthz() -> HealthResponse:
+    return HealthResponse(status="ok")
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    if not registry.enabled:
+        raise NotFoundError("Metrics are disabled")
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/readyz", response_model=ReadinessResponse, responses={503: {"model": ReadinessResponse}})
+def readyz(session: Session = Depends(get_session)) -> ReadinessResponse | JSONResponse:
+    database_ready = database_is_ready(session)
+    bank_ready = bank_probe.check() if settings.readiness_check_bank else None
+    ready = database_ready and bank_ready is not False
+    readiness = ReadinessResponse(
+        status="ok" if ready else "unavailable",
+        database=database_ready,
+        bank=bank_ready,
+    )
+    if not ready:
+        return JSONResponse(status_code=503, content=readiness.model_dump())
+    return readiness
+
+
+def _order_list_item(order: Order, include_payments: bool) -> OrderListItemResponse:
+    if include_payments:
+        return OrderListItemResponse.model_validate(order)
+    return OrderListItemResponse(
+        id=order.id,
+        total_amount=order.total_amount,
+        paid_amount=order.paid_amount,
+        reserved_amount=order.reserved_amount,
+        payment_status=order.payment_status,
+        created_at=order.created_at,
+    )
+
+
+@app.get("/orders", response_model=OrderPageResponse)
+async def list_orders(
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: int | None = Query(default=None, ge=0),
+    payment_status: OrderPaymentStatus | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    include_payments: bool = True,
+    runner: ServiceRunner = Depends(get_service_runner),
+) -> OrderPageResponse | FastJSONResponse:
+    if settings.fast_responses:
+        page = await runner.run(
+            lambda service: service.list_order_records(
+                limit=limit,
+                cursor=cursor,
+                payment_status=payment_status,
+                created_from=created_from,
+                created_to=created_to,
+                include_payments=include_payments,
+            )
+        )
+        return FastJSONResponse({"items": page.items, "next_cursor": page.next_cursor})
+
+    def list_page(service: PaymentService) -> OrderPageResponse:
+        page = service.list_orders(
+            limit=limit,
+            cursor=cursor,
+            payment_status=payment_status,
+            created_from=created_from,
+            created_to=created_to,
+            include_payments=include_payments,
+        )
+        return OrderPageResponse(
+            items=[_order_list_item(order, include_payments) for order in page.orders],
+            next_cursor=page.next_cursor,
+        )
+
+    return await runner.run(list_page)
+
+
+@app.post("/orders/import", response_model=ImportResponse)
+async def import_orders(
+    request: Request,
+    format: BulkFormat | None = None,
+    runner: ServiceRunner = Depends(get_service_runner),
+) -> ImportResponse:
+    # The body is consumed line by line and inserted chunk by chunk, so its size does not matter.
+    importer = OrderImporter(format or format_for(request.headers.get("content-type")), settings.import_chunk_size)
+    async for line in iter_text_lines(request.stream()):
+        rows = importer.feed(line)
+        if rows:
+            importer.result.imported += await runner.run(lambda service: insert_orders(service.session, rows))
+    rows = importer.take()
+    importer.result.imported += await runner.run(lambda service: insert_orders(service.session, rows))
+    return ImportResponse.model_validate(importer.result)
+
+
+@app.get("/orders/export")
+def export_orders_stream(
+    format: BulkFormat = BulkFormat.NDJSON,
+    include_payments: bool = True,
+    payment_status: OrderPaymentStatus | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> StreamingResponse:
+    def body():
+        with SessionLocal() as session:
+            yield from export_orders(
+                session,
+                format,
+                include_payments=include_payments,
+                payment_status=payment_status,
+                created_from=created_from,
+                created_to=created_to,
+            )
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="orders.{format.value}"'},
+    )
 
 
 @app.get("/orders/{order_id}", response_model=OrderWithPaymentsResponse)
-def get_order(order_id: int, service: PaymentService = Depends(get_payment_service)) -> OrderWithPaymentsResponse:
-    order = service.get_order(order_id)
-    return OrderWithPaymentsResponse.model_validate(order)
+async def get_order(
+    order_id: int,
+    runner: ServiceRunner = Depends(get_service_runner),
+) -> OrderWithPaymentsResponse | FastJSONResponse:
+    if settings.fast_responses:
+        return FastJSONResponse(await runner.run(lambda service: service.get_order_record(order_id)))
+    return await runner.run(lambda service: OrderWithPaymentsResponse.model_validate(service.get_order(order_id)))
 
 
 @app.post("/orders/{order_id}/payments", response_model=PaymentOperationResponse, status_code=201)
-def create_payment(
+async def create_payment(
     order_id: int,
     request: PaymentCreateRequest,
-    service: PaymentService = Depends(get_payment_service),
+    response: Response,
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key", max_length=255),
+    runner: ServiceRunner = Depends(get_service_runner),
 ) -> PaymentOperationResponse:
-    result = service.deposit(order_id=order_id, amount_raw=request.amount, payment_type=request.payment_type)
-    return PaymentOperationResponse(
-        order=OrderResponse.model_validate(result.order),
-        payment=result.payment,
-    )
+    # In outbox mode the bank payment is opened by the dispatcher, so the request is only accepted here.
+    if settings.acquiring_mode == "outbox" and request.payment_type == PaymentType.ACQUIRING:
+        response.status_code = 202
+
+    def deposit(service: PaymentService) -> PaymentOperationResponse:
+        return run_idempotent(
+            idempotency_store_for(service),
+            scope="create_payment",
+            key=idempotency_key,
+            request_payload={"order_id": order_id, **request.model_dump(mode="json")},
+            status_code=response.status_code or 201,
+            operation=lambda: service.deposit(
+                order_id=order_id, amount_raw=request.amount, payment_type=request.payment_type
+            ),
+            render=_payment_operation_response,
+            service=service,
+        )
+
+    return await runner.run(deposit)
 
 
 @app.post("/payments/{payment_id}/refund", response_model=PaymentOperationResponse)
-def refund_payment(
+async def refund_payment(
     payment_id: int,
     request: RefundRequest,
-    service: PaymentService = Depends(get_payment_service),
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key", max_length=255),
+    runner: ServiceRunner = Depends(get_service_runner),
 ) -> PaymentOperationResponse:
-    result = service.refund(payment_id=payment_id, amount_raw=request.amount)
-    return PaymentOperationResponse(
-        order=OrderResponse.model_validate(result.order),
-        payment=result.payment,
-    )
+    def refund(service: PaymentService) -> PaymentOperationResponse:
+        return run_idempotent(
+            idempotency_store_for(service),
+            scope="refund_payment",
+            key=idempotency_key,
+            request_payload={"payment_id": payment_id, **request.model_dump(mode="json")},
+            status_code=200,
+            operation=lambda: service.refund(payment_id=payment_id, amount_raw=request.amount),
+            render=_payment_operation_response,
+            service=service,
+        )
+
+    return await runner.run(refund)
+
+
+@app.post("/payments/batch", response_model=BatchOperationResponse)
+async def create_payments_batch(
+    request: PaymentBatchRequest,
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key", max_length=255),
+    runner: ServiceRunner = Depends(get_service_runner),
+) -> BatchOperationResponse:
+    items = [
+        DepositItem(order_id=item.order_id, amount=item.amount, payment_type=item.payment_type)
+        for item in request.items
+    ]
+
+    def deposit_many(service: PaymentService) -> BatchOperationResponse:
+        return run_idempotent(
+            idempotency_store_for(service),
+            scope="create_payment_batch",
+            key=idempotency_key,
+            request_payload=request.model_dump(mode="json"),
+            status_code=200,
+            operation=lambda: service.deposit_many(items, chunk_size=settings.batch_chunk_size),
+            render=_batch_operation_response,
+            service=service,
+        )
+
+    return await runner.run(deposit_many)
+
+
+@app.post("/refunds/batch", response_model=BatchOperationResponse)
+async def refund_payments_batch(
+    request: RefundBatchRequest,
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key", max_length=255),
+    runner: ServiceRunner = Depends(get_service_runner),
+) -> BatchOperationResponse:
+    items = [RefundItem(payment_id=item.payment_id, amount=item.amount) for item in request.items]
+
+    def refund_many(service: PaymentService) -> BatchOperationResponse:
+        return run_idempotent(
+            idempotency_store_for(service),
+            scope="refund_payment_batch",
+            key=idempotency_key,
+            request_payload=request.model_dump(mode="json"),
+            status_code=200,
+            operation=lambda: service.refund_many(items, chunk_size=settings.batch_chunk_size),
+            render=_batch_operation_response,
+            service=service,
+        )
+
+    return await runner.run(refund_many)
 
 
 @app.post("/payments/{payment_id}/sync", response_model=SyncResponse)
-def sync_payment(payment_id: int, service: PaymentService = Depends(get_payment_service)) -> SyncResponse:
-    payment = service.sync_payment(payment_id)
-    return SyncResponse(
-        payment=payment,
-        order=payment.order,
-    )
+async def sync_payment(payment_id: int, runner: ServiceRunner = Depends(get_service_runner)) -> SyncResponse:
+    def sync(service: PaymentService) -> SyncResponse:
+        payment = service.sync_payment(payment_id)
+        return SyncResponse(
+            payment=payment,
+            order=payment.order,
+        )
+
+    return await runner.run(sync)
 
 
 @app.post("/payments/reconcile", response_model=ReconcileResponse)
-def reconcile_pending_payments(service: PaymentService = Depends(get_payment_service)) -> ReconcileResponse:
-    processed_payments, affected_orders = service.reconcile_pending_payments()
+async def reconcile_pending_payments(
+    concurrency: int = Query(default=settings.reconcile_concurrency, ge=1, le=64),
+    chunk_size: int = Query(default=settings.reconcile_chunk_size, ge=1, le=1000),
+    cursor: int | None = Query(default=None, ge=0),
+    limit: int | None = Query(default=None, ge=1),
+    runner: ServiceRunner = Depends(get_service_runner),
+) -> ReconcileResponse:
+    result = await runner.run(
+        lambda service: service.reconcile_pending_payments(
+            concurrency=concurrency,
+            chunk_size=chunk_size,
+            cursor=cursor,
+            limit=limit,
+        )
+    )
     return ReconcileResponse(
-        processed_payments=processed_payments,
-        affected_orders=affected_orders,
+        processed_payments=result.processed_payments,
+        affected_orders=result.affected_orders,
+        failed_checks=result.failed_checks,
+        conflicts=result.conflicts,
+        status_counts=result.status_counts,
+        duration_seconds=result.duration_seconds,
+        payments_per_second=result.payments_per_second,
+        next_cursor=result.next_cursor,
+    )
+
+
+@app.get("/bank/stats", response_model=BankClientStatsResponse)
+def bank_client_stats(bank_client: SharedBankClient = Depends(get_bank_client)) -> BankClientStatsResponse:
+    active_client = async_bank_client if settings.async_mode else bank_client
+    return BankClientStatsResponse(
+        started=active_client.is_started,
+        pool=active_client.pool_stats(),
+        breaker=active_client.breaker_stats(),
+        rate_limit=active_client.rate_limit_stats(),
+        checks=active_client.check_stats(),
+    )
+
+
+@app.post("/bank/notifications", response_model=BankNotificationBatchResponse)
+async def receive_bank_notifications(
+    request: BankNotificationBatchRequest,
+    webhook_token: str | None = Header(default=None, alias="X-Bank-Webhook-Token"),
+    runner: ServiceRunner = Depends(get_service_runner),
+) -> BankNotificationBatchResponse:
+    # Fails closed: without a configured token nobody may move payment statuses through this route.
+    if not settings.bank_webhook_token:
+        raise UnauthorizedError("Bank notifications are disabled: BANK_WEBHOOK_TOKEN is not set")
+    if not hmac.compare_digest(webhook_token or "", settings.bank_webhook_token):
+        raise UnauthorizedError("Invalid bank webhook token")
+
+    notifications = [notification.model_dump(mode="json") for notification in request.notifications]
+    outcomes = await runner.run(lambda service: service.apply_bank_notifications(notifications))
+    return BankNotificationBatchResponse(
+        results=[BankNotificationResultResponse.model_validate(outcome) for outcome in outcomes],
     )
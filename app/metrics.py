@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+from dataclasses import dataclass
+import threading
+import time
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import Engine, event
+
+from app.config import settings
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        with self._lock:
+            return self._values.get(labelvalues, 0.0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for labelvalues, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = (*buckets, float("inf"))
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = ([0] * len(self.buckets), [0.0])
+            bucket_counts, total = series
+            for index, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    bucket_counts[index] += 1
+                    break
+            total[0] += value
+
+    def count(self, *labelvalues: str) -> int:
+        with self._lock:
+            series = self._series.get(labelvalues)
+            return sum(series[0]) if series else 0
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            series = sorted((labels, (list(counts), total[0])) for labels, (counts, total) in self._series.items())
+        for labelvalues, (bucket_counts, total) in series:
+            cumulative = 0
+            for upper_bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                labels = _format_labels((*self.labelnames, "le"), (*labelvalues, _format_value(upper_bound)))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self._metrics: list[Counter | Histogram] = []
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, help_text, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, help_text, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry(enabled=settings.metrics_enabled)
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "billing_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_SQL_QUERIES = registry.histogram(
+    "billing_http_request_sql_queries",
+    "SQL statements executed per HTTP request.",
+    ("route",),
+    COUNT_BUCKETS,
+)
+HTTP_REQUEST_SQL_SECONDS = registry.histogram(
+    "billing_http_request_sql_seconds",
+    "Time spent in SQL per HTTP request.",
+    ("route",),
+)
+HTTP_REQUEST_BANK_SECONDS = registry.histogram(
+    "billing_http_request_bank_seconds",
+    "Time spent waiting for the bank API per HTTP request.",
+    ("route",),
+)
+SQL_QUERIES = registry.counter("billing_sql_queries_total", "SQL statements executed.")
+SQL_QUERY_SECONDS = registry.histogram("billing_sql_query_duration_seconds", "SQL statement latency.")
+BANK_CALL_SECONDS = registry.histogram(
+    "billing_bank_call_duration_seconds",
+    "Bank API call latency by path and outcome.",
+    ("path", "outcome"),
+)
+BANK_CALL_ERRORS = registry.counter(
+    "billing_bank_call_errors_total",
+    "Failed bank API calls by path and outcome.",
+    ("path", "outcome"),
+)
+BANK_PAYMENT_STATUSES = registry.counter(
+    "billing_bank_payment_status_total",
+    "Bank payment statuses returned by acquiring_check.",
+    ("status",),
+)
+
+
+@dataclass
+class RequestStats:
+    sql_queries: int = 0
+    sql_seconds: float = 0.0
+    bank_seconds: float = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def observe_bank_call(path: str, outcome: str, duration_seconds: float) -> None:
+    if not registry.enabled:
+        return
+
+    BANK_CALL_SECONDS.observe(duration_seconds, path, outcome)
+    if outcome != "ok":
+        BANK_CALL_ERRORS.inc(path, outcome)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.bank_seconds += duration_seconds
+
+
+def count_bank_status(status: Any) -> None:
+    if registry.enabled:
+        BANK_PAYMENT_STATUSES.inc(getattr(status, "value", str(status)))
+
+
+def instrument_engine(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("metrics_query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        duration_seconds = time.perf_counter() - conn.info["metrics_query_started"].pop()
+        SQL_QUERIES.inc()
+        SQL_QUERY_SECONDS.observe(duration_seconds)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.sql_queries += 1
+            stats.sql_seconds += duration_seconds
+
+
+class MetricsMiddleware:
+    # Plain ASGI middleware: no extra task per request, unlike BaseHTTPMiddleware.
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+
+        async def send_with_status(message: dict) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _request_stats.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started_at, scope["method"], route, str(status_code))
+            HTTP_REQUEST_SQL_QUERIES.observe(stats.sql_queries, route)
+            HTTP_REQUEST_SQL_SECONDS.observe(stats.sql_seconds, route)
+            HTTP_REQUEST_BANK_SECONDS.observe(stats.bank_seconds, route)
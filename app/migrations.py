@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from sqlalchemy import Engine, inspect
+from sqlalchemy.schema import CreateColumn
+
+from app.database import Base
+
+
+def add_missing_columns(engine: Engine) -> list[str]:
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    added: list[str] = []
+
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl}")
+                added.append(f"{table.name}.{column.name}")
+
+    return added
+
+
+def create_missing_indexes(engine: Engine) -> list[str]:
+    # create_all() skips tables that already exist, so indexes on columns added later are created here.
+    created: list[str] = []
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        for table in Base.metadata.sorted_tables:
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name in existing_indexes:
+                    continue
+                index.create(connection)
+                created.append(index.name)
+    return created
+
+
+def upgrade_schema(engine: Engine) -> list[str]:
+    import app.models  # noqa: F401  (registers tables on Base.metadata)
+
+    added = add_missing_columns(engine)
+    Base.metadata.create_all(bind=engine)
+    create_missing_indexes(engine)
+
+    if "orders.paid_amount" in added or "orders.reserved_amount" in added:
+        from app.balances import verify_order_balances
+        from app.database import SessionLocal
+
+        with SessionLocal(bind=engine) as session:
+            verify_order_balances(session, fix=True)
+
+    return added
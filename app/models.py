@@ -1,32 +1,75 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from decimal import Decimal
 
-from sqlalchemy import CheckConstraint, DateTime, Enum, ForeignKey, Numeric, String, Text
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    CheckConstraint,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from app.database import Base
-from app.enums import BankStatus, OrderPaymentStatus, PaymentStatus, PaymentType
+from app.enums import BankStatus, OrderPaymentStatus, OutboxStatus, PaymentStatus, PaymentType
+from app.money import ZERO_MONEY, Money, MoneyType
+from app.timestamps import UTCDateTime
+
+
+# Enums are stored by name, so the partial index predicate spells the names rather than the values.
+PENDING_ACQUIRING_PREDICATE = text("payment_type = 'ACQUIRING' AND status = 'PENDING'")
+
+
+def _as_money(value: Money | None) -> Money | None:
+    # Amounts assigned as Decimal (seed data, tests, scripts) are converted once, on assignment.
+    return None if value is None else Money.parse(value)
 
 
 class Order(Base):
     __tablename__ = "orders"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    total_amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    total_amount: Mapped[Money] = mapped_column(MoneyType, nullable=False)
+    paid_amount: Mapped[Money] = mapped_column(
+        MoneyType,
+        nullable=False,
+        default=ZERO_MONEY,
+        server_default="0",
+    )
+    reserved_amount: Mapped[Money] = mapped_column(
+        MoneyType,
+        nullable=False,
+        default=ZERO_MONEY,
+        server_default="0",
+    )
     payment_status: Mapped[OrderPaymentStatus] = mapped_column(
         Enum(OrderPaymentStatus, native_enum=False),
         nullable=False,
         default=OrderPaymentStatus.UNPAID,
     )
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
 
-    payments: Mapped[list["Payment"]] = relationship(back_populates="order", cascade="all, delete-orphan")
+    payments: Mapped[list["Payment"]] = relationship(
+        back_populates="order",
+        cascade="all, delete-orphan",
+        order_by="Payment.id",
+    )
 
     __table_args__ = (
         CheckConstraint("total_amount > 0", name="ck_orders_total_amount_positive"),
+        Index("ix_orders_payment_status_id", "payment_status", "id"),
     )
+    __mapper_args__ = {"version_id_col": version}
+
+    @validates("total_amount", "paid_amount", "reserved_amount")
+    def _validate_amount(self, key: str, value: Money) -> Money:
+        return _as_money(value)
 
 
 class Payment(Base):
@@ -35,14 +78,14 @@ class Payment(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     order_id: Mapped[int] = mapped_column(ForeignKey("orders.id", ondelete="CASCADE"), nullable=False, index=True)
     payment_type: Mapped[PaymentType] = mapped_column(Enum(PaymentType, native_enum=False), nullable=False)
-    amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
-    refunded_amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, default=Decimal("0.00"))
+    amount: Mapped[Money] = mapped_column(MoneyType, nullable=False)
+    refunded_amount: Mapped[Money] = mapped_column(MoneyType, nullable=False, default=ZERO_MONEY)
     status: Mapped[PaymentStatus] = mapped_column(Enum(PaymentStatus, native_enum=False), nullable=False)
     external_payment_id: Mapped[str | None] = mapped_column(String(128), nullable=True, unique=True)
-    paid_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    paid_at: Mapped[datetime | None] = mapped_column(UTCDateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
+        UTCDateTime,
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
@@ -54,8 +97,18 @@ class Payment(Base):
         CheckConstraint("amount > 0", name="ck_payments_amount_positive"),
         CheckConstraint("refunded_amount >= 0", name="ck_payments_refunded_non_negative"),
         CheckConstraint("refunded_amount <= amount", name="ck_payments_refunded_not_gt_amount"),
+        Index(
+            "ix_payments_pending_acquiring",
+            "id",
+            sqlite_where=PENDING_ACQUIRING_PREDICATE,
+            postgresql_where=PENDING_ACQUIRING_PREDICATE,
+        ),
     )
 
+    @validates("amount", "refunded_amount")
+    def _validate_amount(self, key: str, value: Money) -> Money:
+        return _as_money(value)
+
 
 class BankPaymentState(Base):
     __tablename__ = "bank_payment_states"
@@ -63,14 +116,78 @@ class BankPaymentState(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     payment_id: Mapped[int] = mapped_column(ForeignKey("payments.id", ondelete="CASCADE"), nullable=False, unique=True)
     bank_payment_id: Mapped[str] = mapped_column(String(128), nullable=False, unique=True, index=True)
-    bank_amount: Mapped[Decimal | None] = mapped_column(Numeric(12, 2), nullable=True)
+    bank_amount: Mapped[Money | None] = mapped_column(MoneyType, nullable=True)
     bank_status: Mapped[BankStatus] = mapped_column(
         Enum(BankStatus, native_enum=False),
         nullable=False,
         default=BankStatus.CREATED,
     )
-    bank_paid_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
-    last_checked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    bank_paid_at: Mapped[datetime | None] = mapped_column(UTCDateTime, nullable=True)
+    last_checked_at: Mapped[datetime | None] = mapped_column(UTCDateTime, nullable=True, index=True)
     last_error: Mapped[str | None] = mapped_column(Text(), nullable=True)
+    next_check_at: Mapped[datetime | None] = mapped_column(UTCDateTime, nullable=True, index=True)
+    lease_owner: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(UTCDateTime, nullable=True)
 
     payment: Mapped[Payment] = relationship(back_populates="bank_state")
+
+    @validates("bank_amount")
+    def _validate_amount(self, key: str, value: Money | None) -> Money | None:
+        return _as_money(value)
+
+
+class AcquiringOutboxEntry(Base):
+    __tablename__ = "acquiring_outbox"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    payment_id: Mapped[int] = mapped_column(ForeignKey("payments.id", ondelete="CASCADE"), nullable=False, unique=True)
+    status: Mapped[OutboxStatus] = mapped_column(
+        Enum(OutboxStatus, native_enum=False),
+        nullable=False,
+        default=OutboxStatus.PENDING,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    last_error: Mapped[str | None] = mapped_column(Text(), nullable=True)
+    available_at: Mapped[datetime] = mapped_column(
+        UTCDateTime,
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+    lease_owner: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(UTCDateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
+    dispatched_at: Mapped[datetime | None] = mapped_column(UTCDateTime, nullable=True)
+
+    payment: Mapped[Payment] = relationship()
+
+    __table_args__ = (
+        Index("ix_acquiring_outbox_status_available_at", "status", "available_at"),
+    )
+
+
+class BankNotification(Base):
+    __tablename__ = "bank_notifications"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    dedup_key: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    bank_payment_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    payment_id: Mapped[int] = mapped_column(ForeignKey("payments.id", ondelete="CASCADE"), nullable=False)
+    received_at: Mapped[datetime] = mapped_column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    scope: Mapped[str] = mapped_column(String(64), nullable=False)
+    key: Mapped[str] = mapped_column(String(255), nullable=False)
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response_body: Mapped[str | None] = mapped_column(Text(), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
+    expires_at: Mapped[datetime] = mapped_column(UTCDateTime, nullable=False, index=True)
+    locked_until: Mapped[datetime | None] = mapped_column(UTCDateTime, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("scope", "key", name="uq_idempotency_keys_scope_key"),
+    )
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Any
+
+from sqlalchemy import Numeric
+from sqlalchemy.types import TypeDecorator
+
+
+@dataclass(frozen=True, order=True, slots=True)
+class Money:
+    # An amount in minor units (kopecks). All balance arithmetic inside the service is plain integer math;
+    # Decimal only appears where values enter or leave: request bodies, bank payloads, the database and
+    # responses. Rounding to minor units happens in parse() and nowhere else.
+    cents: int
+
+    @classmethod
+    def parse(cls, value: Money | Decimal | str | int | float) -> Money:
+        if isinstance(value, Money):
+            return value
+        try:
+            amount = value if isinstance(value, Decimal) else Decimal(str(value))
+            return cls(int(amount.scaleb(2).to_integral_value(rounding=ROUND_HALF_UP)))
+        except (InvalidOperation, ValueError, TypeError, OverflowError) as exc:
+            raise ValueError(f"Invalid money amount: {value!r}") from exc
+
+    @classmethod
+    def parse_exact(cls, value: Money | Decimal | str | int | float) -> Money:
+        # For amounts someone else reports (the bank): a remainder below one kopeck is an error, not something to
+        # round away before comparing.
+        money = cls.parse(value)
+        if not isinstance(value, Money) and money.to_decimal() != Decimal(str(value)):
+            raise ValueError(f"Amount has more than 2 decimal places: {value!r}")
+        return money
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(self.cents).scaleb(-2)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Money):
+            return self.cents == other.cents
+        if isinstance(other, (Decimal, int, float)):
+            # A bare number has no unit: Money(1000) == Decimal("10.00") would silently be False.
+            raise TypeError(f"Cannot compare Money with {type(other).__name__}; use Money.parse() first")
+        return NotImplemented
+
+    def __add__(self, other: Money) -> Money:
+        return Money(self.cents + other.cents)
+
+    def __sub__(self, other: Money) -> Money:
+        return Money(self.cents - other.cents)
+
+    def __neg__(self) -> Money:
+        return Money(-self.cents)
+
+    def __bool__(self) -> bool:
+        return self.cents != 0
+
+    def __str__(self) -> str:
+        return str(self.to_decimal())
+
+
+ZERO_MONEY = Money(0)
+
+
+class MoneyType(TypeDecorator):
+    # NUMERIC(12, 2) in the database, Money in Python. Plain Decimal values are still accepted on the way in
+    # so that Core inserts (seed data, bulk loads) do not have to convert first.
+    impl = Numeric(12, 2)
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Decimal | None:
+        if isinstance(value, Money):
+            return value.to_decimal()
+        return value
+
+    def process_result_value(self, value: Any, dialect: Any) -> Money | None:
+        if value is None:
+            return None
+        return Money.parse(value)
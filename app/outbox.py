@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import logging
+import signal
+import threading
+import time
+from typing import Any, Callable
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from app.enums import OutboxStatus
+from app.models import AcquiringOutboxEntry
+from app.reconciler import default_worker_id
+from app.services import OutboxDispatchResult, PaymentService
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class OutboxRetrySchedule:
+    base_delay_seconds: float = 1.0
+    max_delay_seconds: float = 60.0
+
+    def delay_for(self, attempts: int) -> timedelta:
+        exponent = max(attempts - 1, 0)
+        return timedelta(seconds=min(self.base_delay_seconds * (2**exponent), self.max_delay_seconds))
+
+
+def claim_outbox_entries(
+    session: Session,
+    worker_id: str,
+    batch_size: int,
+    lease_seconds: float,
+    now: datetime | None = None,
+) -> list[int]:
+    now = now or datetime.now(timezone.utc)
+    lease_is_free = or_(AcquiringOutboxEntry.lease_expires_at.is_(None), AcquiringOutboxEntry.lease_expires_at < now)
+
+    # Same claim protocol as the reconciler: SKIP LOCKED where supported, the conditional lease UPDATE everywhere.
+    candidate_ids = list(
+        session.scalars(
+            select(AcquiringOutboxEntry.id)
+            .where(
+                AcquiringOutboxEntry.status == OutboxStatus.PENDING,
+                AcquiringOutboxEntry.available_at <= now,
+                lease_is_free,
+            )
+            .order_by(AcquiringOutboxEntry.available_at, AcquiringOutboxEntry.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+    )
+    if not candidate_ids:
+        session.rollback()
+        return []
+
+    session.execute(
+        update(AcquiringOutboxEntry)
+        .where(AcquiringOutboxEntry.id.in_(candidate_ids), lease_is_free)
+        .values(lease_owner=worker_id, lease_expires_at=now + timedelta(seconds=lease_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    claimed_ids = list(
+        session.scalars(
+            select(AcquiringOutboxEntry.id).where(
+                AcquiringOutboxEntry.id.in_(candidate_ids),
+                AcquiringOutboxEntry.lease_owner == worker_id,
+            )
+        )
+    )
+    session.commit()
+    return sorted(claimed_ids)
+
+
+def renew_outbox_claims(
+    session: Session,
+    entry_ids: list[int],
+    worker_id: str,
+    lease_seconds: float,
+    now: datetime | None = None,
+) -> list[int]:
+    now = now or datetime.now(timezone.utc)
+    # Only entries this worker still owns are extended; one that another dispatcher re-claimed after our lease
+    # ran out is dropped here instead of being sent to the bank a second time.
+    session.execute(
+        update(AcquiringOutboxEntry)
+        .where(AcquiringOutboxEntry.id.in_(entry_ids), AcquiringOutboxEntry.lease_owner == worker_id)
+        .values(lease_expires_at=now + timedelta(seconds=lease_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    renewed_ids = list(
+        session.scalars(
+            select(AcquiringOutboxEntry.id).where(
+                AcquiringOutboxEntry.id.in_(entry_ids),
+                AcquiringOutboxEntry.lease_owner == worker_id,
+            )
+        )
+    )
+    session.commit()
+    return sorted(renewed_ids)
+
+
+def release_outbox_claims(
+    session: Session,
+    entry_ids: list[int],
+    worker_id: str,
+    schedule: OutboxRetrySchedule,
+    now: datetime | None = None,
+) -> None:
+    now = now or datetime.now(timezone.utc)
+    entries = session.scalars(
+        select(AcquiringOutboxEntry)
+        .where(AcquiringOutboxEntry.id.in_(entry_ids), AcquiringOutboxEntry.lease_owner == worker_id)
+        .execution_options(populate_existing=True)
+    )
+    for entry in entries:
+        entry.lease_owner = None
+        entry.lease_expires_at = None
+        if entry.status == OutboxStatus.PENDING and entry.attempts:
+            entry.available_at = now + schedule.delay_for(entry.attempts)
+    session.commit()
+
+
+class OutboxDispatcher:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        bank_client: Any,
+        worker_id: str | None = None,
+        batch_size: int = 100,
+        concurrency: int = 8,
+        lease_seconds: float = 60.0,
+        idle_seconds: float = 0.5,
+        max_attempts: int = 5,
+        schedule: OutboxRetrySchedule | None = None,
+        **service_options: Any,
+    ):
+        self.session_factory = session_factory
+        self.bank_client = bank_client
+        self.worker_id = worker_id or default_worker_id()
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.idle_seconds = idle_seconds
+        self.max_attempts = max_attempts
+        self.schedule = schedule or OutboxRetrySchedule()
+        self._service_options = service_options
+
+    def run_once(self) -> OutboxDispatchResult | None:
+        with self.session_factory() as session:
+            entry_ids = claim_outbox_entries(session, self.worker_id, self.batch_size, self.lease_seconds)
+            if not entry_ids:
+                return None
+
+            service = PaymentService(session, self.bank_client, **self._service_options)
+            result = OutboxDispatchResult()
+            started_at = time.perf_counter()
+            wave_size = max(self.concurrency, 1)
+            try:
+                # The batch goes to the bank one wave of `concurrency` entries at a time and the lease is renewed
+                # before every wave, so it only has to outlast a single round of bank calls, not the whole batch.
+                for start in range(0, len(entry_ids), wave_size):
+                    wave_ids = renew_outbox_claims(
+                        session,
+                        entry_ids[start : start + wave_size],
+                        self.worker_id,
+                        self.lease_seconds,
+                    )
+                    if not wave_ids:
+                        continue
+                    wave = service.dispatch_acquiring_outbox(
+                        wave_ids,
+                        concurrency=self.concurrency,
+                        max_attempts=self.max_attempts,
+                    )
+                    result.dispatched += wave.dispatched
+                    result.retried += wave.retried
+                    result.failed += wave.failed
+                result.duration_seconds = time.perf_counter() - started_at
+                return result
+            finally:
+                session.rollback()
+                release_outbox_claims(session, entry_ids, self.worker_id, self.schedule)
+
+    def run(self, stop: threading.Event) -> None:
+        logger.info("outbox dispatcher %s started", self.worker_id)
+        while not stop.is_set():
+            try:
+                result = self.run_once()
+            except Exception:
+                logger.exception("outbox batch failed")
+                result = None
+
+            if result is None:
+                stop.wait(self.idle_seconds)
+                continue
+
+            logger.info(
+                "dispatched %s acquiring payments in %.2fs (%s to retry, %s failed)",
+                result.dispatched,
+                result.duration_seconds,
+                result.retried,
+                result.failed,
+            )
+        logger.info("outbox dispatcher %s stopped", self.worker_id)
+
+
+def main(argv: list[str] | None = None) -> int:
+    from app.bank.pool import SharedBankClient
+    from app.config import settings
+    from app.database import SessionLocal, engine
+    from app.migrations import upgrade_schema
+
+    parser = argparse.ArgumentParser(description="Open bank acquiring payments queued in the acquiring outbox")
+    parser.add_argument("--once", action="store_true", help="process a single batch and exit")
+    parser.add_argument("--worker-id", default=None)
+    parser.add_argument("--batch-size", type=int, default=settings.outbox_batch_size)
+    parser.add_argument("--concurrency", type=int, default=settings.outbox_concurrency)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    upgrade_schema(engine)
+
+    bank_client = SharedBankClient.from_settings(settings)
+    dispatcher = OutboxDispatcher(
+        SessionLocal,
+        bank_client,
+        worker_id=args.worker_id,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        lease_seconds=settings.outbox_lease_seconds,
+        idle_seconds=settings.outbox_idle_seconds,
+        max_attempts=settings.outbox_max_attempts,
+        schedule=OutboxRetrySchedule(
+            base_delay_seconds=settings.outbox_retry_base_delay_seconds,
+            max_delay_seconds=settings.outbox_retry_max_delay_seconds,
+        ),
+        concurrent_update_retries=settings.order_update_retries,
+        busy_retry_base_delay_seconds=settings.db_busy_retry_base_delay_seconds,
+    )
+
+    try:
+        if args.once:
+            result = dispatcher.run_once()
+            print(f"dispatched {result.dispatched if result else 0} acquiring payments")
+            return 0
+
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stop.set())
+        dispatcher.run(stop)
+        return 0
+    finally:
+        bank_client.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from app.models import Order, Payment
+
+
+# Column projections for read paths that skip the ORM: rows come back as plain tuples and are turned into
+# JSON-ready dicts in the same shape the response models produce.
+ORDER_COLUMNS = (
+    Order.id,
+    Order.total_amount,
+    Order.paid_amount,
+    Order.reserved_amount,
+    Order.payment_status,
+    Order.created_at,
+)
+PAYMENT_COLUMNS = (
+    Payment.id.label("payment_id"),
+    Payment.order_id.label("payment_order_id"),
+    Payment.payment_type,
+    Payment.amount,
+    Payment.refunded_amount,
+    Payment.status,
+    Payment.external_payment_id,
+    Payment.paid_at,
+    Payment.created_at.label("payment_created_at"),
+    Payment.updated_at.label("payment_updated_at"),
+)
+
+
+def order_record(row: Any) -> dict[str, Any]:
+    return {
+        "id": row.id,
+        "total_amount": str(row.total_amount),
+        "paid_amount": str(row.paid_amount),
+        "reserved_amount": str(row.reserved_amount),
+        "payment_status": row.payment_status.value,
+        "created_at": isoformat(row.created_at),
+    }
+
+
+def payment_record(row: Any) -> dict[str, Any]:
+    return {
+        "id": row.payment_id,
+        "order_id": row.payment_order_id,
+        "payment_type": row.payment_type.value,
+        "amount": str(row.amount),
+        "refunded_amount": str(row.refunded_amount),
+        "status": row.status.value,
+        "external_payment_id": row.external_payment_id,
+        "paid_at": isoformat(row.paid_at),
+        "created_at": isoformat(row.payment_created_at),
+        "updated_at": isoformat(row.payment_updated_at),
+    }
+
+
+def isoformat(value: datetime | None) -> str | None:
+    # The exact text pydantic writes for the response models: a zero offset becomes "Z", other offsets and
+    # naive values are left as they are.
+    if value is None:
+        return None
+    text = value.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
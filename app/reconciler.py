@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import logging
+import os
+import signal
+import socket
+import threading
+from typing import Any, Callable
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from app.enums import PaymentStatus
+from app.models import BankPaymentState, Payment
+from app.services import PENDING_ACQUIRING_PAYMENTS, PaymentService, ReconcileResult
+from app.timestamps import as_utc
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RecheckSchedule:
+    base_interval_seconds: float = 5.0
+    max_interval_seconds: float = 900.0
+
+    def delay_for(self, payment_age: timedelta) -> timedelta:
+        # Young payments are re-checked every base interval; the interval doubles each time the payment's
+        # age doubles, so long-stuck payments stop eating bank quota.
+        age_seconds = payment_age.total_seconds()
+        interval = self.base_interval_seconds
+        while interval * 2 <= age_seconds and interval < self.max_interval_seconds:
+            interval *= 2
+        return timedelta(seconds=min(interval, self.max_interval_seconds))
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"[:64]
+
+
+def claim_due_payments(
+    session: Session,
+    worker_id: str,
+    batch_size: int,
+    lease_seconds: float,
+    now: datetime | None = None,
+) -> list[int]:
+    now = now or datetime.now(timezone.utc)
+    lease_is_free = or_(BankPaymentState.lease_expires_at.is_(None), BankPaymentState.lease_expires_at < now)
+
+    # SKIP LOCKED keeps concurrent workers from queueing on the same rows where the database supports it;
+    # the conditional lease UPDATE is what makes claimed batches disjoint on every backend.
+    candidate_ids = list(
+        session.scalars(
+            select(BankPaymentState.id)
+            .join(Payment, Payment.id == BankPaymentState.payment_id)
+            .where(
+                PENDING_ACQUIRING_PAYMENTS,
+                or_(BankPaymentState.next_check_at.is_(None), BankPaymentState.next_check_at <= now),
+                lease_is_free,
+            )
+            .order_by(BankPaymentState.last_checked_at.asc().nulls_first(), BankPaymentState.id)
+            .limit(batch_size)
+            .with_for_update(of=BankPaymentState, skip_locked=True)
+        )
+    )
+    if not candidate_ids:
+        session.rollback()
+        return []
+
+    session.execute(
+        update(BankPaymentState)
+        .where(BankPaymentState.id.in_(candidate_ids), lease_is_free)
+        .values(lease_owner=worker_id, lease_expires_at=now + timedelta(seconds=lease_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    claimed_payment_ids = list(
+        session.scalars(
+            select(BankPaymentState.payment_id).where(
+                BankPaymentState.id.in_(candidate_ids),
+                BankPaymentState.lease_owner == worker_id,
+            )
+        )
+    )
+    session.commit()
+    return sorted(claimed_payment_ids)
+
+
+def release_claims(
+    session: Session,
+    payment_ids: list[int],
+    worker_id: str,
+    schedule: RecheckSchedule,
+    now: datetime | None = None,
+) -> None:
+    now = now or datetime.now(timezone.utc)
+    rows = session.execute(
+        select(BankPaymentState, Payment.status, Payment.created_at)
+        .join(Payment, Payment.id == BankPaymentState.payment_id)
+        .where(BankPaymentState.payment_id.in_(payment_ids), BankPaymentState.lease_owner == worker_id)
+        .execution_options(populate_existing=True)
+    ).all()
+
+    for bank_state, payment_status, payment_created_at in rows:
+        bank_state.lease_owner = None
+        bank_state.lease_expires_at = None
+        if payment_status == PaymentStatus.PENDING:
+            bank_state.next_check_at = now + schedule.delay_for(now - as_utc(payment_created_at))
+        else:
+            bank_state.next_check_at = None
+    session.commit()
+
+
+class ReconcileWorker:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        bank_client: Any,
+        worker_id: str | None = None,
+        batch_size: int = 100,
+        concurrency: int = 8,
+        lease_seconds: float = 120.0,
+        idle_seconds: float = 1.0,
+        schedule: RecheckSchedule | None = None,
+        **service_options: Any,
+    ):
+        self.session_factory = session_factory
+        self.bank_client = bank_client
+        self.worker_id = worker_id or default_worker_id()
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.idle_seconds = idle_seconds
+        self.schedule = schedule or RecheckSchedule()
+        self._service_options = service_options
+
+    def run_once(self) -> ReconcileResult | None:
+        with self.session_factory() as session:
+            payment_ids = claim_due_payments(session, self.worker_id, self.batch_size, self.lease_seconds)
+            if not payment_ids:
+                return None
+
+            service = PaymentService(session, self.bank_client, **self._service_options)
+            try:
+                return service.reconcile_payments(payment_ids, concurrency=self.concurrency)
+            finally:
+                session.rollback()
+                release_claims(session, payment_ids, self.worker_id, self.schedule)
+
+    def run(self, stop: threading.Event) -> None:
+        logger.info("reconcile worker %s started", self.worker_id)
+        while not stop.is_set():
+            try:
+                result = self.run_once()
+            except Exception:
+                logger.exception("reconcile batch failed")
+                result = None
+
+            if result is None:
+                stop.wait(self.idle_seconds)
+                continue
+
+            logger.info(
+                "reconciled %s payments in %.2fs: %s",
+                result.processed_payments,
+                result.duration_seconds,
+                result.status_counts,
+            )
+        logger.info("reconcile worker %s stopped", self.worker_id)
+
+
+def main(argv: list[str] | None = None) -> int:
+    from app.bank.pool import SharedBankClient
+    from app.config import settings
+    from app.database import SessionLocal, engine
+    from app.migrations import upgrade_schema
+
+    parser = argparse.ArgumentParser(description="Continuously reconcile pending acquiring payments with the bank")
+    parser.add_argument("--once", action="store_true", help="process a single batch and exit")
+    parser.add_argument("--worker-id", default=None)
+    parser.add_argument("--batch-size", type=int, default=settings.reconcile_chunk_size)
+    parser.add_argument("--concurrency", type=int, default=settings.reconcile_concurrency)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    upgrade_schema(engine)
+
+    bank_client = SharedBankClient.from_settings(settings)
+    worker = ReconcileWorker(
+        SessionLocal,
+        bank_client,
+        worker_id=args.worker_id,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        lease_seconds=settings.reconciler_lease_seconds,
+        idle_seconds=settings.reconciler_idle_seconds,
+        schedule=RecheckSchedule(
+            base_interval_seconds=settings.reconciler_base_interval_seconds,
+            max_interval_seconds=settings.reconciler_max_interval_seconds,
+        ),
+        concurrent_update_retries=settings.order_update_retries,
+        busy_retry_base_delay_seconds=settings.db_busy_retry_base_delay_seconds,
+    )
+
+    try:
+        if args.once:
+            result = worker.run_once()
+            print(f"reconciled {result.processed_payments if result else 0} payments")
+            return 0
+
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stop.set())
+        worker.run(stop)
+        return 0
+    finally:
+        bank_client.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,10 +2,20 @@ from __future__ import annotations
 
 from datetime import datetime
 from decimal import Decimal
+from typing import Annotated, Any
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field
 
-from app.enums import OrderPaymentStatus, PaymentStatus, PaymentType
+from app.enums import NotificationResult, OrderPaymentStatus, PaymentStatus, PaymentType
+from app.money import Money
+
+
+def _money_to_decimal(value: Any) -> Any:
+    return value.to_decimal() if isinstance(value, Money) else value
+
+
+# Responses are built from ORM objects whose amounts are Money; they leave the service as decimals.
+MoneyAmount = Annotated[Decimal, BeforeValidator(_money_to_decimal)]
 
 
 class PaymentCreateRequest(BaseModel):
@@ -17,12 +27,28 @@ class RefundRequest(BaseModel):
     amount: Decimal | None = Field(default=None, gt=0, max_digits=12, decimal_places=2)
 
 
+class PaymentBatchItemRequest(PaymentCreateRequest):
+    order_id: int
+
+
+class PaymentBatchRequest(BaseModel):
+    items: list[PaymentBatchItemRequest] = Field(min_length=1, max_length=1000)
+
+
+class RefundBatchItemRequest(RefundRequest):
+    payment_id: int
+
+
+class RefundBatchRequest(BaseModel):
+    items: list[RefundBatchItemRequest] = Field(min_length=1, max_length=1000)
+
+
 class PaymentResponse(BaseModel):
     id: int
     order_id: int
     payment_type: PaymentType
-    amount: Decimal
-    refunded_amount: Decimal
+    amount: MoneyAmount
+    refunded_amount: MoneyAmount
     status: PaymentStatus
     external_payment_id: str | None
     paid_at: datetime | None
@@ -34,7 +60,9 @@ class PaymentResponse(BaseModel):
 
 class OrderResponse(BaseModel):
     id: int
-    total_amount: Decimal
+    total_amount: MoneyAmount
+    paid_amount: MoneyAmount
+    reserved_amount: MoneyAmount
     payment_status: OrderPaymentStatus
     created_at: datetime
 
@@ -45,6 +73,15 @@ class OrderWithPaymentsResponse(OrderResponse):
     payments: list[PaymentResponse]
 
 
+class OrderListItemResponse(OrderResponse):
+    payments: list[PaymentResponse] | None = None
+
+
+class OrderPageResponse(BaseModel):
+    items: list[OrderListItemResponse]
+    next_cursor: int | None
+
+
 class PaymentOperationResponse(BaseModel):
     order: OrderResponse
     payment: PaymentResponse
@@ -55,6 +92,131 @@ class SyncResponse(BaseModel):
     order: OrderResponse
 
 
+class BatchItemErrorResponse(BaseModel):
+    error: str
+    detail: str
+
+
+class BatchItemResultResponse(BaseModel):
+    index: int
+    payment: PaymentResponse | None
+    error: BatchItemErrorResponse | None
+
+
+class BatchOperationResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[BatchItemResultResponse]
+
+
+class ImportRejectionResponse(BaseModel):
+    line: int
+    detail: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ImportResponse(BaseModel):
+    imported: int
+    rejected: int
+    errors: list[ImportRejectionResponse]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class ReconcileResponse(BaseModel):
     processed_payments: int
     affected_orders: int
+    failed_checks: int
+    conflicts: int
+    status_counts: dict[str, int]
+    duration_seconds: float
+    payments_per_second: float
+    next_cursor: int | None
+
+
+class BankNotificationRequest(BaseModel):
+    notification_id: str | None = Field(default=None, max_length=128)
+    bank_payment_id: str = Field(min_length=1, max_length=128)
+    status: str
+    amount: Decimal
+    paid_at: datetime | None = None
+
+
+class BankNotificationBatchRequest(BaseModel):
+    notifications: list[BankNotificationRequest] = Field(min_length=1, max_length=1000)
+
+
+class BankNotificationResultResponse(BaseModel):
+    bank_payment_id: str
+    result: NotificationResult
+    payment_id: int | None
+    detail: str | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BankNotificationBatchResponse(BaseModel):
+    results: list[BankNotificationResultResponse]
+
+
+class HealthResponse(BaseModel):
+    status: str
+
+
+class ReadinessResponse(BaseModel):
+    status: str
+    database: bool
+    bank: bool | None
+
+
+class BankPoolStatsResponse(BaseModel):
+    max_connections: int
+    max_keepalive_connections: int
+    keepalive_expiry_seconds: float
+    http2: bool
+    open_connections: int
+    idle_connections: int
+    requests_total: int
+    requests_in_flight: int
+    peak_requests_in_flight: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BankCheckStatsResponse(BaseModel):
+    bank_checks: int
+    coalesced_checks: int
+    cache_hits: int
+    cached_snapshots: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BankBreakerStatsResponse(BaseModel):
+    state: str
+    consecutive_failures: int
+    opened_total: int
+    rejected_calls: int
+    retry_in_seconds: float
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BankRateLimitStatsResponse(BaseModel):
+    rate_per_second: float
+    capacity: float
+    tokens_available: float
+    interactive_granted: int
+    background_granted: int
+    rejected: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BankClientStatsResponse(BaseModel):
+    started: bool
+    pool: BankPoolStatsResponse | None
+    breaker: BankBreakerStatsResponse | None
+    rate_limit: BankRateLimitStatsResponse | None
+    checks: BankCheckStatsResponse
@@ -1,20 +1,57 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime, timezone
-from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager
+import contextvars
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+import functools
+import hashlib
+import random
+import time
+from typing import Any, Callable, Iterator, TypeVar
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import Select, and_, bindparam, select
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.orm import Session, contains_eager, selectinload
+from sqlalchemy.orm.exc import StaleDataError
 
-from app.bank.client import BankAPIClient
-from app.enums import BankStatus, OrderPaymentStatus, PaymentStatus, PaymentType
-from app.exceptions import ConflictError, NotFoundError, ValidationError
-from app.models import BankPaymentState, Order, Payment
+from app.bank.client import BankAPIClient, BankPaymentSnapshot
+from app.bank.rate_limit import BankLane, bank_lane
+from app.enums import BankStatus, NotificationResult, OrderPaymentStatus, OutboxStatus, PaymentStatus, PaymentType
+from app.exceptions import (
+    AppError,
+    ConflictError,
+    DatabaseBusyError,
+    ExternalServiceError,
+    NotFoundError,
+    ValidationError,
+)
+from app.models import AcquiringOutboxEntry, BankNotification, BankPaymentState, Order, Payment
+from app.money import ZERO_MONEY, Money
+from app.projections import ORDER_COLUMNS, PAYMENT_COLUMNS, order_record, payment_record
+from app.storage import is_transient_lock_error
+from app.timestamps import as_utc
 
 
-MONEY_STEP = Decimal("0.01")
-ZERO_MONEY = Decimal("0.00")
+SETTLED_PAYMENT_STATUSES = frozenset(
+    {
+        PaymentStatus.SUCCEEDED,
+        PaymentStatus.PARTIALLY_REFUNDED,
+        PaymentStatus.REFUNDED,
+    }
+)
+NO_BALANCE_CONTRIBUTION = (ZERO_MONEY, ZERO_MONEY)
+
+# Rendered as literals so the planner can match the partial index ix_payments_pending_acquiring.
+PENDING_ACQUIRING_PAYMENTS = and_(
+    Payment.payment_type == bindparam(None, PaymentType.ACQUIRING, type_=Payment.payment_type.type, literal_execute=True),
+    Payment.status == bindparam(None, PaymentStatus.PENDING, type_=Payment.status.type, literal_execute=True),
+)
+
+T = TypeVar("T")
+BankChecks = Callable[[list[Payment]], list[BankPaymentSnapshot | Exception]]
 
 
 @dataclass(frozen=True)
@@ -23,19 +60,222 @@ class OrderPaymentResult:
     payment: Payment
 
 
+@dataclass(frozen=True)
+class OrderPage:
+    orders: list[Order]
+    next_cursor: int | None
+
+
+@dataclass(frozen=True)
+class OrderRecordPage:
+    items: list[dict[str, Any]]
+    next_cursor: int | None
+
+
+@dataclass
+class ReconcileResult:
+    processed_payments: int = 0
+    affected_orders: int = 0
+    failed_checks: int = 0
+    conflicts: int = 0
+    status_counts: dict[str, int] = field(default_factory=dict)
+    duration_seconds: float = 0.0
+    next_cursor: int | None = None
+
+    @property
+    def payments_per_second(self) -> float:
+        if self.duration_seconds <= 0:
+            return 0.0
+        return self.processed_payments / self.duration_seconds
+
+    def record(self, status: str) -> None:
+        self.processed_payments += 1
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def merge(self, other: "ReconcileResult") -> None:
+        self.processed_payments += other.processed_payments
+        self.failed_checks += other.failed_checks
+        self.conflicts += other.conflicts
+        for status, count in other.status_counts.items():
+            self.status_counts[status] = self.status_counts.get(status, 0) + count
+
+
+@dataclass(frozen=True)
+class DepositItem:
+    order_id: int
+    amount: Decimal
+    payment_type: PaymentType
+
+
+@dataclass(frozen=True)
+class RefundItem:
+    payment_id: int
+    amount: Decimal | None = None
+
+
+@dataclass(frozen=True)
+class BatchItemOutcome:
+    index: int
+    payment: Payment | None = None
+    error: AppError | None = None
+
+
+@dataclass
+class OutboxDispatchResult:
+    dispatched: int = 0
+    retried: int = 0
+    failed: int = 0
+    duration_seconds: float = 0.0
+
+
+@dataclass(frozen=True)
+class _ReconciledChunk:
+    result: ReconcileResult
+    order_ids: set[int]
+    last_payment_id: int
+    size: int
+
+
+@dataclass(frozen=True)
+class BankNotificationOutcome:
+    bank_payment_id: str
+    result: NotificationResult
+    payment_id: int | None = None
+    detail: str | None = None
+
+
+def balance_contribution(payment: Payment) -> tuple[Money, Money]:
+    if payment.status == PaymentStatus.FAILED:
+        return NO_BALANCE_CONTRIBUTION
+    if payment.status == PaymentStatus.PENDING:
+        return payment.amount, ZERO_MONEY
+    net_amount = payment.amount - payment.refunded_amount
+    return net_amount, net_amount
+
+
+def resolve_order_payment_status(total_amount: Money, paid_amount: Money) -> OrderPaymentStatus:
+    if paid_amount <= ZERO_MONEY:
+        return OrderPaymentStatus.UNPAID
+    if paid_amount >= total_amount:
+        return OrderPaymentStatus.PAID
+    return OrderPaymentStatus.PARTIALLY_PAID
+
+
+def _shift_order_balance(
+    order: Order,
+    before: tuple[Money, Money],
+    after: tuple[Money, Money],
+) -> None:
+    reserved_delta = after[0] - before[0]
+    paid_delta = after[1] - before[1]
+    if reserved_delta:
+        order.reserved_amount = order.reserved_amount + reserved_delta
+    if paid_delta:
+        order.paid_amount = order.paid_amount + paid_delta
+
+
+def filter_orders(
+    query: Select,
+    cursor: int | None,
+    payment_status: OrderPaymentStatus | None,
+    created_from: datetime | None,
+    created_to: datetime | None,
+) -> Select:
+    if cursor is not None:
+        query = query.where(Order.id > cursor)
+    if payment_status is not None:
+        query = query.where(Order.payment_status == payment_status)
+    if created_from is not None:
+        query = query.where(Order.created_at >= as_utc(created_from))
+    if created_to is not None:
+        query = query.where(Order.created_at < as_utc(created_to))
+    return query
+
+
 class PaymentService:
-    def __init__(self, session: Session, bank_client: BankAPIClient):
+    def __init__(
+        self,
+        session: Session,
+        bank_client: BankAPIClient,
+        acquiring_freshness_seconds: float = 0.0,
+        bank_check_concurrency: int = 1,
+        concurrent_update_retries: int = 3,
+        busy_retry_base_delay_seconds: float = 0.0,
+        acquiring_outbox: bool = False,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
         self.session = session
         self.bank_client = bank_client
+        self.acquiring_freshness = timedelta(seconds=acquiring_freshness_seconds)
+        self.bank_check_concurrency = bank_check_concurrency
+        self.concurrent_update_retries = concurrent_update_retries
+        self.busy_retry_base_delay_seconds = busy_retry_base_delay_seconds
+        self.acquiring_outbox = acquiring_outbox
+        self.sleep = sleep
+        self._before_final_commit: Callable[[Any], None] | None = None
 
-    def list_orders(self) -> list[Order]:
-        return list(
-            self.session.scalars(
-                select(Order)
-                .options(selectinload(Order.payments).selectinload(Payment.bank_state))
-                .order_by(Order.id)
-            )
+    @contextmanager
+    def completing(self, before_final_commit: Callable[[Any], None]) -> Iterator[None]:
+        # The callback gets the operation's result right before the commit that makes it durable, so anything it
+        # writes (the idempotency key's stored response) is committed in the same transaction.
+        self._before_final_commit = before_final_commit
+        try:
+            yield
+        finally:
+            self._before_final_commit = None
+
+    def _commit_result(self, result: T) -> T:
+        if self._before_final_commit is not None:
+            self._before_final_commit(result)
+        self.session.commit()
+        return result
+
+    def list_orders(
+        self,
+        limit: int = 100,
+        cursor: int | None = None,
+        payment_status: OrderPaymentStatus | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        include_payments: bool = True,
+    ) -> OrderPage:
+        query = filter_orders(
+            select(Order).order_by(Order.id).limit(limit + 1), cursor, payment_status, created_from, created_to
+        )
+        if include_payments:
+            query = query.options(selectinload(Order.payments))
+
+        orders = list(self.session.scalars(query))
+        if len(orders) <= limit:
+            return OrderPage(orders=orders, next_cursor=None)
+
+        orders = orders[:limit]
+        return OrderPage(orders=orders, next_cursor=orders[-1].id)
+
+    def list_order_records(
+        self,
+        limit: int = 100,
+        cursor: int | None = None,
+        payment_status: OrderPaymentStatus | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        include_payments: bool = True,
+    ) -> OrderRecordPage:
+        # Same page as list_orders, read as column tuples: no identity map, no ORM objects, no pydantic.
+        query = filter_orders(
+            select(*ORDER_COLUMNS).order_by(Order.id).limit(limit + 1), cursor, payment_status, created_from, created_to
         )
+        items = [order_record(row) for row in self.session.execute(query)]
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = items[-1]["id"]
+        if include_payments:
+            self._attach_payment_records(items)
+        else:
+            for item in items:
+                item["payments"] = None
+        return OrderRecordPage(items=items, next_cursor=next_cursor)
 
     def get_order(self, order_id: int) -> Order:
         order = self.session.scalar(
@@ -47,23 +287,94 @@ class PaymentService:
             raise NotFoundError(f"Order {order_id} not found")
         return order
 
+    def get_order_record(self, order_id: int) -> dict[str, Any]:
+        row = self.session.execute(select(*ORDER_COLUMNS).where(Order.id == order_id)).first()
+        if row is None:
+            raise NotFoundError(f"Order {order_id} not found")
+        item = order_record(row)
+        self._attach_payment_records([item])
+        return item
+
+    def _attach_payment_records(self, items: list[dict[str, Any]]) -> None:
+        payments: dict[int, list[dict[str, Any]]] = {item["id"]: [] for item in items}
+        if payments:
+            rows = self.session.execute(
+                select(*PAYMENT_COLUMNS).where(Payment.order_id.in_(list(payments))).order_by(Payment.id)
+            )
+            for row in rows:
+                payments[row.payment_order_id].append(payment_record(row))
+        for item in items:
+            item["payments"] = payments[item["id"]]
+
     def deposit(self, order_id: int, amount_raw: Decimal, payment_type: PaymentType) -> OrderPaymentResult:
         amount = self._normalize_positive_amount(amount_raw)
-        self.sync_order_acquiring_payments(order_id, fail_silently=True)
+        start_acquiring: Callable[[], str] | None = None
+        if not self.acquiring_outbox:
+            # Retries must reuse the bank payment started by an earlier attempt instead of opening another one.
+            start_acquiring = functools.cache(lambda: self.bank_client.start_acquiring(order_id=order_id, amount=amount))
+        return self._retry_on_concurrent_update(
+            lambda: self._deposit(order_id, amount, payment_type, start_acquiring)
+        )
 
-        order = self.get_order(order_id)
-        reserved_amount = self._reserved_amount(order)
-        if reserved_amount + amount > order.total_amount:
+    def _deposit(
+        self,
+        order_id: int,
+        amount: Money,
+        payment_type: PaymentType,
+        start_acquiring: Callable[[], str] | None,
+    ) -> OrderPaymentResult:
+        # Stale pending payments are refreshed and committed before the order is locked: no lock is held across
+        # the bank checks, and the reserve check below runs under the lock it is meant to be protected by.
+        pending_payments = self._pending_acquiring_payments(order_id)
+        if pending_payments and self._refresh_stale_acquiring_payments(pending_payments[0].order, pending_payments):
+            self.session.commit()
+
+        order = self._lock_order(order_id)
+        if not order:
+            raise NotFoundError(f"Order {order_id} not found")
+        if order.reserved_amount + amount > order.total_amount:
             raise ConflictError(
                 "Total amount across successful and pending payments cannot exceed order total amount"
             )
 
-        payment_status = PaymentStatus.SUCCEEDED if payment_type == PaymentType.CASH else PaymentStatus.PENDING
         external_payment_id: str | None = None
+        if payment_type == PaymentType.ACQUIRING and start_acquiring is not None:
+            external_payment_id = start_acquiring()
+
+        payment = self._add_payment(order, amount, payment_type, external_payment_id)
+        self._recalculate_order_status(order)
+        self.session.flush()
+        self._link_acquiring_payment(payment)
+
+        # Everything the response needs was set in Python or returned by the flush, so nothing is refreshed.
+        return self._commit_result(OrderPaymentResult(order=order, payment=payment))
 
-        if payment_type == PaymentType.ACQUIRING:
-            external_payment_id = self.bank_client.start_acquiring(order_id=order.id, amount=amount)
+    def refund(self, payment_id: int, amount_raw: Decimal | None = None) -> OrderPaymentResult:
+        return self._retry_on_concurrent_update(lambda: self._refund(payment_id, amount_raw))
 
+    def _refund(self, payment_id: int, amount_raw: Decimal | None) -> OrderPaymentResult:
+        # The order and bank state are loaded lazily: a cash refund never needs the bank state, and the
+        # order is read once, under the lock.
+        payment = self.session.scalar(select(Payment).where(Payment.id == payment_id))
+        if not payment:
+            raise NotFoundError(f"Payment {payment_id} not found")
+
+        if payment.payment_type == PaymentType.ACQUIRING:
+            self._sync_loaded_payment(payment)
+        order = self._lock_order(payment.order_id)
+
+        self._apply_refund(payment, order, amount_raw)
+        self._recalculate_order_status(order)
+        return self._commit_result(OrderPaymentResult(order=order, payment=payment))
+
+    def _add_payment(
+        self,
+        order: Order,
+        amount: Money,
+        payment_type: PaymentType,
+        external_payment_id: str | None,
+    ) -> Payment:
+        payment_status = PaymentStatus.SUCCEEDED if payment_type == PaymentType.CASH else PaymentStatus.PENDING
         payment = Payment(
             order=order,
             payment_type=payment_type,
@@ -74,31 +385,26 @@ class PaymentService:
             paid_at=datetime.now(timezone.utc) if payment_status == PaymentStatus.SUCCEEDED else None,
         )
         self.session.add(payment)
-        self.session.flush()
+        _shift_order_balance(order, NO_BALANCE_CONTRIBUTION, balance_contribution(payment))
+        return payment
 
-        if payment_type == PaymentType.ACQUIRING:
-            bank_state = BankPaymentState(
+    def _link_acquiring_payment(self, payment: Payment) -> None:
+        if payment.payment_type != PaymentType.ACQUIRING:
+            return
+        if payment.external_payment_id is None:
+            # The bank payment is opened later by the outbox dispatcher, outside of this transaction.
+            self.session.add(AcquiringOutboxEntry(payment_id=payment.id))
+            return
+        self.session.add(
+            BankPaymentState(
                 payment_id=payment.id,
-                bank_payment_id=external_payment_id,
-                bank_amount=amount,
+                bank_payment_id=payment.external_payment_id,
+                bank_amount=payment.amount,
                 bank_status=BankStatus.CREATED,
             )
-            self.session.add(bank_state)
-
-        self._recalculate_order_status(order)
-        self.session.commit()
-        self.session.refresh(order)
-        self.session.refresh(payment)
-
-        return OrderPaymentResult(order=order, payment=payment)
-
-    def refund(self, payment_id: int, amount_raw: Decimal | None = None) -> OrderPaymentResult:
-        payment = self._get_payment(payment_id)
-
-        if payment.payment_type == PaymentType.ACQUIRING:
-            self.sync_payment(payment_id)
-            payment = self._get_payment(payment_id)
+        )
 
+    def _apply_refund(self, payment: Payment, order: Order, amount_raw: Decimal | None) -> None:
         refundable_amount = payment.amount - payment.refunded_amount
         if refundable_amount <= ZERO_MONEY:
             raise ConflictError(f"Payment {payment.id} has no refundable amount")
@@ -109,96 +415,659 @@ class PaymentService:
                 f"Refund amount {refund_amount} exceeds available refundable amount {refundable_amount}"
             )
 
-        if payment.status not in {
-            PaymentStatus.SUCCEEDED,
-            PaymentStatus.PARTIALLY_REFUNDED,
-            PaymentStatus.REFUNDED,
-        }:
+        if payment.status not in SETTLED_PAYMENT_STATUSES:
             raise ConflictError(f"Payment {payment.id} cannot be refunded in status {payment.status.value}")
 
-        payment.refunded_amount = (payment.refunded_amount + refund_amount).quantize(MONEY_STEP, rounding=ROUND_HALF_UP)
+        balance_before = balance_contribution(payment)
+        payment.refunded_amount = payment.refunded_amount + refund_amount
         if payment.refunded_amount == payment.amount:
             payment.status = PaymentStatus.REFUNDED
         else:
             payment.status = PaymentStatus.PARTIALLY_REFUNDED
 
-        order = payment.order
-        self._recalculate_order_status(order)
-        self.session.commit()
-        self.session.refresh(order)
-        self.session.refresh(payment)
+        _shift_order_balance(order, balance_before, balance_contribution(payment))
+
+    def deposit_many(self, items: list[DepositItem], chunk_size: int = 100) -> list[BatchItemOutcome]:
+        # Bank payments opened by a failed attempt are reused when the chunk is retried.
+        started: dict[int, str] = {}
+        return self._run_batch(items, chunk_size, lambda chunk: self._deposit_chunk(chunk, started))
+
+    def refund_many(self, items: list[RefundItem], chunk_size: int = 100) -> list[BatchItemOutcome]:
+        return self._run_batch(items, chunk_size, self._refund_chunk)
 
-        return OrderPaymentResult(order=order, payment=payment)
+    def _run_batch(
+        self,
+        items: list[Any],
+        chunk_size: int,
+        process_chunk: Callable[[list[tuple[int, Any]]], list[BatchItemOutcome]],
+    ) -> list[BatchItemOutcome]:
+        outcomes: list[BatchItemOutcome] = []
+        before_final_commit = self._before_final_commit
+        last_offset = max(len(items) - 1, 0) // chunk_size * chunk_size
+        completed = False
+        try:
+            for offset in range(0, len(items), chunk_size):
+                chunk = list(enumerate(items[offset : offset + chunk_size], start=offset))
+                # Every chunk commits on its own; only the last one carries the caller's callback, with the outcomes
+                # of the whole batch.
+                self._before_final_commit = None
+                if offset == last_offset and before_final_commit is not None:
+                    self._before_final_commit = lambda chunk_outcomes: before_final_commit(outcomes + chunk_outcomes)
+                try:
+                    outcomes.extend(self._retry_on_concurrent_update(lambda: process_chunk(chunk)))
+                    completed = offset == last_offset
+                except Exception as exc:
+                    # Only this chunk is lost; earlier chunks are already committed and later ones still run.
+                    # Nothing may escape here: the caller's idempotency key would be released and a retry would
+                    # repeat the committed chunks.
+                    self.session.rollback()
+                    error = exc if isinstance(exc, AppError) else ExternalServiceError(f"Batch chunk failed: {exc}")
+                    outcomes.extend(BatchItemOutcome(index, error=error) for index, _ in chunk)
+        finally:
+            self._before_final_commit = before_final_commit
+        if completed:
+            return outcomes
+        return self._commit_result(outcomes)
+
+    def _deposit_chunk(self, chunk: list[tuple[int, DepositItem]], started: dict[int, str]) -> list[BatchItemOutcome]:
+        # As in _deposit: stale pending payments are refreshed and committed first, and only then are the orders
+        # locked, so no lock is held across the bank checks and the reserve checks below run under the lock.
+        order_ids = {item.order_id for _, item in chunk}
+        pending_by_order: dict[int, list[Payment]] = {}
+        for payment in self.session.scalars(
+            select(Payment)
+            .options(selectinload(Payment.bank_state), selectinload(Payment.order))
+            .where(Payment.order_id.in_(order_ids), PENDING_ACQUIRING_PAYMENTS)
+            .order_by(Payment.id)
+        ):
+            pending_by_order.setdefault(payment.order_id, []).append(payment)
+        refreshed = [
+            self._refresh_stale_acquiring_payments(payments[0].order, payments)
+            for payments in pending_by_order.values()
+        ]
+        if any(refreshed):
+            self.session.commit()
+
+        orders = self._lock_orders(order_ids)
+
+        errors: dict[int, AppError] = {}
+        accepted: list[tuple[int, Order, Money, PaymentType]] = []
+        reserved = {order_id: order.reserved_amount for order_id, order in orders.items()}
+        for index, item in chunk:
+            try:
+                amount = self._normalize_positive_amount(item.amount)
+                order = orders.get(item.order_id)
+                if order is None:
+                    raise NotFoundError(f"Order {item.order_id} not found")
+                if reserved[order.id] + amount > order.total_amount:
+                    raise ConflictError(
+                        "Total amount across successful and pending payments cannot exceed order total amount"
+                    )
+            except AppError as exc:
+                errors[index] = exc
+                continue
+            reserved[order.id] += amount
+            accepted.append((index, order, amount, item.payment_type))
+
+        to_start = [
+            (index, order.id, amount)
+            for index, order, amount, payment_type in accepted
+            if payment_type == PaymentType.ACQUIRING and not self.acquiring_outbox and index not in started
+        ]
+        if to_start:
+            bank_results = self._start_acquiring_many(
+                [(order_id, amount) for _, order_id, amount in to_start],
+                self.bank_check_concurrency,
+            )
+            for (index, _, _), bank_result in zip(to_start, bank_results):
+                if isinstance(bank_result, AppError):
+                    errors[index] = bank_result
+                elif isinstance(bank_result, Exception):
+                    errors[index] = ExternalServiceError(str(bank_result))
+                else:
+                    started[index] = bank_result
+
+        payments: dict[int, Payment] = {}
+        for index, order, amount, payment_type in accepted:
+            if index in errors:
+                continue
+            payments[index] = self._add_payment(order, amount, payment_type, started.get(index))
+        for order in orders.values():
+            self._recalculate_order_status(order)
+        self.session.flush()
+        for payment in payments.values():
+            self._link_acquiring_payment(payment)
+        return self._commit_result(
+            [BatchItemOutcome(index, payment=payments.get(index), error=errors.get(index)) for index, _ in chunk]
+        )
+
+    def _refund_chunk(self, chunk: list[tuple[int, RefundItem]]) -> list[BatchItemOutcome]:
+        payments = {
+            payment.id: payment
+            for payment in self.session.scalars(
+                select(Payment)
+                .options(selectinload(Payment.bank_state), selectinload(Payment.order))
+                .where(Payment.id.in_({item.payment_id for _, item in chunk}))
+                .execution_options(populate_existing=True)
+            )
+        }
+
+        # Like a single refund, acquiring payments are confirmed with the bank first, all in one fan-out, and the
+        # result is committed before any order is locked, so no row lock is held across the bank round-trips.
+        sync_errors: dict[int, AppError] = {}
+        linked_payments: list[Payment] = []
+        for payment in payments.values():
+            if payment.payment_type != PaymentType.ACQUIRING:
+                continue
+            try:
+                self._ensure_bank_link(payment)
+            except ConflictError as exc:
+                sync_errors[payment.id] = exc
+                continue
+            linked_payments.append(payment)
+        if linked_payments:
+            with self._bank_checks(min(self.bank_check_concurrency, len(linked_payments))) as check_many:
+                snapshots = check_many(linked_payments)
+            for payment, snapshot in zip(linked_payments, snapshots):
+                try:
+                    if isinstance(snapshot, Exception):
+                        raise snapshot
+                    self._apply_bank_snapshot(payment, snapshot)
+                except Exception as exc:
+                    self._record_bank_error(payment, exc)
+                    sync_errors[payment.id] = exc if isinstance(exc, AppError) else ExternalServiceError(str(exc))
+            for order in {payment.order_id: payment.order for payment in linked_payments}.values():
+                self._recalculate_order_status(order)
+            self.session.commit()
+
+        orders = self._lock_orders({payment.order_id for payment in payments.values()})
+        outcomes: list[BatchItemOutcome] = []
+        for index, item in chunk:
+            try:
+                payment = payments.get(item.payment_id)
+                if payment is None:
+                    raise NotFoundError(f"Payment {item.payment_id} not found")
+                if payment.id in sync_errors:
+                    raise sync_errors[payment.id]
+                self._apply_refund(payment, orders[payment.order_id], item.amount)
+            except AppError as exc:
+                outcomes.append(BatchItemOutcome(index, error=exc))
+                continue
+            outcomes.append(BatchItemOutcome(index, payment=payment))
+
+        for order in orders.values():
+            self._recalculate_order_status(order)
+        return self._commit_result(outcomes)
 
     def sync_payment(self, payment_id: int) -> Payment:
+        return self._retry_on_concurrent_update(lambda: self._sync_payment(payment_id))
+
+    def _sync_payment(self, payment_id: int) -> Payment:
         payment = self._get_payment(payment_id)
         if payment.payment_type != PaymentType.ACQUIRING:
             return payment
 
+        self._sync_loaded_payment(payment)
+        return payment
+
+    def _sync_loaded_payment(self, payment: Payment) -> None:
+        # Committed on its own so that the bank's answer is kept even if the caller's operation fails, and so
+        # that no row lock is held across the bank round-trip.
         try:
             self._sync_acquiring_payment(payment, fail_silently=False)
+        except (StaleDataError, DBAPIError):
+            # The flush lost a race or hit a lock: leave a clean session for _retry_on_concurrent_update.
+            self.session.rollback()
+            raise
         except Exception:
-            self.session.commit()
+            # Keep the recorded bank error, unless that write itself races; the bank error is what matters then.
+            try:
+                self.session.commit()
+            except (StaleDataError, DBAPIError):
+                self.session.rollback()
             raise
         self._recalculate_order_status(payment.order)
         self.session.commit()
-        self.session.refresh(payment)
-        self.session.refresh(payment.order)
 
-        return payment
+    def _pending_acquiring_payments(self, order_id: int) -> list[Payment]:
+        return list(
+            self.session.scalars(
+                select(Payment)
+                .options(selectinload(Payment.bank_state))
+                .where(Payment.order_id == order_id, PENDING_ACQUIRING_PAYMENTS)
+                .order_by(Payment.id)
+            )
+        )
 
-    def sync_order_acquiring_payments(self, order_id: int, fail_silently: bool) -> None:
-        order = self.get_order(order_id)
-        touched = False
+    def _refresh_stale_acquiring_payments(self, order: Order, pending_payments: list[Payment]) -> bool:
+        now = datetime.now(timezone.utc)
+        stale_payments = [
+            payment
+            for payment in pending_payments
+            if payment.bank_state is not None and self._needs_bank_check(payment.bank_state, now)
+        ]
+        if not stale_payments:
+            return False
 
-        for payment in order.payments:
-            if payment.payment_type != PaymentType.ACQUIRING:
+        with self._bank_checks(min(self.bank_check_concurrency, len(stale_payments))) as check_many:
+            outcomes = check_many(stale_payments)
+
+        for payment, outcome in zip(stale_payments, outcomes):
+            if isinstance(outcome, Exception):
+                self._record_bank_error(payment, outcome)
                 continue
-            if payment.status != PaymentStatus.PENDING:
+            try:
+                self._apply_bank_snapshot(payment, outcome)
+            except ConflictError as exc:
+                self._record_bank_error(payment, exc)
+
+        self._recalculate_order_status(order)
+        return True
+
+    def _needs_bank_check(self, bank_state: BankPaymentState, now: datetime) -> bool:
+        if bank_state.last_checked_at is None:
+            return True
+        return now - as_utc(bank_state.last_checked_at) >= self.acquiring_freshness
+
+    def reconcile_pending_payments(
+        self,
+        concurrency: int = 1,
+        chunk_size: int = 100,
+        cursor: int | None = None,
+        limit: int | None = None,
+    ) -> ReconcileResult:
+        started_at = time.perf_counter()
+        result = ReconcileResult()
+        affected_order_ids: set[int] = set()
+        last_payment_id = cursor or 0
+
+        with bank_lane(BankLane.BACKGROUND), self._bank_checks(concurrency) as check_many:
+            while True:
+                page_size = chunk_size if limit is None else min(chunk_size, limit - result.processed_payments)
+                if page_size <= 0:
+                    result.next_cursor = last_payment_id
+                    break
+
+                chunk = self._retry_on_concurrent_update(
+                    lambda: self._reconcile_next_chunk(last_payment_id, page_size, check_many)
+                )
+                if chunk is None:
+                    break
+
+                result.merge(chunk.result)
+                affected_order_ids.update(chunk.order_ids)
+                last_payment_id = chunk.last_payment_id
+                self.session.expunge_all()
+
+                if chunk.size < page_size:
+                    break
+
+        result.affected_orders = len(affected_order_ids)
+        result.duration_seconds = time.perf_counter() - started_at
+        return result
+
+    def _reconcile_next_chunk(
+        self,
+        after_payment_id: int,
+        page_size: int,
+        check_many: BankChecks,
+    ) -> _ReconciledChunk | None:
+        payments = list(
+            self.session.scalars(
+                self._reconcilable_payments()
+                .where(Payment.id > after_payment_id)
+                .order_by(Payment.id)
+                .limit(page_size)
+            )
+        )
+        if not payments:
+            return None
+
+        result = ReconcileResult()
+        self._reconcile_chunk(payments, check_many, result)
+        self.session.commit()
+        return _ReconciledChunk(
+            result=result,
+            order_ids={payment.order_id for payment in payments},
+            last_payment_id=payments[-1].id,
+            size=len(payments),
+        )
+
+    def reconcile_payments(self, payment_ids: list[int], concurrency: int = 1) -> ReconcileResult:
+        started_at = time.perf_counter()
+        with bank_lane(BankLane.BACKGROUND), self._bank_checks(concurrency) as check_many:
+            result = self._retry_on_concurrent_update(lambda: self._reconcile_payment_ids(payment_ids, check_many))
+        result.duration_seconds = time.perf_counter() - started_at
+        return result
+
+    def _reconcile_payment_ids(self, payment_ids: list[int], check_many: BankChecks) -> ReconcileResult:
+        result = ReconcileResult()
+        payments = list(
+            self.session.scalars(self._reconcilable_payments().where(Payment.id.in_(payment_ids)).order_by(Payment.id))
+        )
+        if payments:
+            self._reconcile_chunk(payments, check_many, result)
+            self.session.commit()
+        result.affected_orders = len({payment.order_id for payment in payments})
+        return result
+
+    @staticmethod
+    def _reconcilable_payments() -> Select[tuple[Payment]]:
+        return (
+            select(Payment)
+            .options(selectinload(Payment.bank_state), selectinload(Payment.order))
+            .where(PENDING_ACQUIRING_PAYMENTS)
+        )
+
+    def _reconcile_chunk(self, payments: list[Payment], check_many: BankChecks, result: ReconcileResult) -> None:
+        linked_payments: list[Payment] = []
+        for payment in payments:
+            if payment.external_payment_id is None and payment.bank_state is None:
+                # Still waiting in the acquiring outbox: there is nothing to ask the bank about yet.
+                result.record("awaiting_dispatch")
+                continue
+            try:
+                self._ensure_bank_link(payment)
+            except ConflictError:
+                result.conflicts += 1
+                result.record("conflict")
+                continue
+            linked_payments.append(payment)
+
+        outcomes = check_many(linked_payments)
+        for payment, outcome in zip(linked_payments, outcomes):
+            if isinstance(outcome, Exception):
+                self._record_bank_error(payment, outcome)
+                result.failed_checks += 1
+                result.record("error")
                 continue
-            touched = True
-            self._sync_acquiring_payment(payment, fail_silently=fail_silently)
 
-        if touched:
+            try:
+                self._apply_bank_snapshot(payment, outcome)
+            except ConflictError as exc:
+                self._record_bank_error(payment, exc)
+                result.conflicts += 1
+                result.record("conflict")
+                continue
+            result.record(outcome.status.value)
+
+        for order in {payment.order_id: payment.order for payment in payments}.values():
             self._recalculate_order_status(order)
-            self.session.commit()
 
-    def reconcile_pending_payments(self) -> tuple[int, int]:
-        pending_payments = list(
+    def dispatch_acquiring_outbox(
+        self,
+        entry_ids: list[int],
+        concurrency: int = 1,
+        max_attempts: int = 5,
+    ) -> OutboxDispatchResult:
+        started_at = time.perf_counter()
+        requests = self.session.execute(
+            select(AcquiringOutboxEntry.id, Payment.order_id, Payment.amount)
+            .join(Payment, Payment.id == AcquiringOutboxEntry.payment_id)
+            .where(AcquiringOutboxEntry.id.in_(entry_ids), AcquiringOutboxEntry.status == OutboxStatus.PENDING)
+            .order_by(AcquiringOutboxEntry.id)
+        ).all()
+        # End the read transaction first: no database lock may be held across the bank round-trips.
+        self.session.rollback()
+        if not requests:
+            return OutboxDispatchResult(duration_seconds=time.perf_counter() - started_at)
+
+        with bank_lane(BankLane.BACKGROUND):
+            started = self._start_acquiring_many(
+                [(order_id, amount) for _, order_id, amount in requests],
+                concurrency,
+            )
+        outcomes = {entry_id: outcome for (entry_id, _, _), outcome in zip(requests, started)}
+
+        result = self._retry_on_concurrent_update(lambda: self._apply_outbox_outcomes(outcomes, max_attempts))
+        result.duration_seconds = time.perf_counter() - started_at
+        return result
+
+    def _start_acquiring_many(self, requests: list[tuple[int, Money]], concurrency: int) -> list[str | Exception]:
+        start_acquiring_many = getattr(self.bank_client, "start_acquiring_many", None)
+        if start_acquiring_many is not None:
+            return start_acquiring_many(requests, concurrency)
+
+        def start(request: tuple[int, Money]) -> str | Exception:
+            order_id, amount = request
+            try:
+                return self.bank_client.start_acquiring(order_id=order_id, amount=amount)
+            except Exception as exc:
+                return exc
+
+        if concurrency <= 1 or len(requests) <= 1:
+            return [start(request) for request in requests]
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(requests))) as executor:
+            return list(executor.map(lambda request: context.copy().run(start, request), requests))
+
+    def _apply_outbox_outcomes(
+        self,
+        outcomes: dict[int, str | Exception],
+        max_attempts: int,
+    ) -> OutboxDispatchResult:
+        result = OutboxDispatchResult()
+        now = datetime.now(timezone.utc)
+        entries = list(
             self.session.scalars(
-                select(Payment)
-                .options(selectinload(Payment.order).selectinload(Order.payments).selectinload(Payment.bank_state))
-                .where(Payment.payment_type == PaymentType.ACQUIRING, Payment.status == PaymentStatus.PENDING)
+                select(AcquiringOutboxEntry)
+                .options(selectinload(AcquiringOutboxEntry.payment).selectinload(Payment.order))
+                .where(AcquiringOutboxEntry.id.in_(outcomes), AcquiringOutboxEntry.status == OutboxStatus.PENDING)
+                .order_by(AcquiringOutboxEntry.id)
+                .execution_options(populate_existing=True)
             )
         )
-        if not pending_payments:
-            return 0, 0
 
         affected_orders: dict[int, Order] = {}
-        for payment in pending_payments:
-            affected_orders[payment.order.id] = payment.order
-            self._sync_acquiring_payment(payment, fail_silently=True)
+        for entry in entries:
+            outcome = outcomes[entry.id]
+            payment = entry.payment
+            entry.attempts += 1
+
+            if isinstance(outcome, Exception):
+                entry.last_error = str(outcome)
+                if entry.attempts < max_attempts:
+                    result.retried += 1
+                    continue
+                entry.status = OutboxStatus.FAILED
+                result.failed += 1
+                if payment.status == PaymentStatus.PENDING:
+                    balance_before = balance_contribution(payment)
+                    payment.status = PaymentStatus.FAILED
+                    _shift_order_balance(payment.order, balance_before, balance_contribution(payment))
+                    affected_orders[payment.order_id] = payment.order
+                continue
+
+            entry.status = OutboxStatus.DISPATCHED
+            entry.dispatched_at = now
+            entry.last_error = None
+            payment.external_payment_id = outcome
+            self.session.add(
+                BankPaymentState(
+                    payment_id=payment.id,
+                    bank_payment_id=outcome,
+                    bank_amount=payment.amount,
+                    bank_status=BankStatus.CREATED,
+                )
+            )
+            result.dispatched += 1
+
+        for order in affected_orders.values():
+            self._recalculate_order_status(order)
+        self.session.commit()
+        return result
+
+    def apply_bank_notifications(self, notifications: list[dict[str, Any]]) -> list[BankNotificationOutcome]:
+        def apply() -> list[BankNotificationOutcome]:
+            try:
+                return self._apply_bank_notifications(notifications)
+            except IntegrityError:
+                # A concurrent delivery of the same notification committed its dedup key between our lookup and
+                # our insert. Run the batch again: this time the key is seen and the replay reported as duplicate.
+                self.session.rollback()
+                return self._apply_bank_notifications(notifications)
+
+        return self._retry_on_concurrent_update(apply)
+
+    def _apply_bank_notifications(self, notifications: list[dict[str, Any]]) -> list[BankNotificationOutcome]:
+        outcomes: list[BankNotificationOutcome | None] = [None] * len(notifications)
+        parsed: list[tuple[int, BankPaymentSnapshot, str]] = []
+        for index, raw in enumerate(notifications):
+            try:
+                snapshot = BankAPIClient.parse_snapshot(raw)
+            except ExternalServiceError as exc:
+                outcomes[index] = BankNotificationOutcome(
+                    bank_payment_id=str(raw.get("bank_payment_id") or ""),
+                    result=NotificationResult.INVALID,
+                    detail=exc.message,
+                )
+                continue
+            parsed.append((index, snapshot, self._notification_dedup_key(raw, snapshot)))
+
+        dedup_keys = {dedup_key for _, _, dedup_key in parsed}
+        seen_keys: set[str] = set()
+        if dedup_keys:
+            seen_keys.update(
+                self.session.scalars(select(BankNotification.dedup_key).where(BankNotification.dedup_key.in_(dedup_keys)))
+            )
+
+        bank_payment_ids = {snapshot.bank_payment_id for _, snapshot, _ in parsed}
+        payments: dict[str, Payment] = {}
+        if bank_payment_ids:
+            payments = {
+                payment.bank_state.bank_payment_id: payment
+                for payment in self.session.scalars(
+                    select(Payment)
+                    .join(Payment.bank_state)
+                    .options(contains_eager(Payment.bank_state), selectinload(Payment.order))
+                    .where(BankPaymentState.bank_payment_id.in_(bank_payment_ids))
+                )
+            }
+
+        affected_orders: dict[int, Order] = {}
+        for index, snapshot, dedup_key in parsed:
+            outcomes[index] = self._apply_bank_notification(snapshot, dedup_key, seen_keys, payments, affected_orders)
 
         for order in affected_orders.values():
             self._recalculate_order_status(order)
 
         self.session.commit()
-        return len(pending_payments), len(affected_orders)
+        return outcomes
+
+    def _apply_bank_notification(
+        self,
+        snapshot: BankPaymentSnapshot,
+        dedup_key: str,
+        seen_keys: set[str],
+        payments: dict[str, Payment],
+        affected_orders: dict[int, Order],
+    ) -> BankNotificationOutcome:
+        if dedup_key in seen_keys:
+            return BankNotificationOutcome(snapshot.bank_payment_id, NotificationResult.DUPLICATE)
+
+        payment = payments.get(snapshot.bank_payment_id)
+        if payment is None:
+            return BankNotificationOutcome(snapshot.bank_payment_id, NotificationResult.NOT_FOUND)
+
+        seen_keys.add(dedup_key)
+        self.session.add(
+            BankNotification(dedup_key=dedup_key, bank_payment_id=snapshot.bank_payment_id, payment_id=payment.id)
+        )
+        self._forget_bank_snapshot(snapshot.bank_payment_id)
+
+        if payment.status != PaymentStatus.PENDING:
+            return BankNotificationOutcome(snapshot.bank_payment_id, NotificationResult.IGNORED, payment.id)
+
+        try:
+            changed = self._apply_bank_snapshot(payment, snapshot)
+        except ConflictError as exc:
+            self._record_bank_error(payment, exc)
+            return BankNotificationOutcome(snapshot.bank_payment_id, NotificationResult.CONFLICT, payment.id, exc.message)
+
+        affected_orders[payment.order_id] = payment.order
+        result = NotificationResult.APPLIED if changed else NotificationResult.UNCHANGED
+        return BankNotificationOutcome(snapshot.bank_payment_id, result, payment.id)
+
+    @staticmethod
+    def _notification_dedup_key(raw: dict[str, Any], snapshot: BankPaymentSnapshot) -> str:
+        notification_id = raw.get("notification_id")
+        if notification_id:
+            source = f"id:{notification_id}"
+        else:
+            paid_at = snapshot.paid_at.isoformat() if snapshot.paid_at else ""
+            source = f"state:{snapshot.bank_payment_id}:{snapshot.status.value}:{snapshot.amount}:{paid_at}"
+        return hashlib.sha256(source.encode()).hexdigest()
+
+    def _forget_bank_snapshot(self, bank_payment_id: str) -> None:
+        # The pushed status is newer than anything the client may still have cached for this payment.
+        forget_snapshot = getattr(self.bank_client, "forget_snapshot", None)
+        if forget_snapshot is not None:
+            forget_snapshot(bank_payment_id)
+
+    @contextmanager
+    def _bank_checks(self, concurrency: int) -> Iterator[BankChecks]:
+        # Clients with their own fan-out (the async bridge) are used as is; otherwise checks go through a thread pool.
+        check_acquiring_many = getattr(self.bank_client, "check_acquiring_many", None)
+        if check_acquiring_many is not None:
+            yield lambda payments: check_acquiring_many(
+                [payment.external_payment_id for payment in payments],
+                concurrency,
+            )
+            return
+
+        executor = ThreadPoolExecutor(max_workers=concurrency) if concurrency > 1 else None
+        try:
+            yield lambda payments: self._check_acquiring_many(payments, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+    def _check_acquiring_many(
+        self,
+        payments: list[Payment],
+        executor: Executor | None,
+    ) -> list[BankPaymentSnapshot | Exception]:
+        def check(bank_payment_id: str) -> BankPaymentSnapshot | Exception:
+            try:
+                return self.bank_client.check_acquiring(bank_payment_id)
+            except Exception as exc:
+                return exc
+
+        bank_payment_ids = [payment.external_payment_id for payment in payments]
+        if executor is None or len(bank_payment_ids) <= 1:
+            return [check(bank_payment_id) for bank_payment_id in bank_payment_ids]
+        # Worker threads do not inherit context variables, and the bank lane is one of them.
+        context = contextvars.copy_context()
+        return list(executor.map(lambda bank_payment_id: context.copy().run(check, bank_payment_id), bank_payment_ids))
 
     def _sync_acquiring_payment(self, payment: Payment, fail_silently: bool) -> bool:
-        if not payment.external_payment_id or not payment.bank_state:
-            raise ConflictError(f"Acquiring payment {payment.id} has no linked bank state")
+        self._ensure_bank_link(payment)
 
         try:
             snapshot = self.bank_client.check_acquiring(payment.external_payment_id)
         except Exception as exc:
-            payment.bank_state.last_checked_at = datetime.now(timezone.utc)
-            payment.bank_state.last_error = str(exc)
+            self._record_bank_error(payment, exc)
             if fail_silently:
                 self.session.flush()
                 return False
             raise
 
+        changed = self._apply_bank_snapshot(payment, snapshot)
+        self.session.flush()
+        return changed
+
+    @staticmethod
+    def _ensure_bank_link(payment: Payment) -> None:
+        if not payment.external_payment_id or not payment.bank_state:
+            raise ConflictError(f"Acquiring payment {payment.id} has no linked bank state")
+
+    @staticmethod
+    def _record_bank_error(payment: Payment, exc: Exception) -> None:
+        payment.bank_state.last_checked_at = datetime.now(timezone.utc)
+        payment.bank_state.last_error = str(exc)
+
+    @staticmethod
+    def _apply_bank_snapshot(payment: Payment, snapshot: BankPaymentSnapshot) -> bool:
         if snapshot.bank_payment_id != payment.external_payment_id:
             raise ConflictError(
                 f"Bank payment id mismatch for payment {payment.id}: expected {payment.external_payment_id}, got {snapshot.bank_payment_id}"
@@ -216,6 +1085,7 @@ class PaymentService:
         payment.bank_state.last_error = None
 
         previous_status = payment.status
+        balance_before = balance_contribution(payment)
 
         if snapshot.status == BankStatus.PAID:
             payment.status = PaymentStatus.SUCCEEDED
@@ -223,59 +1093,73 @@ class PaymentService:
         elif snapshot.status in {BankStatus.FAILED, BankStatus.CANCELLED}:
             payment.status = PaymentStatus.FAILED
 
-        self.session.flush()
-        return previous_status != payment.status
+        if previous_status == payment.status:
+            return False
+
+        _shift_order_balance(payment.order, balance_before, balance_contribution(payment))
+        return True
+
+    def _retry_on_concurrent_update(self, operation: Callable[[], T]) -> T:
+        busy = False
+        for attempt in range(self.concurrent_update_retries + 1):
+            try:
+                return operation()
+            except StaleDataError:
+                self.session.rollback()
+                busy = False
+            except DBAPIError as exc:
+                if not is_transient_lock_error(exc):
+                    raise
+                # Another writer holds the database lock; back off with jitter before retrying the whole operation.
+                self.session.rollback()
+                busy = True
+                if self.busy_retry_base_delay_seconds > 0 and attempt < self.concurrent_update_retries:
+                    self.sleep(random.uniform(0, self.busy_retry_base_delay_seconds * (2**attempt)))
+        if busy:
+            raise DatabaseBusyError("Database is busy, retry the request")
+        raise ConflictError("Order was modified concurrently, retry the request")
+
+    def _lock_orders(self, order_ids: set[int]) -> dict[int, Order]:
+        if not order_ids:
+            return {}
+        return {
+            order.id: order
+            for order in self.session.scalars(
+                select(Order)
+                .where(Order.id.in_(order_ids))
+                .order_by(Order.id)
+                .with_for_update()
+                .execution_options(populate_existing=True)
+            )
+        }
+
+    def _lock_order(self, order_id: int) -> Order | None:
+        return self.session.scalar(
+            select(Order)
+            .where(Order.id == order_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
 
     def _get_payment(self, payment_id: int) -> Payment:
         payment = self.session.scalar(
             select(Payment)
-            .options(selectinload(Payment.order).selectinload(Order.payments).selectinload(Payment.bank_state))
+            .options(selectinload(Payment.order), selectinload(Payment.bank_state))
             .where(Payment.id == payment_id)
         )
         if not payment:
             raise NotFoundError(f"Payment {payment_id} not found")
         return payment
 
-    def _reserved_amount(self, order: Order) -> Decimal:
-        reserved = ZERO_MONEY
-        for payment in order.payments:
-            if payment.status == PaymentStatus.FAILED:
-                continue
-            if payment.status == PaymentStatus.PENDING:
-                reserved += payment.amount
-            else:
-                reserved += payment.amount - payment.refunded_amount
-        return reserved.quantize(MONEY_STEP, rounding=ROUND_HALF_UP)
-
-    def _paid_amount(self, order: Order) -> Decimal:
-        paid = ZERO_MONEY
-        for payment in order.payments:
-            if payment.status in {
-                PaymentStatus.SUCCEEDED,
-                PaymentStatus.PARTIALLY_REFUNDED,
-                PaymentStatus.REFUNDED,
-            }:
-                paid += payment.amount - payment.refunded_amount
-        return paid.quantize(MONEY_STEP, rounding=ROUND_HALF_UP)
-
-    def _recalculate_order_status(self, order: Order) -> None:
-        paid_amount = self._paid_amount(order)
-
-        if paid_amount <= ZERO_MONEY:
-            order.payment_status = OrderPaymentStatus.UNPAID
-            return
-
-        if paid_amount >= order.total_amount:
-            order.payment_status = OrderPaymentStatus.PAID
-            return
-
-        order.payment_status = OrderPaymentStatus.PARTIALLY_PAID
+    @staticmethod
+    def _recalculate_order_status(order: Order) -> None:
+        order.payment_status = resolve_order_payment_status(order.total_amount, order.paid_amount)
 
     @staticmethod
-    def _normalize_positive_amount(value: Decimal | str | int | float) -> Decimal:
+    def _normalize_positive_amount(value: Decimal | str | int | float) -> Money:
         try:
-            amount = Decimal(str(value)).quantize(MONEY_STEP, rounding=ROUND_HALF_UP)
-        except (InvalidOperation, ValueError, TypeError) as exc:
+            amount = Money.parse(value)
+        except ValueError as exc:
             raise ValidationError("Amount must be a decimal number") from exc
 
         if amount <= ZERO_MONEY:
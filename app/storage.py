@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event, make_url
+from sqlalchemy.engine import Engine, URL
+from sqlalchemy.exc import DBAPIError
+
+from app.config import Settings
+
+SQLITE_JOURNAL_MODES = {"delete", "truncate", "persist", "memory", "wal", "off"}
+SQLITE_SYNCHRONOUS_MODES = {"off", "normal", "full", "extra"}
+# Serialization failure, deadlock detected, lock not available.
+POSTGRES_TRANSIENT_LOCK_STATES = {"40001", "40P01", "55P03"}
+SQLITE_BUSY_MESSAGES = ("database is locked", "database is busy", "database table is locked")
+
+
+@dataclass(frozen=True)
+class SQLitePragmas:
+    journal_mode: str = "wal"
+    synchronous: str = "normal"
+    busy_timeout_ms: int = 5000
+    mmap_size: int = 268435456
+    cache_size: int = -65536
+
+    def __post_init__(self) -> None:
+        if self.journal_mode.lower() not in SQLITE_JOURNAL_MODES:
+            raise ValueError(f"Unsupported SQLite journal mode: {self.journal_mode}")
+        if self.synchronous.lower() not in SQLITE_SYNCHRONOUS_MODES:
+            raise ValueError(f"Unsupported SQLite synchronous mode: {self.synchronous}")
+
+    def statements(self) -> list[str]:
+        # busy_timeout goes first so that switching to WAL waits for other connections instead of failing.
+        return [
+            f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}",
+            f"PRAGMA journal_mode={self.journal_mode.upper()}",
+            f"PRAGMA synchronous={self.synchronous.upper()}",
+            f"PRAGMA mmap_size={int(self.mmap_size)}",
+            f"PRAGMA cache_size={int(self.cache_size)}",
+        ]
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    size: int = 5
+    max_overflow: int = 10
+    timeout_seconds: float = 30.0
+    recycle_seconds: float = 1800.0
+    pre_ping: bool = True
+
+
+@dataclass(frozen=True)
+class StorageProfile:
+    pragmas: SQLitePragmas
+    pool: PoolSettings
+
+    def engine_options(self, database_url: str | URL) -> dict[str, Any]:
+        url = make_url(database_url)
+        if url.get_backend_name() != "sqlite":
+            return {
+                "pool_size": self.pool.size,
+                "max_overflow": self.pool.max_overflow,
+                "pool_timeout": self.pool.timeout_seconds,
+                "pool_recycle": self.pool.recycle_seconds,
+                "pool_pre_ping": self.pool.pre_ping,
+            }
+        options: dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+        # In-memory databases live inside a single connection, so they keep SQLAlchemy's default pool.
+        if not is_memory_sqlite(url):
+            options.update(
+                pool_size=self.pool.size,
+                max_overflow=self.pool.max_overflow,
+                pool_timeout=self.pool.timeout_seconds,
+            )
+        return options
+
+    def install(self, engine: Engine) -> None:
+        if engine.dialect.name != "sqlite":
+            return
+
+        @event.listens_for(engine, "connect")
+        def apply_pragmas(dbapi_connection, connection_record) -> None:
+            cursor = dbapi_connection.cursor()
+            try:
+                for statement in self.pragmas.statements():
+                    cursor.execute(statement)
+            finally:
+                cursor.close()
+
+
+def storage_profile_from(settings: Settings) -> StorageProfile:
+    return StorageProfile(
+        pragmas=SQLitePragmas(
+            journal_mode=settings.sqlite_journal_mode,
+            synchronous=settings.sqlite_synchronous,
+            busy_timeout_ms=settings.sqlite_busy_timeout_ms,
+            mmap_size=settings.sqlite_mmap_size,
+            cache_size=settings.sqlite_cache_size,
+        ),
+        pool=PoolSettings(
+            size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            timeout_seconds=settings.db_pool_timeout_seconds,
+            recycle_seconds=settings.db_pool_recycle_seconds,
+            pre_ping=settings.db_pool_pre_ping,
+        ),
+    )
+
+
+def is_memory_sqlite(url: URL) -> bool:
+    database = url.database or ""
+    return (
+        database in ("", ":memory:")
+        or database.startswith("file::memory:")
+        or url.query.get("mode") == "memory"
+    )
+
+
+def is_transient_lock_error(exc: BaseException) -> bool:
+    if not isinstance(exc, DBAPIError):
+        return False
+    original = exc.orig
+    state = getattr(original, "pgcode", None) or getattr(original, "sqlstate", None)
+    if state in POSTGRES_TRANSIENT_LOCK_STATES:
+        return True
+    message = str(original).lower()
+    return any(busy_message in message for busy_message in SQLITE_BUSY_MESSAGES)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import random
+
+from sqlalchemy import Engine, insert
+
+from app.database import Base
+from app.enums import BankStatus, PaymentStatus, PaymentType
+from app.models import BankPaymentState, Order, Payment
+from app.money import ZERO_MONEY, Money
+from app.services import resolve_order_payment_status
+
+
+ORDER_TOTAL = Money.parse("100000.00")
+PAYMENT_AMOUNT = Money.parse("10.00")
+
+
+@dataclass
+class GeneratedData:
+    order_ids: list[int] = field(default_factory=list)
+    cash_payment_ids: list[int] = field(default_factory=list)
+    pending_acquiring: list[tuple[int, str, Money]] = field(default_factory=list)
+    total_payments: int = 0
+
+
+def reset_schema(engine: Engine) -> None:
+    import app.models  # noqa: F401  (registers tables on Base.metadata)
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def generate(
+    engine: Engine,
+    orders: int,
+    payments_per_order: int,
+    pending_share: float = 0.2,
+    seed: int = 7,
+    batch_size: int = 5000,
+) -> GeneratedData:
+    # Cash payments are settled, acquiring ones are either settled or still pending at the bank, and order
+    # balances are filled in consistently so the service never has to repair them during a run.
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    data = GeneratedData()
+    order_rows: list[dict] = []
+    payment_rows: list[dict] = []
+    state_rows: list[dict] = []
+    payment_id = 0
+
+    for order_id in range(1, orders + 1):
+        created_at = now - timedelta(minutes=rng.randint(1, 60 * 24 * 30))
+        paid_amount = reserved_amount = ZERO_MONEY
+        for _ in range(payments_per_order):
+            payment_id += 1
+            is_cash = rng.random() < 0.5
+            is_pending = not is_cash and rng.random() < pending_share
+            status = PaymentStatus.PENDING if is_pending else PaymentStatus.SUCCEEDED
+            reserved_amount += PAYMENT_AMOUNT
+            if not is_pending:
+                paid_amount += PAYMENT_AMOUNT
+
+            bank_payment_id = None if is_cash else f"SEED-{payment_id}"
+            payment_rows.append(
+                {
+                    "id": payment_id,
+                    "order_id": order_id,
+                    "payment_type": PaymentType.CASH if is_cash else PaymentType.ACQUIRING,
+                    "amount": PAYMENT_AMOUNT,
+                    "refunded_amount": ZERO_MONEY,
+                    "status": status,
+                    "external_payment_id": bank_payment_id,
+                    "paid_at": None if is_pending else created_at,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                }
+            )
+            if bank_payment_id is not None:
+                state_rows.append(
+                    {
+                        "payment_id": payment_id,
+                        "bank_payment_id": bank_payment_id,
+                        "bank_amount": PAYMENT_AMOUNT,
+                        "bank_status": BankStatus.PENDING if is_pending else BankStatus.PAID,
+                        "last_checked_at": created_at,
+                    }
+                )
+            if is_cash:
+                data.cash_payment_ids.append(payment_id)
+            elif is_pending:
+                data.pending_acquiring.append((payment_id, bank_payment_id, PAYMENT_AMOUNT))
+
+        order_rows.append(
+            {
+                "id": order_id,
+                "total_amount": ORDER_TOTAL,
+                "paid_amount": paid_amount,
+                "reserved_amount": reserved_amount,
+                "payment_status": resolve_order_payment_status(ORDER_TOTAL, paid_amount),
+                "created_at": created_at,
+                "version": 1,
+            }
+        )
+        data.order_ids.append(order_id)
+
+    with engine.begin() as connection:
+        for table, rows in ((Order, order_rows), (Payment, payment_rows), (BankPaymentState, state_rows)):
+            for start in range(0, len(rows), batch_size):
+                connection.execute(insert(table), rows[start : start + batch_size])
+
+    data.total_payments = payment_id
+    return data
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Fill the configured database with synthetic orders and payments")
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--payments-per-order", type=int, default=5)
+    parser.add_argument("--pending-share", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    from app.database import engine
+
+    reset_schema(engine)
+    data = generate(engine, args.orders, args.payments_per_order, args.pending_share, args.seed)
+    print(
+        f"generated {len(data.order_ids)} orders, {data.total_payments} payments, "
+        f"{len(data.pending_acquiring)} pending acquiring"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
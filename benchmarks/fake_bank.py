@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import itertools
+import json
+import random
+import threading
+import time
+from typing import Any
+
+
+@dataclass(frozen=True)
+class FakeBankSettings:
+    latency_ms: float = 20.0
+    latency_jitter_ms: float = 10.0
+    error_rate: float = 0.0
+    checks_until_final: int = 2
+    failure_rate: float = 0.1
+    seed: int = 42
+
+
+class FakeBankState:
+    # Payments move created -> pending -> paid/failed after a configured number of checks, like the real bank.
+    def __init__(self, settings: FakeBankSettings):
+        self.settings = settings
+        self._lock = threading.Lock()
+        self._random = random.Random(settings.seed)
+        self._ids = itertools.count(1)
+        self._payments: dict[str, dict[str, Any]] = {}
+        self.requests = 0
+        self.injected_errors = 0
+
+    def before_request(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            delay = max(self.settings.latency_ms + self._random.uniform(-1, 1) * self.settings.latency_jitter_ms, 0)
+            fail = self._random.random() < self.settings.error_rate
+            if fail:
+                self.injected_errors += 1
+        time.sleep(delay / 1000)
+        return not fail
+
+    def start(self, amount: str) -> str:
+        with self._lock:
+            bank_payment_id = f"FAKE-{next(self._ids)}"
+            self._payments[bank_payment_id] = {"amount": amount, "status": "created", "checks": 0}
+            return bank_payment_id
+
+    def seed(self, bank_payment_id: str, amount: str) -> None:
+        # Payments generated straight into the database have to exist on the bank side too.
+        with self._lock:
+            self._payments[bank_payment_id] = {"amount": amount, "status": "pending", "checks": 0}
+
+    def check(self, bank_payment_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            payment = self._payments.get(bank_payment_id)
+            if payment is None:
+                return None
+            payment["checks"] += 1
+            if payment["status"] in ("created", "pending"):
+                if payment["checks"] >= self.settings.checks_until_final:
+                    failed = self._random.random() < self.settings.failure_rate
+                    payment["status"] = "failed" if failed else "paid"
+                    if not failed:
+                        payment["paid_at"] = datetime.now(timezone.utc).isoformat()
+                else:
+                    payment["status"] = "pending"
+            return {"bank_payment_id": bank_payment_id, **{k: v for k, v in payment.items() if k != "checks"}}
+
+
+class FakeBankHandler(BaseHTTPRequestHandler):
+    server: "FakeBankServer"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self._send(200, {"status": "ok"})
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        state = self.server.state
+
+        if not state.before_request():
+            self._send(503, {"error": "injected failure"})
+            return
+
+        if self.path == "/acquiring_start":
+            self._send(200, {"bank_payment_id": state.start(str(payload.get("amount", "0.00")))})
+        elif self.path == "/acquiring_check":
+            snapshot = state.check(str(payload.get("bank_payment_id")))
+            self._send(200, snapshot if snapshot is not None else {"error": "payment not found"})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def _send(self, status_code: int, body: dict[str, Any]) -> None:
+        raw = json.dumps(body).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return
+
+
+class FakeBankServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, settings: FakeBankSettings, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), FakeBankHandler)
+        self.state = FakeBankState(settings)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start_in_background(self) -> "FakeBankServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-bank", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Local stand-in for the bank acquiring API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--checks-until-final", type=int, default=2)
+    parser.add_argument("--failure-rate", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    server = FakeBankServer(
+        FakeBankSettings(
+            latency_ms=args.latency_ms,
+            latency_jitter_ms=args.latency_jitter_ms,
+            error_rate=args.error_rate,
+            checks_until_final=args.checks_until_final,
+            failure_rate=args.failure_rate,
+        ),
+        host=args.host,
+        port=args.port,
+    )
+    print(f"fake bank listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
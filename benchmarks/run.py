@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import httpx
+
+from benchmarks.fake_bank import FakeBankServer, FakeBankSettings
+
+
+SCENARIOS = ("list_orders", "deposit_cash", "deposit_acquiring", "refund", "sync", "reconcile")
+Call = Callable[[httpx.Client], httpx.Response]
+
+
+@dataclass
+class ScenarioResult:
+    scenario: str
+    orders: int
+    payments: int
+    requests: int = 0
+    errors: int = 0
+    duration_seconds: float = 0.0
+    throughput_rps: float = 0.0
+    latency_ms: dict[str, float] = field(default_factory=dict)
+    extra: dict[str, Any] = field(default_factory=dict)
+
+
+def _percentile(sorted_values: list[float], share: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(share * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def run_calls(client: httpx.Client, calls: list[Call], concurrency: int, result: ScenarioResult) -> list[httpx.Response]:
+    latencies: list[float] = []
+    responses: list[httpx.Response] = []
+    lock = threading.Lock()
+
+    def timed(call: Call) -> None:
+        started_at = time.perf_counter()
+        try:
+            response = call(client)
+        except httpx.HTTPError:
+            response = None
+        elapsed = time.perf_counter() - started_at
+        with lock:
+            latencies.append(elapsed)
+            if response is None or response.status_code >= 400:
+                result.errors += 1
+            if response is not None:
+                responses.append(response)
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(timed, calls))
+    result.duration_seconds = time.perf_counter() - started_at
+
+    latencies.sort()
+    result.requests = len(calls)
+    result.throughput_rps = result.requests / result.duration_seconds if result.duration_seconds else 0.0
+    result.latency_ms = {
+        "p50": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p95": round(_percentile(latencies, 0.95) * 1000, 3),
+        "p99": round(_percentile(latencies, 0.99) * 1000, 3),
+        "max": round((latencies[-1] if latencies else 0.0) * 1000, 3),
+    }
+    return responses
+
+
+def _scenario_calls(name: str, data: Any, requests: int, rng: random.Random) -> list[Call]:
+    if name == "list_orders":
+        pages = max(len(data.order_ids) // 100, 1)
+        return [
+            lambda client, cursor=page * 100: client.get("/orders", params={"limit": 100, "cursor": cursor})
+            for page in range(pages)
+        ]
+    if name in ("deposit_cash", "deposit_acquiring"):
+        payment_type = name.removeprefix("deposit_")
+        return [
+            lambda client, order_id=rng.choice(data.order_ids): client.post(
+                f"/orders/{order_id}/payments",
+                json={"amount": "1.00", "payment_type": payment_type},
+            )
+            for _ in range(requests)
+        ]
+    if name == "refund":
+        payment_ids = rng.sample(data.cash_payment_ids, min(requests, len(data.cash_payment_ids)))
+        return [
+            lambda client, payment_id=payment_id: client.post(f"/payments/{payment_id}/refund", json={"amount": "1.00"})
+            for payment_id in payment_ids
+        ]
+    if name == "sync":
+        pending = rng.sample(data.pending_acquiring, min(requests, len(data.pending_acquiring)))
+        return [
+            lambda client, payment_id=payment_id: client.post(f"/payments/{payment_id}/sync")
+            for payment_id, _, _ in pending
+        ]
+    if name == "reconcile":
+        return [lambda client: client.post("/payments/reconcile", timeout=600.0)]
+    raise ValueError(f"Unknown scenario {name}")
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def _start_app(port: int) -> Any:
+    import uvicorn
+
+    from app.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, name="billing-api", daemon=True).start()
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("API server did not start")
+        time.sleep(0.05)
+    return server
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def find_regressions(report: dict[str, Any], baseline: dict[str, Any], max_drop: float) -> list[str]:
+    baseline_results = {(item["scenario"], item["orders"]): item for item in baseline.get("results", [])}
+    regressions = []
+    for item in report["results"]:
+        previous = baseline_results.get((item["scenario"], item["orders"]))
+        if previous is None or not previous["throughput_rps"]:
+            continue
+        drop = 1 - item["throughput_rps"] / previous["throughput_rps"]
+        if drop > max_drop:
+            regressions.append(
+                f"{item['scenario']} @ {item['orders']} orders: "
+                f"{previous['throughput_rps']:.1f} -> {item['throughput_rps']:.1f} rps ({drop:.0%} slower)"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the payment API against a local fake bank")
+    parser.add_argument("--sizes", default="1000,10000", help="comma separated order counts")
+    parser.add_argument("--payments-per-order", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=200, help="requests per write scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--bank-latency-ms", type=float, default=20.0)
+    parser.add_argument("--bank-error-rate", type=float, default=0.0)
+    parser.add_argument("--database-url", default=None, help="defaults to a temporary SQLite file")
+    parser.add_argument("--output", default="bench_report.json")
+    parser.add_argument("--baseline", default=None, help="previous report to compare throughput against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed throughput drop, 0.2 = 20%%")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    scenarios = [name for name in args.scenarios.split(",") if name]
+    bank = FakeBankServer(
+        FakeBankSettings(latency_ms=args.bank_latency_ms, error_rate=args.bank_error_rate, seed=args.seed)
+    ).start_in_background()
+
+    workdir = tempfile.mkdtemp(prefix="billing-bench-")
+    # Settings are read at import time, so the environment has to be in place before app modules load.
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{workdir}/bench.db"
+    os.environ["BANK_API_BASE_URL"] = bank.base_url
+    os.environ.setdefault("ACQUIRING_FRESHNESS_SECONDS", "0")
+
+    from app.database import engine
+    from benchmarks.datagen import generate, reset_schema
+
+    port = _free_port()
+    server = _start_app(port)
+    report: dict[str, Any] = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "database": engine.dialect.name,
+            "concurrency": args.concurrency,
+            "bank_latency_ms": args.bank_latency_ms,
+            "bank_error_rate": args.bank_error_rate,
+        },
+        "results": [],
+    }
+
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=60.0) as client:
+            for size in sizes:
+                reset_schema(engine)
+                data = generate(engine, size, args.payments_per_order, seed=args.seed)
+                for payment_id, bank_payment_id, amount in data.pending_acquiring:
+                    bank.state.seed(bank_payment_id, str(amount))
+
+                rng = random.Random(args.seed)
+                for name in scenarios:
+                    result = ScenarioResult(scenario=name, orders=size, payments=data.total_payments)
+                    calls = _scenario_calls(name, data, args.requests, rng)
+                    responses = run_calls(client, calls, args.concurrency if name != "list_orders" else 1, result)
+                    if name == "reconcile" and responses:
+                        body = responses[0].json()
+                        result.extra = {
+                            "processed_payments": body.get("processed_payments"),
+                            "payments_per_second": body.get("payments_per_second"),
+                        }
+                    report["results"].append(asdict(result))
+                    print(
+                        f"{name:<18} orders={size:<7} requests={result.requests:<5} errors={result.errors:<4} "
+                        f"rps={result.throughput_rps:8.1f} p95={result.latency_ms['p95']:8.1f}ms"
+                    )
+    finally:
+        server.should_exit = True
+        bank.stop()
+
+    report["meta"]["bank_requests"] = bank.state.requests
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"report written to {args.output}")
+
+    if args.baseline:
+        regressions = find_regressions(report, json.loads(Path(args.baseline).read_text()), args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
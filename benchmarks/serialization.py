@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.schemas import OrderPageResponse
+from app.serialization import dumps, orjson
+from app.services import PaymentService
+from benchmarks.datagen import generate, reset_schema
+
+
+def legacy_page(service: PaymentService, limit: int) -> bytes:
+    # What GET /orders does with FAST_RESPONSES=false: ORM objects, a response model built from attributes,
+    # FastAPI validating that model again against response_model, then jsonable_encoder and json.dumps.
+    page = service.list_orders(limit=limit)
+    response = OrderPageResponse.model_validate(
+        {"items": page.orders, "next_cursor": page.next_cursor},
+        from_attributes=True,
+    )
+    validated = OrderPageResponse.model_validate(response.model_dump())
+    return json.dumps(validated.model_dump(mode="json"), ensure_ascii=False).encode("utf-8")
+
+
+def fast_page(service: PaymentService, limit: int) -> bytes:
+    page = service.list_order_records(limit=limit)
+    return dumps({"items": page.items, "next_cursor": page.next_cursor})
+
+
+def measure(
+    session_factory: sessionmaker,
+    render: Callable[[PaymentService, int], bytes],
+    limit: int,
+    rounds: int,
+) -> dict[str, Any]:
+    timings: list[float] = []
+    size = 0
+    for _ in range(rounds):
+        with session_factory() as session:
+            service = PaymentService(session=session, bank_client=None)
+            started_at = time.perf_counter()
+            size = len(render(service, limit))
+            timings.append(time.perf_counter() - started_at)
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+        "bytes": size,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare the ORM/pydantic and the projection/fast JSON order listing")
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--payments-per-order", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'serialization.db'}")
+        reset_schema(engine)
+        generate(engine, args.orders, args.payments_per_order)
+        session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+        legacy = measure(session_factory, legacy_page, args.limit, args.rounds)
+        fast = measure(session_factory, fast_page, args.limit, args.rounds)
+        engine.dispose()
+
+    report = {
+        "orders": args.orders,
+        "payments_per_order": args.payments_per_order,
+        "limit": args.limit,
+        "encoder": "orjson" if orjson is not None else "json",
+        "legacy": legacy,
+        "fast": fast,
+        "speedup": round(legacy["median_ms"] / fast["median_ms"], 2) if fast["median_ms"] else None,
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
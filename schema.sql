@@ -1,10 +1,15 @@
 CREATE TABLE orders (
   id INTEGER PRIMARY KEY,
   total_amount NUMERIC(12, 2) NOT NULL CHECK (total_amount > 0),
+  paid_amount NUMERIC(12, 2) NOT NULL DEFAULT 0,
+  reserved_amount NUMERIC(12, 2) NOT NULL DEFAULT 0,
   payment_status VARCHAR(20) NOT NULL,
-  created_at DATETIME NOT NULL
+  created_at DATETIME NOT NULL,
+  version INTEGER NOT NULL DEFAULT 1
 );
 
+CREATE INDEX ix_orders_payment_status_id ON orders(payment_status, id);
+
 CREATE TABLE payments (
   id INTEGER PRIMARY KEY,
   order_id INTEGER NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
@@ -19,6 +24,7 @@ CREATE TABLE payments (
 );
 
 CREATE INDEX ix_payments_order_id ON payments(order_id);
+CREATE INDEX ix_payments_pending_acquiring ON payments(id) WHERE payment_type = 'ACQUIRING' AND status = 'PENDING';
 
 CREATE TABLE bank_payment_states (
   id INTEGER PRIMARY KEY,
@@ -28,7 +34,50 @@ CREATE TABLE bank_payment_states (
   bank_status VARCHAR(20) NOT NULL,
   bank_paid_at DATETIME,
   last_checked_at DATETIME,
-  last_error TEXT
+  last_error TEXT,
+  next_check_at DATETIME,
+  lease_owner VARCHAR(64),
+  lease_expires_at DATETIME
 );
 
 CREATE INDEX ix_bank_payment_states_bank_payment_id ON bank_payment_states(bank_payment_id);
+CREATE INDEX ix_bank_payment_states_last_checked_at ON bank_payment_states(last_checked_at);
+CREATE INDEX ix_bank_payment_states_next_check_at ON bank_payment_states(next_check_at);
+
+CREATE TABLE acquiring_outbox (
+  id INTEGER PRIMARY KEY,
+  payment_id INTEGER NOT NULL UNIQUE REFERENCES payments(id) ON DELETE CASCADE,
+  status VARCHAR(20) NOT NULL,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  last_error TEXT,
+  available_at DATETIME NOT NULL,
+  lease_owner VARCHAR(64),
+  lease_expires_at DATETIME,
+  created_at DATETIME NOT NULL,
+  dispatched_at DATETIME
+);
+
+CREATE INDEX ix_acquiring_outbox_status_available_at ON acquiring_outbox(status, available_at);
+
+CREATE TABLE bank_notifications (
+  id INTEGER PRIMARY KEY,
+  dedup_key VARCHAR(64) NOT NULL UNIQUE,
+  bank_payment_id VARCHAR(128) NOT NULL,
+  payment_id INTEGER NOT NULL REFERENCES payments(id) ON DELETE CASCADE,
+  received_at DATETIME NOT NULL
+);
+
+CREATE TABLE idempotency_keys (
+  id INTEGER PRIMARY KEY,
+  scope VARCHAR(64) NOT NULL,
+  key VARCHAR(255) NOT NULL,
+  request_hash VARCHAR(64) NOT NULL,
+  status_code INTEGER,
+  response_body TEXT,
+  created_at DATETIME NOT NULL,
+  expires_at DATETIME NOT NULL,
+  locked_until DATETIME,
+  CONSTRAINT uq_idempotency_keys_scope_key UNIQUE (scope, key)
+);
+
+CREATE INDEX ix_idempotency_keys_expires_at ON idempotency_keys(expires_at);
@@ -9,17 +9,21 @@ from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.bank.client import BankPaymentSnapshot
+from app.bank.rate_limit import BankLane, current_lane
 from app.database import Base
 from app.enums import BankStatus, OrderPaymentStatus
 from app.models import Order
+from app.money import Money
 
 
 class FakeBankClient:
     def __init__(self):
         self._counter = 1
         self._statuses: dict[str, BankPaymentSnapshot] = {}
+        self.check_calls: list[str] = []
+        self.check_lanes: list[BankLane] = []
 
-    def start_acquiring(self, order_id: int, amount: Decimal) -> str:
+    def start_acquiring(self, order_id: int, amount: Money) -> str:
         payment_id = f"BANK-{self._counter}"
         self._counter += 1
         self._statuses[payment_id] = BankPaymentSnapshot(
@@ -31,6 +35,8 @@ class FakeBankClient:
         return payment_id
 
     def check_acquiring(self, bank_payment_id: str) -> BankPaymentSnapshot:
+        self.check_calls.append(bank_payment_id)
+        self.check_lanes.append(current_lane())
         return self._statuses[bank_payment_id]
 
     def set_status(
@@ -48,6 +54,14 @@ class FakeBankClient:
         )
 
 
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
 @pytest.fixture
 def session() -> Session:
     engine = create_engine(
@@ -79,3 +93,8 @@ def bank_client() -> FakeBankClient:
 @pytest.fixture
 def now_utc() -> datetime:
     return datetime.now(timezone.utc)
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from decimal import Decimal
+from pathlib import Path
+
+import httpx
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.async_services import AsyncPaymentService
+from app.bank.async_client import AsyncBankAPIClient
+from app.database import Base, async_database_url
+from app.enums import OrderPaymentStatus, PaymentStatus, PaymentType
+from app.models import Order
+from app.money import Money
+
+
+class AsyncBankStub:
+    def __init__(self):
+        self.statuses: dict[str, str] = {}
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        if request.url.path == "/acquiring_start":
+            bank_payment_id = f"BANK-{len(self.statuses) + 1}"
+            self.statuses[bank_payment_id] = "pending"
+            return httpx.Response(200, json={"bank_payment_id": bank_payment_id})
+        bank_payment_id = payload["bank_payment_id"]
+        return httpx.Response(
+            200,
+            json={"bank_payment_id": bank_payment_id, "amount": "40.00", "status": self.statuses[bank_payment_id]},
+        )
+
+
+def test_async_database_url_switches_to_async_driver():
+    assert async_database_url("sqlite:///./billing.db") == "sqlite+aiosqlite:///./billing.db"
+    assert async_database_url("postgresql://user:secret@db/billing") == "postgresql+asyncpg://user:secret@db/billing"
+    assert async_database_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+
+def test_async_service_runs_deposit_and_sync_on_event_loop(tmp_path: Path):
+    async def scenario() -> None:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'billing.db'}")
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+        stub = AsyncBankStub()
+        bank_client = AsyncBankAPIClient(
+            base_url="http://bank.test",
+            timeout_seconds=1.0,
+            transport=httpx.MockTransport(stub.handler),
+        )
+
+        async with session_factory() as session:
+            order = Order(total_amount=Decimal("100.00"), payment_status=OrderPaymentStatus.UNPAID)
+            session.add(order)
+            await session.commit()
+
+            service = AsyncPaymentService(session, bank_client)
+            deposit = await service.run(
+                lambda sync_service: sync_service.deposit(order.id, Decimal("40"), PaymentType.ACQUIRING)
+            )
+            assert deposit.payment.status == PaymentStatus.PENDING
+
+            stub.statuses["BANK-1"] = "paid"
+            payment = await service.run(lambda sync_service: sync_service.sync_payment(deposit.payment.id))
+            assert payment.status == PaymentStatus.SUCCEEDED
+
+            synced_order = await service.run(lambda sync_service: sync_service.get_order(order.id))
+            assert synced_order.payments[0].bank_state.bank_payment_id == "BANK-1"
+            assert synced_order.paid_amount == Money.parse("40.00")
+            assert synced_order.payment_status == OrderPaymentStatus.PARTIALLY_PAID
+
+        await bank_client.aclose()
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_async_service_backs_off_without_blocking_the_event_loop(tmp_path: Path):
+    async def scenario() -> None:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'billing.db'}")
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        ticks: list[int] = []
+
+        async def ticker() -> None:
+            for tick in range(5):
+                ticks.append(tick)
+                await asyncio.sleep(0.01)
+
+        async with session_factory() as session:
+            service = AsyncPaymentService(session, bank_client=None)
+            background = asyncio.create_task(ticker())
+            await service.run(lambda sync_service: sync_service.sleep(0.1))
+            # The ticker ran while the service slept, so the loop was free.
+            assert len(ticks) == 5
+            await background
+        await engine.dispose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from app.balances import verify_order_balances
+from app.enums import OrderPaymentStatus, PaymentType
+from app.money import Money
+from app.services import PaymentService
+
+
+def test_incremental_balances_match_payments(session, seeded_order, bank_client):
+    service = PaymentService(session=session, bank_client=bank_client)
+    cash = service.deposit(seeded_order.id, Decimal("40.00"), PaymentType.CASH)
+    service.deposit(seeded_order.id, Decimal("25.00"), PaymentType.ACQUIRING)
+    refunded = service.refund(cash.payment.id, Decimal("15.00"))
+
+    assert refunded.order.paid_amount == Money.parse("25.00")
+    assert refunded.order.reserved_amount == Money.parse("50.00")
+    assert verify_order_balances(session).drifts == []
+
+
+def test_verifier_reports_and_fixes_drift(session, seeded_order, bank_client):
+    service = PaymentService(session=session, bank_client=bank_client)
+    service.deposit(seeded_order.id, Decimal("40.00"), PaymentType.CASH)
+
+    seeded_order.paid_amount = Decimal("10.00")
+    session.commit()
+
+    report = verify_order_balances(session)
+    assert [drift.order_id for drift in report.drifts] == [seeded_order.id]
+    assert report.drifts[0].expected_paid_amount == Money.parse("40.00")
+
+    fixed = verify_order_balances(session, fix=True)
+    assert len(fixed.drifts) == 1
+    session.expire_all()
+    assert seeded_order.paid_amount == Money.parse("40.00")
+    assert seeded_order.payment_status == OrderPaymentStatus.PARTIALLY_PAID
+    assert verify_order_balances(session).drifts == []
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from app.bank.client import BankAPIClient
+from app.bank.pool import SharedBankClient
+from app.bank.resilience import BreakerSettings, CircuitBreaker, CircuitState, RetryPolicy
+from app.enums import BankStatus
+from app.exceptions import BankUnavailableError, ExternalServiceError
+
+
+def _bank_handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/acquiring_start":
+        return httpx.Response(200, json={"bank_payment_id": "BANK-1"})
+    if request.url.path == "/acquiring_check":
+        return httpx.Response(200, json={"bank_payment_id": "BANK-1", "amount": "10.00", "status": "paid"})
+    return httpx.Response(404, json={"error": "not found"})
+
+
+def _make_client(handler=_bank_handler) -> BankAPIClient:
+    return BankAPIClient(
+        base_url="http://bank.test",
+        timeout_seconds=1.0,
+        transport=httpx.MockTransport(handler),
+    )
+
+
+def test_shared_client_is_created_lazily_and_reused():
+    created: list[BankAPIClient] = []
+
+    def factory() -> BankAPIClient:
+        client = _make_client()
+        created.append(client)
+        return client
+
+    shared = SharedBankClient(factory)
+    assert not shared.is_started
+    assert shared.pool_stats() is None
+
+    assert shared.start_acquiring(order_id=1, amount=Decimal("10.00")) == "BANK-1"
+    snapshot = shared.check_acquiring("BANK-1")
+    assert snapshot.status == BankStatus.PAID
+    assert len(created) == 1
+
+    stats = shared.pool_stats()
+    assert stats.requests_total == 2
+    assert stats.requests_in_flight == 0
+    assert stats.peak_requests_in_flight == 1
+
+    shared.close()
+    assert not shared.is_started
+
+
+def test_transport_errors_are_mapped_to_external_service_error():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    client = _make_client(handler)
+    with pytest.raises(ExternalServiceError):
+        client.check_acquiring("BANK-1")
+    assert client.pool_stats().requests_in_flight == 0
+
+
+def test_check_is_retried_but_start_is_not():
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if len(calls) in (1, 3):
+            return httpx.Response(503, json={"error": "busy"})
+        return _bank_handler(request)
+
+    client = BankAPIClient(
+        base_url="http://bank.test",
+        timeout_seconds=1.0,
+        transport=httpx.MockTransport(handler),
+        retry_policy=RetryPolicy(retries=2, base_delay_seconds=0.0),
+    )
+
+    assert client.check_acquiring("BANK-1").status == BankStatus.PAID
+    assert calls == ["/acquiring_check", "/acquiring_check"]
+
+    with pytest.raises(ExternalServiceError):
+        client.start_acquiring(order_id=1, amount=Decimal("10.00"))
+    assert calls[2:] == ["/acquiring_start"]
+
+
+def test_open_breaker_fails_fast_without_calling_bank():
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        raise httpx.ConnectTimeout("timed out", request=request)
+
+    client = BankAPIClient(
+        base_url="http://bank.test",
+        timeout_seconds=1.0,
+        transport=httpx.MockTransport(handler),
+        breaker_settings=BreakerSettings(failure_threshold=2, open_seconds=60.0),
+    )
+
+    for _ in range(2):
+        with pytest.raises(ExternalServiceError):
+            client.check_acquiring("BANK-1")
+    with pytest.raises(BankUnavailableError):
+        client.check_acquiring("BANK-1")
+
+    assert len(calls) == 2
+    stats = client.breaker_stats()
+    assert stats.state == CircuitState.OPEN
+    assert stats.rejected_calls == 1
+
+
+def test_breaker_probes_after_cooldown_and_counts_slow_calls():
+    now = [0.0]
+    breaker = CircuitBreaker(
+        BreakerSettings(failure_threshold=2, slow_call_seconds=1.0, open_seconds=10.0),
+        clock=lambda: now[0],
+    )
+
+    breaker.before_call("/acquiring_check")
+    breaker.record_success(duration_seconds=1.5)
+    breaker.record_success(duration_seconds=3.0)
+    assert breaker.stats().state == CircuitState.OPEN
+
+    now[0] = 10.0
+    breaker.before_call("/acquiring_check")
+    assert breaker.stats().state == CircuitState.HALF_OPEN
+    with pytest.raises(BankUnavailableError):
+        breaker.before_call("/acquiring_check")
+
+    breaker.record_failure()
+    assert breaker.stats().state == CircuitState.OPEN
+
+    now[0] = 20.0
+    breaker.before_call("/acquiring_check")
+    breaker.record_success(duration_seconds=0.1)
+    assert breaker.stats().state == CircuitState.CLOSED
+    assert breaker.stats().opened_total == 2
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from app.enums import BankStatus, OrderPaymentStatus, PaymentStatus, PaymentType
+from app.exceptions import ConflictError, ExternalServiceError, NotFoundError, ValidationError
+from app.models import Order
+from app.money import Money
+from app.services import DepositItem, PaymentService, RefundItem
+
+
+def test_deposit_many_reports_per_item_results_across_chunks(session, seeded_order, bank_client):
+    other_order = Order(total_amount=Decimal("50.00"))
+    session.add(other_order)
+    session.commit()
+    service = PaymentService(session=session, bank_client=bank_client)
+
+    outcomes = service.deposit_many(
+        [
+            DepositItem(seeded_order.id, Decimal("60.00"), PaymentType.CASH),
+            DepositItem(seeded_order.id, Decimal("50.00"), PaymentType.CASH),
+            DepositItem(other_order.id, Decimal("20.00"), PaymentType.ACQUIRING),
+            DepositItem(999, Decimal("1.00"), PaymentType.CASH),
+            DepositItem(seeded_order.id, Decimal("0.001"), PaymentType.CASH),
+            DepositItem(seeded_order.id, Decimal("40.00"), PaymentType.CASH),
+        ],
+        chunk_size=4,
+    )
+
+    assert [outcome.index for outcome in outcomes] == list(range(6))
+    assert [type(outcome.error) for outcome in outcomes] == [
+        type(None),
+        ConflictError,
+        type(None),
+        NotFoundError,
+        ValidationError,
+        type(None),
+    ]
+    assert outcomes[2].payment.external_payment_id == "BANK-1"
+    assert outcomes[2].payment.bank_state.bank_status == BankStatus.CREATED
+
+    order = service.get_order(seeded_order.id)
+    assert order.paid_amount == Money.parse("100.00")
+    assert order.payment_status == OrderPaymentStatus.PAID
+    assert service.get_order(other_order.id).reserved_amount == Money.parse("20.00")
+
+
+def test_refund_many_confirms_acquiring_payments_and_keeps_going_on_errors(session, seeded_order, bank_client):
+    service = PaymentService(session=session, bank_client=bank_client)
+    cash = service.deposit(seeded_order.id, Decimal("30.00"), PaymentType.CASH).payment
+    paid = service.deposit(seeded_order.id, Decimal("30.00"), PaymentType.ACQUIRING).payment
+    pending = service.deposit(seeded_order.id, Decimal("30.00"), PaymentType.ACQUIRING).payment
+    bank_client.set_status(paid.external_payment_id, BankStatus.PAID, paid_at=datetime.now(timezone.utc))
+    bank_client.check_calls.clear()
+
+    outcomes = service.refund_many(
+        [
+            RefundItem(cash.id, Decimal("10.00")),
+            RefundItem(cash.id, Decimal("25.00")),
+            RefundItem(cash.id),
+            RefundItem(paid.id),
+            RefundItem(pending.id),
+            RefundItem(12345),
+        ]
+    )
+
+    assert [outcome.error is None for outcome in outcomes] == [True, False, True, True, False, False]
+    assert outcomes[2].payment.status == PaymentStatus.REFUNDED
+    assert outcomes[3].payment.status == PaymentStatus.REFUNDED
+    assert sorted(bank_client.check_calls) == [paid.external_payment_id, pending.external_payment_id]
+
+    order = service.get_order(seeded_order.id)
+    assert order.paid_amount == Money.parse("0.00")
+    assert order.reserved_amount == Money.parse("30.00")
+    assert order.payment_status == OrderPaymentStatus.UNPAID
+
+
+def test_a_failing_chunk_does_not_undo_or_hide_committed_chunks(session, seeded_order, bank_client, monkeypatch):
+    service = PaymentService(session=session, bank_client=bank_client)
+    add_payment = service._add_payment
+    calls = []
+
+    def flaky_add_payment(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("connection reset")
+        return add_payment(*args, **kwargs)
+
+    monkeypatch.setattr(service, "_add_payment", flaky_add_payment)
+    outcomes = service.deposit_many(
+        [
+            DepositItem(seeded_order.id, Decimal("10.00"), PaymentType.CASH),
+            DepositItem(seeded_order.id, Decimal("20.00"), PaymentType.CASH),
+            DepositItem(seeded_order.id, Decimal("30.00"), PaymentType.CASH),
+        ],
+        chunk_size=1,
+    )
+
+    assert outcomes[0].error is None and outcomes[2].error is None
+    assert isinstance(outcomes[1].error, ExternalServiceError)
+    assert service.get_order(seeded_order.id).paid_amount == Money.parse("40.00")
+
+
+def test_refund_many_checks_the_bank_before_locking_orders(session, seeded_order, bank_client, monkeypatch):
+    service = PaymentService(session=session, bank_client=bank_client)
+    payments = [service.deposit(seeded_order.id, Decimal("10.00"), PaymentType.ACQUIRING).payment for _ in range(3)]
+    for payment in payments:
+        bank_client.set_status(payment.external_payment_id, BankStatus.PAID, paid_at=datetime.now(timezone.utc))
+    bank_client.check_calls.clear()
+
+    lock_orders = service._lock_orders
+    checks_before_lock = []
+
+    def recording_lock_orders(order_ids):
+        checks_before_lock.append(len(bank_client.check_calls))
+        return lock_orders(order_ids)
+
+    monkeypatch.setattr(service, "_lock_orders", recording_lock_orders)
+    outcomes = service.refund_many([RefundItem(payment.id) for payment in payments])
+
+    assert [outcome.error for outcome in outcomes] == [None, None, None]
+    assert checks_before_lock == [3]
+
+
+def test_deposit_many_refreshes_pending_payments_before_locking_orders(session, seeded_order, bank_client, monkeypatch):
+    service = PaymentService(session=session, bank_client=bank_client)
+    pending = [service.deposit(seeded_order.id, Decimal("40.00"), PaymentType.ACQUIRING).payment for _ in range(2)]
+    for payment in pending:
+        bank_client.set_status(payment.external_payment_id, BankStatus.FAILED)
+    bank_client.check_calls.clear()
+
+    lock_orders = service._lock_orders
+    checks_before_lock = []
+
+    def recording_lock_orders(order_ids):
+        checks_before_lock.append(len(bank_client.check_calls))
+        return lock_orders(order_ids)
+
+    monkeypatch.setattr(service, "_lock_orders", recording_lock_orders)
+    outcomes = service.deposit_many([DepositItem(seeded_order.id, Decimal("90.00"), PaymentType.CASH)])
+
+    assert [outcome.error for outcome in outcomes] == [None]
+    assert checks_before_lock == [2]
+    order = service.get_order(seeded_order.id)
+    assert [payment.status for payment in order.payments] == [
+        PaymentStatus.FAILED,
+        PaymentStatus.FAILED,
+        PaymentStatus.SUCCEEDED,
+    ]
+    assert order.reserved_amount == Money.parse("90.00")
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+
+from app.bank.client import BankAPIClient
+from app.enums import BankStatus
+from app.exceptions import BankPaymentNotFoundError
+from app.money import Money
+from benchmarks.fake_bank import FakeBankServer, FakeBankSettings
+from benchmarks.run import find_regressions
+
+
+@pytest.fixture
+def fake_bank():
+    server = FakeBankServer(FakeBankSettings(latency_ms=0, latency_jitter_ms=0, failure_rate=0.0)).start_in_background()
+    yield server
+    server.stop()
+
+
+def test_fake_bank_moves_payments_to_final_status(fake_bank):
+    client = BankAPIClient(base_url=fake_bank.base_url, timeout_seconds=5.0)
+    try:
+        bank_payment_id = client.start_acquiring(order_id=1, amount=Decimal("10.00"))
+        assert client.check_acquiring(bank_payment_id).status == BankStatus.PENDING
+        snapshot = client.check_acquiring(bank_payment_id)
+        assert snapshot.status == BankStatus.PAID
+        assert snapshot.amount == Money.parse("10.00")
+
+        with pytest.raises(BankPaymentNotFoundError):
+            client.check_acquiring("UNKNOWN")
+    finally:
+        client.close()
+
+
+def test_regressions_are_reported_against_baseline():
+    baseline = {"results": [{"scenario": "deposit_cash", "orders": 1000, "throughput_rps": 100.0}]}
+    report = {
+        "results": [
+            {"scenario": "deposit_cash", "orders": 1000, "throughput_rps": 70.0},
+            {"scenario": "refund", "orders": 1000, "throughput_rps": 5.0},
+        ]
+    }
+
+    assert find_regressions(report, baseline, max_drop=0.4) == []
+    assert len(find_regressions(report, baseline, max_drop=0.2)) == 1
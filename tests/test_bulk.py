@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import csv
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+import io
+import json
+
+from sqlalchemy import func, select
+
+from app.bulk import export_orders, import_orders
+from app.enums import BulkFormat, OrderPaymentStatus, PaymentType
+from app.models import Order
+from app.money import Money
+from app.services import PaymentService
+
+
+def test_import_orders_in_chunks_and_reports_rejected_lines(session):
+    lines = [
+        "total_amount,created_at",
+        "10.00,2024-01-01T00:00:00Z",
+        "0,",
+        "12.50,",
+        "abc,",
+        "99.99,",
+    ]
+
+    result = import_orders(session, lines, BulkFormat.CSV, chunk_size=2)
+
+    assert (result.imported, result.rejected) == (3, 2)
+    assert [error.line for error in result.errors] == [3, 5]
+    assert session.scalar(select(func.sum(Order.total_amount))) == Money.parse("122.49")
+    assert session.scalar(select(Order.created_at).order_by(Order.id)).year == 2024
+
+
+def test_export_streams_orders_with_payments(session, seeded_order, bank_client):
+    import_orders(session, ['{"total_amount": "5.00"}'], BulkFormat.NDJSON)
+    service = PaymentService(session=session, bank_client=bank_client)
+    service.deposit(seeded_order.id, Decimal("30.00"), PaymentType.CASH)
+    service.deposit(seeded_order.id, Decimal("20.00"), PaymentType.ACQUIRING)
+
+    records = [json.loads(line) for line in "".join(export_orders(session, BulkFormat.NDJSON)).splitlines()]
+    assert [record["id"] for record in records] == [seeded_order.id, seeded_order.id + 1]
+    assert [payment["payment_type"] for payment in records[0]["payments"]] == ["cash", "acquiring"]
+    assert records[0]["paid_amount"] == "30.00"
+    assert records[1]["payments"] == []
+
+    rows = list(csv.DictReader(io.StringIO("".join(export_orders(session, BulkFormat.CSV)))))
+    assert [row["payment_id"] for row in rows] == ["1", "2", ""]
+    assert rows[1]["external_payment_id"] == "BANK-1"
+
+    unpaid = "".join(
+        export_orders(session, BulkFormat.CSV, include_payments=False, payment_status=OrderPaymentStatus.UNPAID)
+    )
+    assert unpaid.splitlines()[1].startswith(f"{seeded_order.id + 1},5.00,")
+
+
+def test_export_uses_the_same_created_at_window_as_list_orders(session, bank_client):
+    import_orders(
+        session,
+        [
+            '{"total_amount": "1.00", "created_at": "2024-01-01T10:00:00Z"}',
+            '{"total_amount": "2.00", "created_at": "2024-01-01T12:00:00Z"}',
+        ],
+        BulkFormat.NDJSON,
+    )
+    service = PaymentService(session=session, bank_client=bank_client)
+
+    windows = [
+        (datetime(2024, 1, 1, 10), datetime(2024, 1, 1, 12)),
+        (
+            datetime(2024, 1, 1, 13, tzinfo=timezone(timedelta(hours=3))),
+            datetime(2024, 1, 1, 15, tzinfo=timezone(timedelta(hours=3))),
+        ),
+    ]
+    for created_from, created_to in windows:
+        exported = [
+            json.loads(line)["total_amount"]
+            for line in "".join(
+                export_orders(
+                    session,
+                    BulkFormat.NDJSON,
+                    include_payments=False,
+                    created_from=created_from,
+                    created_to=created_to,
+                )
+            ).splitlines()
+        ]
+        listed = service.list_order_records(created_from=created_from, created_to=created_to).items
+        assert exported == [item["total_amount"] for item in listed] == ["1.00"]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from app.bank.client import BankPaymentSnapshot
+from app.bank.coalescing import SingleFlight, SnapshotCache
+from app.bank.pool import SharedBankClient
+from app.enums import BankStatus
+
+
+class BlockingBankClient:
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def check_acquiring(self, bank_payment_id: str) -> BankPaymentSnapshot:
+        with self._lock:
+            self.calls += 1
+        self.release.wait(timeout=5)
+        return BankPaymentSnapshot(bank_payment_id, Decimal("10.00"), BankStatus.PENDING, None)
+
+
+def test_concurrent_checks_share_one_bank_request():
+    bank = BlockingBankClient()
+    shared = SharedBankClient(lambda: bank)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(shared.check_acquiring, "BANK-1") for _ in range(8)]
+        while shared.check_stats().coalesced_checks < 7:
+            time.sleep(0.001)
+        bank.release.set()
+        snapshots = [future.result() for future in futures]
+
+    assert bank.calls == 1
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
+    stats = shared.check_stats()
+    assert stats.bank_checks == 1
+    assert stats.coalesced_checks == 7
+    assert stats.cached_snapshots == 0
+
+
+def test_snapshot_cache_expires_and_evicts_least_recently_used(clock):
+    flight = SingleFlight(SnapshotCache(ttl_seconds=1.0, max_entries=2, clock=clock))
+    fetched: list[str] = []
+
+    def fetch(key: str):
+        return lambda: fetched.append(key) or key.upper()
+
+    assert flight.run("a", fetch("a")) == "A"
+    assert flight.run("a", fetch("a")) == "A"
+    assert fetched == ["a"]
+
+    flight.run("b", fetch("b"))
+    flight.run("a", fetch("a"))
+    flight.run("c", fetch("c"))
+    flight.run("a", fetch("a"))
+    flight.run("b", fetch("b"))
+    assert fetched == ["a", "b", "c", "b"]
+
+    clock.now = 1.5
+    flight.run("a", fetch("a"))
+    assert fetched == ["a", "b", "c", "b", "a"]
+
+    flight.forget("a")
+    flight.run("a", fetch("a"))
+    assert fetched[-1] == "a"
+    assert flight.stats().cache_hits == 3
+
+
+def test_failed_check_is_not_cached():
+    flight = SingleFlight(SnapshotCache(ttl_seconds=10.0, max_entries=10))
+    attempts = []
+
+    def failing():
+        attempts.append(1)
+        raise RuntimeError("bank is down")
+
+    for _ in range(2):
+        try:
+            flight.run("a", failing)
+        except RuntimeError:
+            pass
+
+    assert len(attempts) == 2
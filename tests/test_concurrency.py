@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.bank.client import BankPaymentSnapshot
+from app.database import Base
+from app.enums import BankStatus, NotificationResult, PaymentStatus, PaymentType
+from app.exceptions import ConflictError
+from app.models import Order, Payment
+from app.money import Money
+from app.services import PaymentService
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'billing.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, expire_on_commit=False)
+    engine.dispose()
+
+
+class InterleavingBankClient:
+    def __init__(self, on_start):
+        self._on_start = on_start
+        self.started: list[str] = []
+
+    def start_acquiring(self, order_id: int, amount: Decimal) -> str:
+        self._on_start()
+        self.started.append(f"BANK-{len(self.started) + 1}")
+        return self.started[-1]
+
+
+def test_concurrent_deposit_cannot_overpay_order(session_factory):
+    with session_factory() as setup:
+        order = Order(total_amount=Decimal("100.00"))
+        setup.add(order)
+        setup.commit()
+        order_id = order.id
+
+    def competing_cash_deposit() -> None:
+        with session_factory() as other_session:
+            PaymentService(other_session, bank_client=None).deposit(order_id, Decimal("60.00"), PaymentType.CASH)
+
+    bank_client = InterleavingBankClient(on_start=competing_cash_deposit)
+    with session_factory() as session:
+        with pytest.raises(ConflictError):
+            PaymentService(session, bank_client).deposit(order_id, Decimal("60.00"), PaymentType.ACQUIRING)
+
+    assert len(bank_client.started) == 1
+    with session_factory() as check:
+        stored = check.get(Order, order_id)
+        assert stored.reserved_amount == Money.parse("60.00")
+        assert stored.version == 2
+        assert check.scalars(select(Payment.payment_type)).all() == [PaymentType.CASH]
+
+
+def test_deposit_retries_after_concurrent_update(session_factory):
+    with session_factory() as setup:
+        order = Order(total_amount=Decimal("100.00"))
+        setup.add(order)
+        setup.commit()
+        order_id = order.id
+
+    calls = []
+
+    def competing_cash_deposit() -> None:
+        if calls:
+            return
+        calls.append(1)
+        with session_factory() as other_session:
+            PaymentService(other_session, bank_client=None).deposit(order_id, Decimal("30.00"), PaymentType.CASH)
+
+    bank_client = InterleavingBankClient(on_start=competing_cash_deposit)
+    with session_factory() as session:
+        result = PaymentService(session, bank_client).deposit(order_id, Decimal("60.00"), PaymentType.ACQUIRING)
+
+    assert result.payment.external_payment_id == "BANK-1"
+    assert result.order.reserved_amount == Money.parse("90.00")
+    assert len(bank_client.started) == 1
+
+
+class InterleavingCheckBank:
+    def __init__(self, on_check):
+        self._on_check = on_check
+        self.checks = 0
+
+    def start_acquiring(self, order_id: int, amount: Money) -> str:
+        return "BANK-1"
+
+    def check_acquiring(self, bank_payment_id: str) -> BankPaymentSnapshot:
+        self.checks += 1
+        self._on_check()
+        return BankPaymentSnapshot(bank_payment_id, Money.parse("60.00"), BankStatus.PAID, datetime.now(timezone.utc))
+
+
+def test_sync_retries_after_concurrent_deposit(session_factory):
+    with session_factory() as setup:
+        order = Order(total_amount=Decimal("100.00"))
+        setup.add(order)
+        setup.commit()
+        order_id = order.id
+
+    calls = []
+
+    def competing_cash_deposit() -> None:
+        if calls:
+            return
+        calls.append(1)
+        with session_factory() as other_session:
+            PaymentService(other_session, bank_client=None).deposit(order_id, Decimal("30.00"), PaymentType.CASH)
+
+    bank_client = InterleavingCheckBank(on_check=competing_cash_deposit)
+    with session_factory() as session:
+        deposit = PaymentService(session, bank_client).deposit(order_id, Decimal("60.00"), PaymentType.ACQUIRING)
+        payment_id = deposit.payment.id
+
+    with session_factory() as session:
+        payment = PaymentService(session, bank_client).sync_payment(payment_id)
+
+    assert payment.status == PaymentStatus.SUCCEEDED
+    assert bank_client.checks == 2
+    with session_factory() as check:
+        stored = check.get(Order, order_id)
+        assert stored.paid_amount == Money.parse("90.00")
+        assert stored.reserved_amount == Money.parse("90.00")
+
+
+def test_concurrent_notification_replay_is_reported_as_duplicate(session_factory):
+    with session_factory() as setup:
+        order = Order(total_amount=Decimal("100.00"))
+        setup.add(order)
+        setup.commit()
+        payment = PaymentService(setup, InterleavingBankClient(lambda: None)).deposit(
+            order.id, Decimal("100.00"), PaymentType.ACQUIRING
+        ).payment
+    notification = {
+        "notification_id": "evt-1",
+        "bank_payment_id": payment.external_payment_id,
+        "status": "paid",
+        "amount": "100.00",
+        "paid_at": "2024-01-01T10:00:00Z",
+    }
+
+    with session_factory() as first_session, session_factory() as second_session:
+        first = PaymentService(first_session, bank_client=None)
+        second = PaymentService(second_session, bank_client=None)
+        apply_notification = first._apply_bank_notification
+        competing: list = []
+
+        def interleaved(*args):
+            # The other delivery runs after this one has looked up the dedup keys but before it inserts its own.
+            if not competing:
+                competing.extend(second.apply_bank_notifications([notification]))
+            return apply_notification(*args)
+
+        first._apply_bank_notification = interleaved
+        outcomes = first.apply_bank_notifications([notification])
+
+    assert [outcome.result for outcome in competing] == [NotificationResult.APPLIED]
+    assert [outcome.result for outcome in outcomes] == [NotificationResult.DUPLICATE]
+    with session_factory() as check:
+        assert check.get(Payment, payment.id).status == PaymentStatus.SUCCEEDED
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from app.health import CachedProbe, database_is_ready
+
+
+def test_cached_probe_reuses_result_until_ttl_expires():
+    now = [0.0]
+    calls: list[float] = []
+
+    def probe() -> bool:
+        calls.append(now[0])
+        return len(calls) == 1
+
+    cached = CachedProbe(probe, ttl_seconds=30.0, clock=lambda: now[0])
+    assert cached.check() is True
+    now[0] = 29.0
+    assert cached.check() is True
+    now[0] = 30.0
+    assert cached.check() is False
+    assert calls == [0.0, 30.0]
+
+
+def test_database_is_ready(session):
+    assert database_is_ready(session) is True
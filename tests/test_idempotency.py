@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import func, select, update
+
+from app.enums import PaymentType
+from app.exceptions import ConflictError, IdempotencyKeyInProgressError, IdempotencyKeyReusedError
+from app.idempotency import REPLAYED_HEADER, IdempotencyStore, request_fingerprint, run_idempotent
+from app.models import IdempotencyKey, Payment
+from app.services import PaymentService
+
+
+class EchoResponse(BaseModel):
+    calls: int
+
+
+def unchanged(response: EchoResponse) -> EchoResponse:
+    return response
+
+
+def test_retry_with_same_key_is_answered_from_storage(session):
+    store = IdempotencyStore(session, ttl_seconds=60)
+    calls: list[int] = []
+
+    def operation() -> EchoResponse:
+        calls.append(1)
+        return EchoResponse(calls=len(calls))
+
+    first = run_idempotent(store, "deposit", "key-1", {"amount": "10.00"}, 201, operation, unchanged)
+    replay = run_idempotent(store, "deposit", "key-1", {"amount": "10.00"}, 201, operation, unchanged)
+
+    assert first == EchoResponse(calls=1)
+    assert replay.status_code == 201
+    assert replay.headers[REPLAYED_HEADER] == "true"
+    assert len(calls) == 1
+
+    with pytest.raises(IdempotencyKeyReusedError):
+        run_idempotent(store, "deposit", "key-1", {"amount": "11.00"}, 201, operation, unchanged)
+
+
+def test_failed_operation_releases_key(session):
+    store = IdempotencyStore(session, ttl_seconds=60)
+
+    def failing() -> EchoResponse:
+        raise ConflictError("nope")
+
+    with pytest.raises(ConflictError):
+        run_idempotent(store, "refund", "key-2", {}, 200, failing, unchanged)
+
+    retried = run_idempotent(store, "refund", "key-2", {}, 200, lambda: EchoResponse(calls=1), unchanged)
+    assert retried == EchoResponse(calls=1)
+
+
+def test_purge_expired_keys(session):
+    store = IdempotencyStore(session, ttl_seconds=60)
+    run_idempotent(store, "deposit", "key-3", {}, 201, lambda: EchoResponse(calls=1), unchanged)
+
+    assert store.purge_expired(datetime.now(timezone.utc)) == 0
+    assert store.purge_expired(datetime.now(timezone.utc) + timedelta(seconds=61)) == 1
+
+
+def test_abandoned_key_is_taken_over_once_its_lease_expires(session):
+    store = IdempotencyStore(session, ttl_seconds=60, lease_seconds=30)
+    # A request that reserved the key and then died without completing or releasing it.
+    assert store.begin("deposit", "key-4", request_fingerprint({})) is None
+
+    with pytest.raises(IdempotencyKeyInProgressError):
+        run_idempotent(store, "deposit", "key-4", {}, 201, lambda: EchoResponse(calls=1), unchanged)
+
+    session.execute(
+        update(IdempotencyKey).values(locked_until=datetime.now(timezone.utc) - timedelta(seconds=1))
+    )
+    session.commit()
+    taken_over = run_idempotent(store, "deposit", "key-4", {}, 201, lambda: EchoResponse(calls=2), unchanged)
+    assert taken_over == EchoResponse(calls=2)
+    replay = run_idempotent(store, "deposit", "key-4", {}, 201, lambda: EchoResponse(calls=3), unchanged)
+    assert replay.headers[REPLAYED_HEADER] == "true"
+
+
+def test_response_is_stored_with_the_operation_it_describes(monkeypatch, session, seeded_order, bank_client):
+    service = PaymentService(session=session, bank_client=bank_client)
+    # No lease: a key left unfinished would be taken over by the very next retry.
+    store = IdempotencyStore(session, ttl_seconds=60, lease_seconds=0)
+
+    def crash(*args, **kwargs) -> None:
+        raise RuntimeError("worker died before completing the key")
+
+    monkeypatch.setattr(IdempotencyStore, "complete", crash)
+
+    def deposit():
+        return run_idempotent(
+            store,
+            "create_payment",
+            "key-5",
+            {"amount": "10.00"},
+            201,
+            lambda: service.deposit(seeded_order.id, Decimal("10.00"), PaymentType.CASH),
+            lambda result: EchoResponse(calls=result.payment.id),
+            service=service,
+        )
+
+    first = deposit()
+    replay = deposit()
+
+    assert replay.headers[REPLAYED_HEADER] == "true"
+    assert replay.body == first.model_dump_json().encode()
+    assert session.scalar(select(func.count()).select_from(Payment)) == 1
+
+
+def test_concurrent_begin_replays_a_finished_request(monkeypatch, session):
+    store = IdempotencyStore(session, ttl_seconds=60)
+    run_idempotent(store, "deposit", "key-6", {}, 201, lambda: EchoResponse(calls=1), unchanged)
+
+    # The first lookup misses the row, as if the other request inserted it only after it: the insert then fails.
+    scalar = session.scalar
+    lookups: list[object] = []
+
+    def late_scalar(*args, **kwargs):
+        lookups.append(args)
+        return None if len(lookups) == 1 else scalar(*args, **kwargs)
+
+    monkeypatch.setattr(session, "scalar", late_scalar)
+    replay = run_idempotent(store, "deposit", "key-6", {}, 201, lambda: EchoResponse(calls=2), unchanged)
+
+    assert replay.headers[REPLAYED_HEADER] == "true"
+    assert replay.body == b'{"calls":1}'
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app import metrics
+from app.enums import BankStatus
+from app.metrics import MetricsMiddleware, MetricsRegistry, instrument_engine
+
+
+def test_registry_renders_prometheus_text_format():
+    registry = MetricsRegistry(enabled=True)
+    calls = registry.counter("bank_calls_total", "Bank calls.", ("path",))
+    latency = registry.histogram("bank_call_seconds", "Bank latency.", ("path",), buckets=(0.1, 1.0))
+
+    calls.inc("/acquiring_check")
+    calls.inc("/acquiring_check")
+    latency.observe(0.05, "/acquiring_check")
+    latency.observe(0.5, "/acquiring_check")
+
+    assert registry.render().splitlines() == [
+        "# HELP bank_calls_total Bank calls.",
+        "# TYPE bank_calls_total counter",
+        'bank_calls_total{path="/acquiring_check"} 2',
+        "# HELP bank_call_seconds Bank latency.",
+        "# TYPE bank_call_seconds histogram",
+        'bank_call_seconds_bucket{path="/acquiring_check",le="0.1"} 1',
+        'bank_call_seconds_bucket{path="/acquiring_check",le="1"} 2',
+        'bank_call_seconds_bucket{path="/acquiring_check",le="+Inf"} 2',
+        'bank_call_seconds_sum{path="/acquiring_check"} 0.55',
+        'bank_call_seconds_count{path="/acquiring_check"} 2',
+    ]
+
+
+def test_middleware_records_route_latency_and_sql_per_request(monkeypatch):
+    monkeypatch.setattr(metrics.registry, "enabled", True)
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    instrument_engine(engine)
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/orders/{order_id}")
+    def get_order(order_id: int) -> dict:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+        metrics.observe_bank_call("/acquiring_check", "timeout", 0.2)
+        metrics.count_bank_status(BankStatus.PAID)
+        return {"id": order_id}
+
+    queries_before = metrics.SQL_QUERIES.value()
+    with TestClient(app) as client:
+        assert client.get("/orders/7").status_code == 200
+
+    assert metrics.HTTP_REQUEST_SECONDS.count("GET", "/orders/{order_id}", "200") == 1
+    assert metrics.SQL_QUERIES.value() - queries_before == 2
+    assert metrics.BANK_CALL_ERRORS.value("/acquiring_check", "timeout") >= 1
+    assert metrics.BANK_PAYMENT_STATUSES.value("paid") >= 1
+
+    rendered = metrics.registry.render()
+    assert 'billing_http_request_sql_queries_bucket{route="/orders/{order_id}",le="2"} 1' in rendered
+    assert 'billing_http_request_bank_seconds_sum{route="/orders/{order_id}"} 0.2' in rendered
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.migrations import upgrade_schema
+from app.services import PaymentService
+
+
+NEW_INDEXES = {
+    "orders": "ix_orders_payment_status_id",
+    "payments": "ix_payments_pending_acquiring",
+    "bank_payment_states": "ix_bank_payment_states_last_checked_at",
+}
+
+
+def test_upgrade_creates_indexes_missing_on_existing_tables():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        for index_name in NEW_INDEXES.values():
+            connection.exec_driver_sql(f"DROP INDEX {index_name}")
+
+    upgrade_schema(engine)
+
+    inspector = inspect(engine)
+    for table_name, index_name in NEW_INDEXES.items():
+        assert index_name in {index["name"] for index in inspector.get_indexes(table_name)}
+
+
+def test_reconcile_query_uses_partial_pending_acquiring_index():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    plans: list[str] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def explain(connection, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT payments.id"):
+            plans.extend(str(row) for row in cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters))
+
+    with Session(engine) as session:
+        PaymentService(session, bank_client=None).reconcile_pending_payments()
+
+    assert any("ix_payments_pending_acquiring" in plan for plan in plans)
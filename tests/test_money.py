@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.bank.data_wrapper import BankAPIResponseWrapper
+from app.exceptions import ExternalServiceError
+from app.models import Order
+from app.money import ZERO_MONEY, Money
+
+
+def test_parse_rounds_half_up_to_minor_units():
+    assert Money.parse("10") == Money(1000)
+    assert Money.parse(Decimal("12.345")) == Money(1235)
+    assert Money.parse("0.004") == ZERO_MONEY
+    assert Money.parse(10.1) == Money(1010)
+    assert str(Money.parse("-0.005")) == "-0.01"
+    assert Money.parse("19.99").to_decimal() == Decimal("19.99")
+
+    for invalid in ("abc", "NaN", "Infinity", None):
+        with pytest.raises(ValueError):
+            Money.parse(invalid)
+
+
+def test_arithmetic_stays_in_minor_units():
+    total = sum((Money.parse("0.10") for _ in range(10)), ZERO_MONEY)
+    assert total == Money.parse("1.00")
+    assert total - Money.parse("0.30") > Money.parse("0.69")
+    assert not total - total
+    with pytest.raises(TypeError):
+        total < Decimal("1.00")
+    with pytest.raises(TypeError):
+        total == Decimal("1.00")
+    assert total != None  # noqa: E711
+
+
+def test_parse_exact_rejects_sub_kopeck_amounts():
+    assert Money.parse_exact("10.000") == Money(1000)
+    assert Money.parse_exact(10.5) == Money(1050)
+    with pytest.raises(ValueError):
+        Money.parse_exact("10.004")
+
+
+def test_amounts_are_money_on_both_sides_of_the_database(session, seeded_order):
+    assert seeded_order.total_amount == Money.parse("100.00")
+    assert session.scalar(select(Order.total_amount).where(Order.id == seeded_order.id)) == Money(10000)
+
+    assert BankAPIResponseWrapper({"amount": 10.5}).get_amount() == Money(1050)
+    for invalid in ("ten", "10.004"):
+        with pytest.raises(ExternalServiceError):
+            BankAPIResponseWrapper({"amount": invalid}).get_amount()
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import sessionmaker
+
+from app.enums import BankStatus, OrderPaymentStatus, OutboxStatus, PaymentStatus, PaymentType
+from app.exceptions import ExternalServiceError
+from app.models import AcquiringOutboxEntry, BankPaymentState
+from app.money import Money
+from app.outbox import OutboxDispatcher, OutboxRetrySchedule, claim_outbox_entries
+from app.services import PaymentService
+
+
+class FlakyBankClient:
+    def __init__(self, bank_client, failures: int):
+        self._bank_client = bank_client
+        self.failures = failures
+
+    def start_acquiring(self, order_id: int, amount: Decimal) -> str:
+        if self.failures:
+            self.failures -= 1
+            raise ExternalServiceError("Bank API is unavailable")
+        return self._bank_client.start_acquiring(order_id=order_id, amount=amount)
+
+
+class SlowBankClient:
+    # The first bank call takes so long that the leases on the rest of the batch run out and a second
+    # dispatcher claims those entries.
+    def __init__(self, bank_client, session, in_flight_id: int):
+        self._bank_client = bank_client
+        self._session = session
+        self._in_flight_id = in_flight_id
+        self.started: list[int] = []
+        self.reclaimed: list[int] = []
+
+    def start_acquiring(self, order_id: int, amount: Decimal) -> str:
+        if not self.started:
+            self._session.execute(
+                update(AcquiringOutboxEntry)
+                .where(
+                    AcquiringOutboxEntry.lease_owner == "dispatcher-a",
+                    AcquiringOutboxEntry.id != self._in_flight_id,
+                )
+                .values(lease_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+            )
+            self._session.commit()
+            self.reclaimed = claim_outbox_entries(self._session, "dispatcher-b", batch_size=10, lease_seconds=60)
+        self.started.append(order_id)
+        return self._bank_client.start_acquiring(order_id=order_id, amount=amount)
+
+
+def make_dispatcher(session, bank_client, **options) -> OutboxDispatcher:
+    return OutboxDispatcher(
+        sessionmaker(bind=session.get_bind(), expire_on_commit=False),
+        bank_client,
+        worker_id="dispatcher-a",
+        **options,
+    )
+
+
+def test_outbox_deposit_reserves_amount_without_calling_bank(session, seeded_order, bank_client):
+    flaky = FlakyBankClient(bank_client, failures=1)
+    service = PaymentService(session=session, bank_client=flaky, acquiring_outbox=True)
+
+    result = service.deposit(seeded_order.id, Decimal("40.00"), PaymentType.ACQUIRING)
+
+    assert result.payment.status == PaymentStatus.PENDING
+    assert result.payment.external_payment_id is None
+    assert result.order.reserved_amount == Money.parse("40.00")
+    entry = session.scalar(select(AcquiringOutboxEntry))
+    assert entry.payment_id == result.payment.id
+    assert entry.status == OutboxStatus.PENDING
+
+
+def test_dispatcher_links_bank_payments(session, seeded_order, bank_client):
+    service = PaymentService(session=session, bank_client=bank_client, acquiring_outbox=True)
+    payment_ids = [
+        service.deposit(seeded_order.id, Decimal("20.00"), PaymentType.ACQUIRING).payment.id for _ in range(3)
+    ]
+
+    result = make_dispatcher(session, bank_client, concurrency=2).run_once()
+    assert result.dispatched == 3
+    assert make_dispatcher(session, bank_client).run_once() is None
+
+    session.expire_all()
+    states = list(session.scalars(select(BankPaymentState).order_by(BankPaymentState.payment_id)))
+    assert [state.payment_id for state in states] == payment_ids
+    assert all(state.bank_status == BankStatus.CREATED for state in states)
+    assert all(entry.status == OutboxStatus.DISPATCHED for entry in session.scalars(select(AcquiringOutboxEntry)))
+
+    bank_client.set_status(states[0].bank_payment_id, BankStatus.PAID, paid_at=datetime.now(timezone.utc))
+    payment = service.sync_payment(payment_ids[0])
+    assert payment.status == PaymentStatus.SUCCEEDED
+
+
+def test_dispatcher_backs_off_and_fails_payment_after_max_attempts(session, seeded_order, bank_client):
+    service = PaymentService(session=session, bank_client=bank_client, acquiring_outbox=True)
+    payment = service.deposit(seeded_order.id, Decimal("40.00"), PaymentType.ACQUIRING).payment
+    flaky = FlakyBankClient(bank_client, failures=2)
+    dispatcher = make_dispatcher(
+        session,
+        flaky,
+        max_attempts=2,
+        schedule=OutboxRetrySchedule(base_delay_seconds=30.0),
+    )
+
+    first = dispatcher.run_once()
+    assert (first.dispatched, first.retried, first.failed) == (0, 1, 0)
+    assert dispatcher.run_once() is None
+
+    entry = session.scalar(select(AcquiringOutboxEntry))
+    assert entry.attempts == 1
+    assert entry.available_at.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc) + timedelta(seconds=25)
+    assert claim_outbox_entries(session, "dispatcher-b", batch_size=10, lease_seconds=60) == []
+
+    entry.available_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    session.commit()
+    second = dispatcher.run_once()
+    assert (second.dispatched, second.retried, second.failed) == (0, 0, 1)
+
+    order = service.get_order(seeded_order.id)
+    assert order.payments[0].id == payment.id
+    assert order.payments[0].status == PaymentStatus.FAILED
+    assert order.reserved_amount == Money.parse("0.00")
+    assert order.payment_status == OrderPaymentStatus.UNPAID
+
+
+def test_dispatcher_skips_entries_reclaimed_after_its_lease_ran_out(session, seeded_order, bank_client):
+    service = PaymentService(session=session, bank_client=bank_client, acquiring_outbox=True)
+    for _ in range(3):
+        service.deposit(seeded_order.id, Decimal("20.00"), PaymentType.ACQUIRING)
+    entry_ids = list(session.scalars(select(AcquiringOutboxEntry.id).order_by(AcquiringOutboxEntry.id)))
+    slow = SlowBankClient(bank_client, session, in_flight_id=entry_ids[0])
+
+    result = make_dispatcher(session, slow, concurrency=1).run_once()
+
+    assert result.dispatched == 1
+    assert len(slow.started) == 1
+    assert slow.reclaimed == entry_ids[1:]
+    session.expire_all()
+    entries = list(session.scalars(select(AcquiringOutboxEntry).order_by(AcquiringOutboxEntry.id)))
+    assert [entry.status for entry in entries] == [OutboxStatus.DISPATCHED, OutboxStatus.PENDING, OutboxStatus.PENDING]
+    assert [entry.lease_owner for entry in entries] == [None, "dispatcher-b", "dispatcher-b"]
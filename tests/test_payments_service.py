@@ -3,9 +3,14 @@ from __future__ import annotations
 from decimal import Decimal
 
 import pytest
+from sqlalchemy import select
 
-from app.enums import BankStatus, OrderPaymentStatus, PaymentStatus, PaymentType
+from app.bank.client import BankPaymentSnapshot
+from app.bank.rate_limit import BankLane
+from app.enums import BankStatus, NotificationResult, OrderPaymentStatus, PaymentStatus, PaymentType
 from app.exceptions import ConflictError
+from app.models import BankPaymentState, Order, Payment
+from app.money import Money
 from app.services import PaymentService
 
 
@@ -67,3 +72,146 @@ def test_failed_pending_acquiring_frees_amount_for_new_deposit(session, seeded_o
     cash = service.deposit(seeded_order.id, Decimal("100.00"), PaymentType.CASH)
     assert cash.payment.status == PaymentStatus.SUCCEEDED
     assert cash.order.payment_status == OrderPaymentStatus.PAID
+
+
+def test_concurrent_reconcile_reports_status_counts(session, seeded_order, bank_client, now_utc):
+    service = PaymentService(session=session, bank_client=bank_client)
+
+    paid = service.deposit(seeded_order.id, Decimal("30.00"), PaymentType.ACQUIRING).payment
+    failed = service.deposit(seeded_order.id, Decimal("30.00"), PaymentType.ACQUIRING).payment
+    pending = service.deposit(seeded_order.id, Decimal("30.00"), PaymentType.ACQUIRING).payment
+
+    bank_client.set_status(paid.external_payment_id, BankStatus.PAID, paid_at=now_utc)
+    bank_client.set_status(failed.external_payment_id, BankStatus.FAILED)
+    bank_client.check_lanes.clear()
+
+    result = service.reconcile_pending_payments(concurrency=4, chunk_size=2)
+    assert bank_client.check_lanes == [BankLane.BACKGROUND] * 3
+    assert result.processed_payments == 3
+    assert result.affected_orders == 1
+    assert result.failed_checks == 0
+    assert result.status_counts == {"paid": 1, "failed": 1, "pending": 1}
+
+    assert paid.status == PaymentStatus.SUCCEEDED
+    assert failed.status == PaymentStatus.FAILED
+    assert pending.status == PaymentStatus.PENDING
+    assert paid.order.payment_status == OrderPaymentStatus.PARTIALLY_PAID
+
+
+def test_chunked_reconcile_commits_progress_and_resumes_from_cursor(session, seeded_order, bank_client, now_utc):
+    service = PaymentService(session=session, bank_client=bank_client)
+
+    payments = [
+        service.deposit(seeded_order.id, Decimal("30.00"), PaymentType.ACQUIRING).payment
+        for _ in range(3)
+    ]
+    mismatched, first_paid, second_paid = payments
+    bank_client._statuses[mismatched.external_payment_id] = BankPaymentSnapshot(
+        bank_payment_id=mismatched.external_payment_id,
+        amount=Money.parse("31.00"),
+        status=BankStatus.PAID,
+        paid_at=now_utc,
+    )
+    bank_client.set_status(first_paid.external_payment_id, BankStatus.PAID, paid_at=now_utc)
+    bank_client.set_status(second_paid.external_payment_id, BankStatus.PAID, paid_at=now_utc)
+
+    first_run = service.reconcile_pending_payments(chunk_size=1, limit=2)
+    assert first_run.processed_payments == 2
+    assert first_run.conflicts == 1
+    assert first_run.next_cursor == first_paid.id
+
+    second_run = service.reconcile_pending_payments(chunk_size=1, cursor=first_run.next_cursor)
+    assert second_run.processed_payments == 1
+    assert second_run.status_counts == {"paid": 1}
+    assert second_run.next_cursor is None
+
+    statuses = dict(session.execute(select(Payment.id, Payment.status)).all())
+    assert statuses[mismatched.id] == PaymentStatus.PENDING
+    assert statuses[first_paid.id] == PaymentStatus.SUCCEEDED
+    assert statuses[second_paid.id] == PaymentStatus.SUCCEEDED
+    assert session.get(BankPaymentState, mismatched.bank_state.id).last_error.startswith("Bank amount mismatch")
+
+
+def test_list_orders_paginates_by_id_and_filters_status(session, seeded_order, bank_client):
+    service = PaymentService(session=session, bank_client=bank_client)
+    session.add_all([Order(total_amount=Decimal("50.00")), Order(total_amount=Decimal("70.00"))])
+    session.commit()
+    service.deposit(seeded_order.id, Decimal("100.00"), PaymentType.CASH)
+
+    first_page = service.list_orders(limit=2)
+    assert [order.id for order in first_page.orders] == [seeded_order.id, seeded_order.id + 1]
+    assert first_page.next_cursor == seeded_order.id + 1
+
+    second_page = service.list_orders(limit=2, cursor=first_page.next_cursor)
+    assert [order.id for order in second_page.orders] == [seeded_order.id + 2]
+    assert second_page.next_cursor is None
+
+    paid_page = service.list_orders(payment_status=OrderPaymentStatus.PAID)
+    assert [order.id for order in paid_page.orders] == [seeded_order.id]
+
+
+def test_bank_notifications_apply_status_and_skip_replays(session, seeded_order, bank_client):
+    service = PaymentService(session=session, bank_client=bank_client)
+    payment = service.deposit(seeded_order.id, Decimal("100.00"), PaymentType.ACQUIRING).payment
+    notification = {
+        "notification_id": "evt-1",
+        "bank_payment_id": payment.external_payment_id,
+        "status": "paid",
+        "amount": "100.00",
+        "paid_at": "2024-01-01T10:00:00Z",
+    }
+
+    first = service.apply_bank_notifications([notification, notification, {"bank_payment_id": "BANK-404", "amount": "1.00"}])
+    assert [outcome.result for outcome in first] == [
+        NotificationResult.APPLIED,
+        NotificationResult.DUPLICATE,
+        NotificationResult.NOT_FOUND,
+    ]
+    assert payment.status == PaymentStatus.SUCCEEDED
+    assert payment.order.payment_status == OrderPaymentStatus.PAID
+
+    replay = service.apply_bank_notifications([notification])
+    assert replay[0].result == NotificationResult.DUPLICATE
+
+
+def test_deposit_skips_bank_checks_within_freshness_window(session, seeded_order, bank_client):
+    service = PaymentService(
+        session=session,
+        bank_client=bank_client,
+        acquiring_freshness_seconds=60.0,
+        bank_check_concurrency=4,
+    )
+    first = service.deposit(seeded_order.id, Decimal("30.00"), PaymentType.ACQUIRING).payment
+    second = service.deposit(seeded_order.id, Decimal("30.00"), PaymentType.ACQUIRING).payment
+    assert bank_client.check_calls == [first.external_payment_id]
+
+    bank_client.set_status(first.external_payment_id, BankStatus.FAILED)
+    bank_client.set_status(second.external_payment_id, BankStatus.FAILED)
+    with pytest.raises(ConflictError):
+        service.deposit(seeded_order.id, Decimal("71.00"), PaymentType.CASH)
+    assert bank_client.check_calls == [first.external_payment_id, second.external_payment_id]
+
+    impatient = PaymentService(session=session, bank_client=bank_client)
+    cash = impatient.deposit(seeded_order.id, Decimal("71.00"), PaymentType.CASH)
+    assert cash.order.payment_status == OrderPaymentStatus.PARTIALLY_PAID
+    assert bank_client.check_calls[2:] == [first.external_payment_id]
+
+
+def test_deposit_refreshes_stale_payments_before_locking_the_order(session, seeded_order, bank_client, monkeypatch):
+    service = PaymentService(session=session, bank_client=bank_client)
+    acquiring = service.deposit(seeded_order.id, Decimal("100.00"), PaymentType.ACQUIRING).payment
+    bank_client.set_status(acquiring.external_payment_id, BankStatus.FAILED)
+    bank_client.check_calls.clear()
+
+    lock_order = service._lock_order
+    checks_before_lock = []
+
+    def recording_lock_order(order_id):
+        checks_before_lock.append(len(bank_client.check_calls))
+        return lock_order(order_id)
+
+    monkeypatch.setattr(service, "_lock_order", recording_lock_order)
+    cash = service.deposit(seeded_order.id, Decimal("100.00"), PaymentType.CASH)
+
+    assert checks_before_lock == [1]
+    assert cash.order.payment_status == OrderPaymentStatus.PAID
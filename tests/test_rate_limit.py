@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Callable
+
+import pytest
+
+from app.bank.rate_limit import BankLane, RateLimitSettings, TokenBucketLimiter, bank_lane
+from app.exceptions import BankRateLimitedError
+
+
+def _limiter(clock: Callable[[], float]) -> TokenBucketLimiter:
+    return TokenBucketLimiter(
+        RateLimitSettings(
+            rate_per_second=10.0,
+            burst=10,
+            interactive_reserve=0.3,
+            interactive_max_wait_seconds=0.0,
+            background_max_wait_seconds=0.0,
+        ),
+        clock=clock,
+    )
+
+
+def test_background_lane_leaves_reserve_for_interactive_calls(clock):
+    limiter = _limiter(clock)
+
+    with bank_lane(BankLane.BACKGROUND):
+        for _ in range(7):
+            limiter.acquire("/acquiring_check")
+        with pytest.raises(BankRateLimitedError):
+            limiter.acquire("/acquiring_check")
+
+    for _ in range(3):
+        limiter.acquire("/acquiring_start")
+    with pytest.raises(BankRateLimitedError):
+        limiter.acquire("/acquiring_start")
+
+    stats = limiter.stats()
+    assert stats.background_granted == 7
+    assert stats.interactive_granted == 3
+    assert stats.rejected == 2
+
+
+def test_tokens_refill_at_configured_rate(clock):
+    limiter = _limiter(clock)
+    for _ in range(10):
+        limiter.acquire("/acquiring_check")
+
+    clock.now = 0.5
+    assert limiter.stats().tokens_available == pytest.approx(5.0)
+    for _ in range(5):
+        limiter.acquire("/acquiring_check")
+    with pytest.raises(BankRateLimitedError):
+        limiter.acquire("/acquiring_check")
+
+
+def test_disabled_limiter_never_blocks():
+    limiter = TokenBucketLimiter()
+    for _ in range(1000):
+        limiter.acquire("/acquiring_check")
+    assert limiter.stats().interactive_granted == 0
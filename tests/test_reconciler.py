@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app.enums import BankStatus, PaymentStatus, PaymentType
+from app.models import BankPaymentState
+from app.reconciler import RecheckSchedule, ReconcileWorker, claim_due_payments
+from app.services import PaymentService
+
+
+def test_recheck_interval_grows_with_payment_age():
+    schedule = RecheckSchedule(base_interval_seconds=5.0, max_interval_seconds=60.0)
+
+    assert schedule.delay_for(timedelta(seconds=3)) == timedelta(seconds=5)
+    assert schedule.delay_for(timedelta(seconds=12)) == timedelta(seconds=10)
+    assert schedule.delay_for(timedelta(seconds=45)) == timedelta(seconds=40)
+    assert schedule.delay_for(timedelta(days=1)) == timedelta(seconds=60)
+
+
+def test_workers_claim_disjoint_batches(session, seeded_order, bank_client):
+    service = PaymentService(session=session, bank_client=bank_client)
+    payment_ids = {
+        service.deposit(seeded_order.id, Decimal("20.00"), PaymentType.ACQUIRING).payment.id for _ in range(3)
+    }
+
+    first = claim_due_payments(session, "worker-a", batch_size=2, lease_seconds=60)
+    second = claim_due_payments(session, "worker-b", batch_size=2, lease_seconds=60)
+    assert len(first) == 2
+    assert len(second) == 1
+    assert set(first) | set(second) == payment_ids
+
+    assert claim_due_payments(session, "worker-c", batch_size=2, lease_seconds=60) == []
+    later = datetime.now(timezone.utc) + timedelta(seconds=61)
+    assert len(claim_due_payments(session, "worker-c", batch_size=5, lease_seconds=60, now=later)) == 3
+
+
+def test_worker_reconciles_claimed_batch_and_schedules_next_check(session, seeded_order, bank_client, now_utc):
+    service = PaymentService(session=session, bank_client=bank_client)
+    paid = service.deposit(seeded_order.id, Decimal("30.00"), PaymentType.ACQUIRING).payment
+    pending = service.deposit(seeded_order.id, Decimal("30.00"), PaymentType.ACQUIRING).payment
+    bank_client.set_status(paid.external_payment_id, BankStatus.PAID, paid_at=now_utc)
+
+    worker = ReconcileWorker(
+        sessionmaker(bind=session.get_bind(), expire_on_commit=False),
+        bank_client,
+        worker_id="worker-a",
+        schedule=RecheckSchedule(base_interval_seconds=5.0),
+    )
+    result = worker.run_once()
+    assert result.processed_payments == 2
+    assert result.status_counts == {"paid": 1, "pending": 1}
+    assert worker.run_once() is None
+
+    session.expire_all()
+    states = {state.payment_id: state for state in session.scalars(select(BankPaymentState))}
+    assert all(state.lease_owner is None for state in states.values())
+    assert states[paid.id].next_check_at is None
+    assert states[pending.id].next_check_at is not None
+    assert service.get_order(seeded_order.id).payments[0].status == PaymentStatus.SUCCEEDED
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import dataclasses
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import asyncio
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import main
+from app.async_services import AsyncPaymentService, ThreadedServiceRunner
+from app.config import settings
+from app.database import Base
+from app.enums import PaymentType
+from app.exceptions import NotFoundError
+from app.models import Order
+from app.projections import isoformat
+from app.services import PaymentService
+
+
+def _get(monkeypatch, service: PaymentService, fast: bool, path: str) -> bytes:
+    monkeypatch.setattr(main, "settings", dataclasses.replace(settings, fast_responses=fast))
+    runner = ThreadedServiceRunner(service)
+    main.app.dependency_overrides[main.get_service_runner] = lambda: runner
+    try:
+        response = TestClient(main.app).get(path)
+    finally:
+        main.app.dependency_overrides.clear()
+    assert response.status_code == 200
+    return response.content
+
+
+def test_fast_responses_are_byte_identical_to_the_response_models(monkeypatch, session, seeded_order, bank_client):
+    session.add(Order(total_amount=Decimal("5.00")))
+    session.commit()
+    service = PaymentService(session=session, bank_client=bank_client)
+    service.deposit(seeded_order.id, Decimal("30.00"), PaymentType.CASH)
+    service.deposit(seeded_order.id, Decimal("20.00"), PaymentType.ACQUIRING)
+
+    for path in (
+        "/orders",
+        "/orders?limit=1",
+        f"/orders?cursor={seeded_order.id}&include_payments=false",
+        f"/orders/{seeded_order.id}",
+    ):
+        assert _get(monkeypatch, service, True, path) == _get(monkeypatch, service, False, path)
+
+    page = service.list_order_records(limit=1)
+    assert page.next_cursor == seeded_order.id
+    assert [payment["order_id"] for payment in page.items[0]["payments"]] == [seeded_order.id, seeded_order.id]
+    with pytest.raises(NotFoundError):
+        service.get_order_record(999)
+
+
+def test_isoformat_matches_pydantic_datetime_serialization():
+    assert isoformat(datetime(2024, 1, 1, 10)) == "2024-01-01T10:00:00"
+    assert isoformat(datetime(2024, 1, 1, 10, 0, 0, 120000, tzinfo=timezone.utc)) == "2024-01-01T10:00:00.120000Z"
+    assert isoformat(datetime(2024, 1, 1, 10, tzinfo=timezone(timedelta(hours=3)))) == "2024-01-01T10:00:00+03:00"
+    assert isoformat(None) is None
+
+
+def _write_responses_match_reads(runner, acquiring: bool) -> None:
+    main.app.dependency_overrides[main.get_service_runner] = runner
+    client = TestClient(main.app)
+
+    def assert_matches_read(written: dict) -> None:
+        # Every timestamp a write returns is the one a later read returns for the same row, offset included.
+        read = client.get(f"/orders/{written['order']['id']}").json()
+        payments = {payment["id"]: payment for payment in read.pop("payments")}
+        assert written["payment"] == payments[written["payment"]["id"]]
+        assert written["order"] == read
+        assert read["created_at"].endswith("Z")
+
+    try:
+        order_id = client.post("/orders/import", content='{"total_amount": "100.00"}\n').json()["imported"]
+        cash = client.post(f"/orders/{order_id}/payments", json={"amount": "30.00", "payment_type": "cash"}).json()
+        assert_matches_read(cash)
+        assert_matches_read(client.post(f"/payments/{cash['payment']['id']}/refund", json={"amount": "5.00"}).json())
+        if acquiring:
+            acquiring_payment = client.post(
+                f"/orders/{order_id}/payments", json={"amount": "20.00", "payment_type": "acquiring"}
+            ).json()
+            assert_matches_read(acquiring_payment)
+            assert_matches_read(client.post(f"/payments/{acquiring_payment['payment']['id']}/sync").json())
+    finally:
+        main.app.dependency_overrides.clear()
+
+
+def test_write_responses_match_reads_in_threaded_mode(monkeypatch, session, bank_client):
+    monkeypatch.setattr(main, "settings", dataclasses.replace(settings, fast_responses=False))
+    session_factory = sessionmaker(bind=session.get_bind(), expire_on_commit=False)
+
+    def runner():
+        with session_factory() as request_session:
+            yield ThreadedServiceRunner(PaymentService(request_session, bank_client))
+
+    _write_responses_match_reads(runner, acquiring=True)
+
+
+def test_write_responses_match_reads_in_async_mode(monkeypatch, tmp_path: Path):
+    pytest.importorskip("aiosqlite")
+    monkeypatch.setattr(main, "settings", dataclasses.replace(settings, fast_responses=False))
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'billing.db'}")
+
+    async def create_schema() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        await engine.dispose()
+
+    asyncio.run(create_schema())
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async def runner():
+        async with session_factory() as request_session:
+            yield AsyncPaymentService(request_session, bank_client=None)
+
+    _write_responses_match_reads(runner, acquiring=False)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from decimal import Decimal
+import re
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.enums import BankStatus, PaymentType
+from app.services import PaymentService
+
+
+@contextmanager
+def count_statements(engine) -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        table = re.search(r"\b(?:FROM|INTO|UPDATE)\s+(\w+)", statement).group(1)
+        statements.append(f"{statement.split(None, 1)[0]} {table}")
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def test_write_paths_issue_a_fixed_number_of_statements(session, seeded_order, bank_client):
+    engine = session.get_bind()
+    fresh_session = sessionmaker(bind=engine, expire_on_commit=False)
+
+    def service() -> PaymentService:
+        # One session per operation, as in a request, so nothing is served from an earlier identity map.
+        return PaymentService(session=fresh_session(), bank_client=bank_client)
+
+    with count_statements(engine) as statements:
+        cash = service().deposit(seeded_order.id, Decimal("10.00"), PaymentType.CASH).payment
+    # Pending acquiring payments are read (and refreshed if stale) before the order is locked.
+    assert statements == ["SELECT payments", "SELECT orders", "UPDATE orders", "INSERT payments"]
+
+    with count_statements(engine) as statements:
+        acquiring = service().deposit(seeded_order.id, Decimal("10.00"), PaymentType.ACQUIRING).payment
+    assert statements == [
+        "SELECT payments",
+        "SELECT orders",
+        "UPDATE orders",
+        "INSERT payments",
+        "INSERT bank_payment_states",
+    ]
+
+    with count_statements(engine) as statements:
+        service().refund(cash.id, Decimal("1.00"))
+    assert statements == ["SELECT payments", "SELECT orders", "UPDATE orders", "UPDATE payments"]
+
+    bank_client.set_status(acquiring.external_payment_id, BankStatus.PAID, paid_at=datetime.now(timezone.utc))
+    with count_statements(engine) as statements:
+        service().sync_payment(acquiring.id)
+    # The two selectin loads may run in either order.
+    assert statements[0] == "SELECT payments"
+    assert sorted(statements[1:3]) == ["SELECT bank_payment_states", "SELECT orders"]
+    assert statements[3:] == ["UPDATE orders", "UPDATE payments", "UPDATE bank_payment_states"]
+
+    with count_statements(engine) as statements:
+        service().refund(acquiring.id, Decimal("1.00"))
+    # The bank check is committed before the order is locked, so the order is read once more under the lock.
+    assert [statement for statement in statements if statement.startswith("SELECT")] == [
+        "SELECT payments",
+        "SELECT bank_payment_states",
+        "SELECT orders",
+        "SELECT orders",
+    ]
+    assert statements[-2:] == ["UPDATE orders", "UPDATE payments"]
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.exceptions import DatabaseBusyError
+from app.services import PaymentService
+from app.storage import PoolSettings, SQLitePragmas, StorageProfile, is_transient_lock_error
+
+
+def make_profile(**pragmas) -> StorageProfile:
+    return StorageProfile(pragmas=SQLitePragmas(**pragmas), pool=PoolSettings(size=3, max_overflow=2))
+
+
+def locked_error() -> OperationalError:
+    return OperationalError("UPDATE orders", {}, sqlite3.OperationalError("database is locked"))
+
+
+def test_sqlite_file_engine_applies_pragmas_on_connect(tmp_path):
+    profile = make_profile(busy_timeout_ms=1234, cache_size=-2048)
+    database_url = f"sqlite:///{tmp_path / 'billing.db'}"
+    engine = create_engine(database_url, **profile.engine_options(database_url))
+    profile.install(engine)
+
+    with engine.connect() as connection:
+        assert connection.scalar(text("PRAGMA journal_mode")) == "wal"
+        assert connection.scalar(text("PRAGMA synchronous")) == 1
+        assert connection.scalar(text("PRAGMA busy_timeout")) == 1234
+        assert connection.scalar(text("PRAGMA cache_size")) == -2048
+    assert engine.pool.size() == 3
+    engine.dispose()
+
+
+def test_engine_options_depend_on_backend():
+    profile = make_profile()
+
+    assert profile.engine_options("sqlite://") == {"connect_args": {"check_same_thread": False}}
+    assert profile.engine_options("postgresql+psycopg://user:secret@db/billing") == {
+        "pool_size": 3,
+        "max_overflow": 2,
+        "pool_timeout": 30.0,
+        "pool_recycle": 1800.0,
+        "pool_pre_ping": True,
+    }
+
+
+def test_unknown_pragma_values_are_rejected():
+    with pytest.raises(ValueError):
+        SQLitePragmas(journal_mode="fast")
+
+
+def test_transient_lock_errors_are_detected():
+    assert is_transient_lock_error(locked_error())
+    assert not is_transient_lock_error(
+        OperationalError("SELECT 1", {}, sqlite3.OperationalError("no such table: orders"))
+    )
+
+
+def test_service_retries_writes_while_database_is_busy(session, bank_client):
+    service = PaymentService(session=session, bank_client=bank_client, concurrent_update_retries=2)
+    attempts = []
+
+    def operation() -> str:
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise locked_error()
+        return "done"
+
+    assert service._retry_on_concurrent_update(operation) == "done"
+
+    with pytest.raises(DatabaseBusyError):
+        service._retry_on_concurrent_update(locked_error_operation)
+
+
+def test_busy_retries_do_not_sleep_after_the_last_attempt(session, bank_client):
+    delays: list[float] = []
+    service = PaymentService(
+        session=session,
+        bank_client=bank_client,
+        concurrent_update_retries=2,
+        busy_retry_base_delay_seconds=0.01,
+        sleep=delays.append,
+    )
+
+    with pytest.raises(DatabaseBusyError):
+        service._retry_on_concurrent_update(locked_error_operation)
+    assert len(delays) == 2
+
+
+def locked_error_operation() -> None:
+    raise locked_error()
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from app.timestamps import as_utc
+
+
+def test_as_utc_assumes_naive_values_are_utc_and_converts_aware_ones():
+    assert as_utc(datetime(2024, 1, 1, 10)) == datetime(2024, 1, 1, 10, tzinfo=timezone.utc)
+    moscow = as_utc(datetime(2024, 1, 1, 13, tzinfo=timezone(timedelta(hours=3))))
+    assert moscow.tzinfo is timezone.utc
+    assert moscow.hour == 10
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import dataclasses
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.config import settings
+
+
+class RecordingRunner:
+    def __init__(self):
+        self.calls = 0
+
+    async def run(self, operation):
+        self.calls += 1
+        return []
+
+
+def _post_notification(monkeypatch, token: str | None, header: str | None):
+    monkeypatch.setattr(main, "settings", dataclasses.replace(settings, bank_webhook_token=token))
+    runner = RecordingRunner()
+    main.app.dependency_overrides[main.get_service_runner] = lambda: runner
+    try:
+        headers = {"X-Bank-Webhook-Token": header} if header is not None else {}
+        response = TestClient(main.app).post(
+            "/bank/notifications",
+            json={"notifications": [{"bank_payment_id": "BANK-1", "status": "paid", "amount": "10.00"}]},
+            headers=headers,
+        )
+    finally:
+        main.app.dependency_overrides.clear()
+    return response, runner.calls
+
+
+def test_bank_notifications_are_rejected_when_no_token_is_configured(monkeypatch):
+    response, calls = _post_notification(monkeypatch, token=None, header=None)
+    assert response.status_code == 401
+    assert calls == 0
+
+    response, calls = _post_notification(monkeypatch, token=None, header="")
+    assert response.status_code == 401
+    assert calls == 0
+
+
+def test_bank_notifications_require_the_configured_token(monkeypatch):
+    response, calls = _post_notification(monkeypatch, token="secret", header="wrong")
+    assert (response.status_code, calls) == (401, 0)
+
+    response, calls = _post_notification(monkeypatch, token="secret", header="secret")
+    assert (response.status_code, calls) == (200, 1)
+    assert response.json() == {"results": []}